@@ -1,26 +1,15 @@
 if [ -z "$1" ]; then
-    echo "Uso: ./run.sh testes/ficheiro.pas"
+    echo "Uso: ./run.sh testes/ficheiro.pas  (ou uma pasta: ./run.sh testes/ -j 4)"
     exit 1
 fi
 
-INPUT=$1
-OUTPUT="${INPUT%.pas}.vm"
+# Compila (os \r são removidos em memória e o .vm é escrito de forma atómica)
+python3 "$(dirname "$0")/src/compiler.py" build "$@"
 
-# 1. Limpa o ficheiro de entrada (tira \r do Pascal)
-sed -i 's/\r$//' "$INPUT"
-
-# 2. Compila
-python3 src/parser.py "$INPUT"
-
-# 3. Verifica erro
 if [ $? -ne 0 ]; then
     echo "❌ Erro na compilação."
     exit 1
 fi
 
-# 4. LIMPEZA NUCLEAR DO OUTPUT (Remove \r à força)
-tr -d '\r' < "$OUTPUT" > "$OUTPUT.tmp" && mv "$OUTPUT.tmp" "$OUTPUT"
-
 echo ""
-echo "✅ Sucesso! Ficheiro limpo gerado em: $OUTPUT"
-echo "Podes fazer upload agora."
\ No newline at end of file
+echo "✅ Sucesso! Podes fazer upload agora."
@@ -1,14 +1,33 @@
-class Program:
+import sys
+
+# ==============================================================================
+# NÓS DA AST
+# Todas as classes usam __slots__: cada nó guarda só os seus campos, sem o
+# __dict__ por instância. O campo 'scope' aponta para o registo da variável ou
+# da função na tabela de símbolos (Symbol / FuncSymbol, partilhado, não é
+# copiado), resolvido durante o parse, e 'type' é preenchido pelo TypeChecker.
+# 'pos' (lexpos do primeiro token) só é preenchido no modo de diagnóstico.
+# ==============================================================================
+class Node:
+    __slots__ = ()
+
+class Program(Node):
+    __slots__ = ('declarations', 'subprograms', 'body')
+
     def __init__(self, declarations, subprograms, body):
         self.declarations = declarations
         self.subprograms = subprograms
         self.body = body
 
-class Block:
+class Block(Node):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements
 
-class SubProgramDecl:
+class SubProgramDecl(Node):
+    __slots__ = ('name', 'args', 'ret_type', 'locals_data', 'body', 'is_func', 'scope', 'tail')
+
     def __init__(self, name, args, ret_type, locals_data, body, is_func):
         self.name = name
         self.args = args
@@ -16,70 +35,184 @@ class SubProgramDecl:
         self.locals_data = locals_data
         self.body = body
         self.is_func = is_func
+        self.scope = None
+        self.tail = False   # tem chamadas finais a si próprio (TailCalls, -O1)
+
+class Assign(Node):
+    __slots__ = ('name', 'expr', 'index_expr', 'scope', 'pos')
 
-class Assign:
     def __init__(self, name, expr, index_expr=None):
         self.name = name
         self.expr = expr
         self.index_expr = index_expr
-        self.scope = None  
+        self.scope = None
+        self.pos = None
+
+class FunctionCall(Node):
+    __slots__ = ('name', 'args', 'scope', 'type', 'pos')
 
-class FunctionCall:
     def __init__(self, name, args):
         self.name = name
         self.args = args
+        self.scope = None   # None se a função ainda não estava declarada
+        self.type = None
+        self.pos = None
+
+class VarAccess(Node):
+    __slots__ = ('name', 'index_expr', 'scope', 'type')
 
-class VarAccess:
     def __init__(self, name, index_expr=None):
         self.name = name
         self.index_expr = index_expr
         self.scope = None
+        self.type = None
+
+class Literal(Node):
+    __slots__ = ('value', 'type_name', 'type')
 
-class Literal:
     def __init__(self, value, type_name):
         self.value = value
         self.type_name = type_name
+        self.type = None
+
+class BinOp(Node):
+    __slots__ = ('left', 'op', 'right', 'type')
 
-class BinOp:
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
+        self.type = None
+
+class Write(Node):
+    __slots__ = ('exprs', 'newline', 'pos')
 
-class Write:
     def __init__(self, exprs, newline):
         self.exprs = exprs
         self.newline = newline
+        self.pos = None
+
+class Read(Node):
+    __slots__ = ('name', 'index_expr', 'scope', 'pos')
 
-class Read:
     def __init__(self, name, index_expr=None):
         self.name = name
         self.index_expr = index_expr
         self.scope = None
+        self.pos = None
+
+class InlineCall(Node):
+    """ Chamada a uma função expandida no sítio (Inliner, -O2): executa body
+        e deixa na pilha o valor de result. """
+    __slots__ = ('body', 'result', 'type')
+
+    def __init__(self, body, result):
+        self.body = body
+        self.result = result
+        self.type = None
+
+class TailCall(Node):
+    """ Chamada final de um subprograma a si próprio (TailCalls, -O1): guarda
+        cada argumento no parâmetro correspondente (None: valor descartado),
+        repõe o valor inicial de reset e salta para o início do corpo. """
+    __slots__ = ('args', 'params', 'reset', 'pos')
+
+    def __init__(self, args, params, reset):
+        self.args = args
+        self.params = params
+        self.reset = reset
+        self.pos = None
 
 # --- Estruturas de Controlo ---
 
-class If:
+class If(Node):
+    __slots__ = ('cond', 'then_b', 'else_b', 'pos')
+
     def __init__(self, cond, then_b, else_b=None):
         self.cond = cond
         self.then_b = then_b
         self.else_b = else_b
+        self.pos = None
+
+class While(Node):
+    __slots__ = ('cond', 'body', 'forever', 'pos')
 
-class While:
     def __init__(self, cond, body):
         self.cond = cond
         self.body = body
+        self.forever = False    # nunca termina: sem teste nem saída (DeadCode, -O1)
+        self.pos = None
+
+class Repeat(Node):
+    __slots__ = ('statements', 'cond', 'pos')
 
-class Repeat:
     def __init__(self, statements, cond):
         self.statements = statements
         self.cond = cond
+        self.pos = None
+
+class Case(Node):
+    """ labels[i] são os rótulos do ramo arms[i], pares (mínimo, máximo) de
+        Literal (o mesmo nos rótulos simples); else_b é None sem 'else'. """
+    __slots__ = ('selector', 'labels', 'arms', 'else_b', 'pos')
+
+    def __init__(self, selector, labels, arms, else_b=None):
+        self.selector = selector
+        self.labels = labels
+        self.arms = arms
+        self.else_b = else_b
+        self.pos = None
+
+class For(Node):
+    __slots__ = ('var', 'start', 'end', 'body', 'direction', 'scope', 'limit', 'pos')
 
-class For:
     def __init__(self, var, start, end, body, direction):
         self.var = var
         self.start = start
         self.end = end
         self.body = body
         self.direction = direction
-        self.scope = None
\ No newline at end of file
+        self.scope = None
+        self.limit = None   # variável escondida com o valor final (LoopOptimizer, -O1)
+        self.pos = None
+
+
+# ==============================================================================
+# PERCURSO E CONTABILIZAÇÃO DE MEMÓRIA
+# ==============================================================================
+def walk(root):
+    """ Itera sobre todos os nós da AST (pré-ordem, sem recursão). """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        kids = []
+        for name in node.__slots__:
+            v = getattr(node, name, None)
+            if isinstance(v, Node): kids.append(v)
+            elif type(v) is list: kids.extend(x for x in v if isinstance(x, Node))
+        stack.extend(reversed(kids))
+
+def mem_report(root):
+    """ Devolve {classe: [nº de nós, bytes]} para a AST. Conta o próprio nó e as
+        listas de filhos que lhe pertencem; os registos da tabela de símbolos
+        são partilhados e não entram na conta. """
+    report = {}
+    for node in walk(root):
+        size = sys.getsizeof(node)
+        for name in node.__slots__:
+            v = getattr(node, name, None)
+            if type(v) is list: size += sys.getsizeof(v)
+        entry = report.setdefault(type(node).__name__, [0, 0])
+        entry[0] += 1
+        entry[1] += size
+    return report
+
+def format_mem_report(report):
+    lines = [f"{'Nó':16} {'Quantidade':>10} {'Bytes':>12}"]
+    for name, (count, size) in sorted(report.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"{name:16} {count:>10} {size:>12}")
+    total_n = sum(c for c, _ in report.values())
+    total_b = sum(b for _, b in report.values())
+    lines.append(f"{'TOTAL':16} {total_n:>10} {total_b:>12}")
+    return "\n".join(lines)
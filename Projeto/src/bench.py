@@ -0,0 +1,413 @@
+import glob
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+from ast_nodes import *
+from codegen import CodeGen, Branch, gen_program, gen_subprogram, gen_block, gen_assign, gen_call, \
+    gen_var, gen_binop, gen_literal, gen_write, gen_read, gen_if, gen_while, gen_repeat, gen_for, \
+    gen_tailcall, gen_inline, gen_branch, gen_case
+from diagnostics import Diagnostics
+from lexer import lexer
+from parser import Compiler
+from scanner import tokenize
+from semantics import TypeChecker
+
+# ==============================================================================
+# BENCHMARKS
+# Uso: python bench.py suite [--sizes 100,1000,10000] [--save F] [--compare F]
+#      python bench.py generate --statements N [--seed S] > prog.pas
+#      python bench.py dispatch [-n REPETIÇÕES]
+# ==============================================================================
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'testes')
+
+def best_of(fn, repeat):
+    """ Menor tempo (em segundos) de repeat execuções de fn(). """
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def load_trees(copies=20):
+    """ Compila os exemplos válidos de testes/ e devolve as ASTs já anotadas. """
+    trees = []
+    for path in sorted(glob.glob(os.path.join(TESTS_DIR, '*.pas'))):
+        if os.path.basename(path).startswith('erro_'): continue
+        with open(path) as f: text = f.read()
+        for _ in range(copies):
+            c = Compiler()
+            tree = c.parse(text)
+            TypeChecker(c.st).check(tree)
+            trees.append((c.st, tree))
+    return trees
+
+# ------------------------------------------------------------------------------
+# Gerador de programas sintéticos
+# Produz programas válidos e deterministas (a mesma semente dá o mesmo texto)
+# que terminam sempre: cada ciclo tem um contador próprio que o corpo não
+# altera, os divisores são constantes não nulas e os subprogramas não
+# chamam outros subprogramas.
+# ------------------------------------------------------------------------------
+class ProgramGenerator:
+    def __init__(self, seed=1, statements=1000, expr_depth=3, subprograms=4,
+                 array_size=10, nesting=2):
+        self.rng = random.Random(seed)
+        self.statements = statements
+        self.expr_depth = expr_depth
+        self.subprograms = subprograms
+        self.array_size = max(1, array_size)
+        self.nesting = nesting
+        self.funcs, self.procs = [], []
+        self.writable, self.readable, self.indexes = [], [], []
+
+    def generate(self):
+        per_unit = max(1, self.statements // (self.subprograms + 1))
+        counters = [f"{c}{d}" for c in 'iw' for d in range(1, self.nesting + 1)]
+        glob = [f"g{n}" for n in range(1, 9)]
+        out = ["program Sintetico;", "var",
+               f"{', '.join(glob + counters)}: integer;",
+               f"a: array[1..{self.array_size}] of integer;",
+               "s: string;"]
+        for k in range(1, self.subprograms + 1):
+            out += self.subprogram(k, per_unit, counters)
+        self.writable, self.readable = glob, glob
+        out.append(compound(self.block(per_unit, 0)) + ".")
+        return "\n".join(out) + "\n"
+
+    def subprogram(self, k, budget, counters):
+        is_func = k % 2 == 1
+        params = ['x', 'y'] if is_func else ['x']
+        self.writable, self.readable = ['t', 'u'], ['t', 'u'] + params + ['g1', 'g2']
+        name = f"f{k}" if is_func else f"p{k}"
+        if is_func: head = f"function {name}(x, y: integer): integer;"
+        else: head = f"procedure {name}(x: integer);"
+        # só o programa principal chama subprogramas e aqui os ciclos têm um
+        # único nível, para que o tempo de execução não cresça em cascata
+        visible, self.funcs, self.procs = (self.funcs, self.procs), [], []
+        nesting, self.nesting = self.nesting, min(self.nesting, 1)
+        body = self.block(max(1, budget - 1), 0)
+        self.funcs, self.procs = visible
+        self.nesting = nesting
+        if is_func: body.append(f"{name} := {self.expr(self.expr_depth)} mod 1000")
+        (self.funcs if is_func else self.procs).append(name)
+        return [head, "var", f"{', '.join(['t', 'u'] + counters)}: integer;", compound(body) + ";"]
+
+    # --- comandos --------------------------------------------------------------
+    def block(self, budget, depth):
+        """ Comandos até esgotar budget (as estruturas contam com o corpo). """
+        stmts = []
+        while budget > 0:
+            text, used = self.statement(budget, depth)
+            stmts.append(text)
+            budget -= used
+        return stmts
+
+    def statement(self, budget, depth):
+        rng = self.rng
+        if depth < self.nesting and budget >= 4 and rng.random() < 0.25:
+            return self.control(rng.randint(1, min(budget - 3, 12)), depth)
+        r = rng.random()
+        if r < 0.45:
+            return f"{rng.choice(self.writable)} := {self.expr(self.expr_depth)} mod 1000", 1
+        if r < 0.6:
+            return f"a[{self.index()}] := {self.expr(self.expr_depth)} mod 1000", 1
+        if r < 0.8:
+            return f"writeln('v=', {self.expr(self.expr_depth)})", 1
+        if r < 0.9 and self.procs:
+            return f"{rng.choice(self.procs)}({self.expr(self.expr_depth)})", 1
+        if r < 0.95:
+            return f"s := '{rng.choice(('abc', 'texto', 'pascal', 'xyz'))}'", 1
+        return "writeln(s, ' ', length(s))", 1
+
+    def control(self, inner, depth):
+        rng = self.rng
+        d = depth + 1
+        kind = rng.choice(('if', 'while', 'for', 'repeat'))
+        if kind == 'if':
+            if inner >= 2 and rng.random() < 0.5:
+                half = inner // 2
+                then_b = compound(self.block(half, d))
+                return f"if {self.cond()} then\n{then_b}\nelse\n{compound(self.block(inner - half, d))}", 1 + inner
+            return f"if {self.cond()} then\n{compound(self.block(inner, d))}", 1 + inner
+        limit = rng.randint(1, self.array_size)
+        if kind == 'for':
+            var = f"i{d}"
+            bounds = f"1 to {limit}" if rng.random() < 0.7 else f"{limit} downto 1"
+            self.indexes.append(var)
+            body = compound(self.block(inner, d))
+            self.indexes.pop()
+            return f"for {var} := {bounds} do\n{body}", 1 + inner
+        var = f"w{d}"
+        body = self.block(inner, d) + [f"{var} := {var} + 1"]
+        if kind == 'while':
+            return f"{var} := 0;\nwhile {var} < {limit} do\n{compound(body)}", 2 + inner
+        return f"{var} := 0;\nrepeat\n" + ";\n".join(body) + f"\nuntil {var} >= {limit}", 2 + inner
+
+    # --- expressões ------------------------------------------------------------
+    def index(self):
+        if self.indexes and self.rng.random() < 0.7: return self.rng.choice(self.indexes)
+        return str(self.rng.randint(1, self.array_size))
+
+    def leaf(self):
+        r = self.rng.random()
+        if r < 0.4: return str(self.rng.randint(0, 99))
+        if r < 0.85: return self.rng.choice(self.readable + self.indexes)
+        return f"a[{self.index()}]"
+
+    def expr(self, depth):
+        rng = self.rng
+        if depth <= 0 or rng.random() < 0.2: return self.leaf()
+        if self.funcs and rng.random() < 0.05:
+            args = ', '.join(self.expr(min(depth - 1, 1)) for _ in range(2))
+            return f"{rng.choice(self.funcs)}({args})"
+        op = rng.choice(('+', '-', '*', '+', '-', 'div', 'mod'))
+        left = self.expr(depth - 1)
+        right = str(rng.randint(1, 9)) if op in ('div', 'mod') else self.expr(depth - 1)
+        return f"({left} {op} {right})"
+
+    def cond(self):
+        rng = self.rng
+        depth = min(self.expr_depth, 2)
+        def rel(): return f"({self.expr(depth)} {rng.choice(('<', '>', '<=', '>=', '=', '<>'))} {self.expr(depth)})"
+        if rng.random() < 0.3: return f"{rel()} {rng.choice(('and', 'or'))} {rel()}"
+        return rel()
+
+def compound(stmts):
+    return "begin\n" + ";\n".join(stmts) + "\nend"
+
+def generate(**params):
+    """ Texto de um programa sintético (ver ProgramGenerator). """
+    return ProgramGenerator(**params).generate()
+
+# ------------------------------------------------------------------------------
+# Suite: tempo, débito e pico de memória por fase, para vários tamanhos
+# ------------------------------------------------------------------------------
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bench', 'baseline.json')
+SIZES = (100, 1000, 10000)
+
+def measure(text, repeat, optimize=0, scanner='ply', checked=False, all_errors=False):
+    """ Mede cada fase de Compiler.compile (mais o lexer sozinho, para os
+        tokens/s): o tempo é o melhor de repeat compilações e o pico de memória
+        vem de uma compilação à parte. """
+    times, peaks = {}, {}
+
+    def timed(name, fn, *args):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        times[name] = min(times.get(name, float('inf')), time.perf_counter() - t0)
+        return result
+
+    def traced(name, fn, *args):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = fn(*args)
+        peaks[name] = tracemalloc.get_traced_memory()[1] - base
+        return result
+
+    def lex():
+        if scanner == 'fast': return sum(1 for _ in tokenize(text))
+        lx = lexer.clone()
+        lx.lineno = 1
+        lx.input(text)
+        return sum(1 for _ in iter(lx.token, None))
+
+    def compile(phase):
+        # as fases são as de Compiler.compile, que chama phase em cada uma
+        c = Compiler(optimize, scanner=scanner, checked=checked,
+                     diagnostics=Diagnostics() if all_errors else None)
+        c.compile(text, run=phase)
+        return c
+
+    for _ in range(repeat):
+        tokens = timed('lex', lex)
+        c = compile(timed)
+    # a memória é medida numa execução à parte (o tracemalloc atrasa tudo)
+    tracemalloc.start()
+    try:
+        traced('lex', lex)
+        compile(traced)
+    finally:
+        tracemalloc.stop()
+    return {
+        'bytes': len(text), 'tokens': tokens, 'nodes': sum(1 for _ in walk(c.tree)),
+        'instrs': len(c.codegen.instrs), 'time': times, 'peak': peaks,
+        'tokens_per_s': tokens / times['lex'],
+    }
+
+def run_suite(sizes, repeat, optimize, params, scanner='ply', checked=False, all_errors=False):
+    results = []
+    for n in sizes:
+        text = generate(statements=n, **params)
+        r = measure(text, repeat, optimize, scanner, checked, all_errors)
+        r['statements'] = n
+        results.append(r)
+    return {'python': platform.python_version(), 'params': params, 'optimize': optimize,
+            'scanner': scanner, 'checked': checked, 'all_errors': all_errors,
+            'repeat': repeat, 'results': results}
+
+def print_suite(suite, base=None, threshold=0.10):
+    """ Imprime a suite; com base, compara os tempos e devolve as regressões. """
+    old = {r['statements']: r for r in base['results']} if base else {}
+    regressions = []
+    for r in suite['results']:
+        n = r['statements']
+        print(f"== {n} comandos: {r['bytes'] / 1024:.1f} KB, {r['tokens']} tokens, "
+              f"{r['nodes']} nós, {r['instrs']} instruções")
+        print(f"   {'fase':10} {'tempo ms':>10} {'pico KB':>10}" + (f" {'vs base':>9}" if n in old else ''))
+        for phase, secs in r['time'].items():
+            line = f"   {phase:10} {secs * 1000:10.2f} {r['peak'][phase] / 1024:10.1f}"
+            prev = old.get(n, {}).get('time', {}).get(phase)
+            if prev:
+                delta = secs / prev - 1
+                line += f" {delta:+9.1%}"
+                if delta > threshold:
+                    line += "  <- mais lento"
+                    regressions.append((n, phase, delta))
+            print(line)
+        total = sum(v for k, v in r['time'].items() if k != 'lex')
+        print(f"   lexer {r['tokens_per_s'] / 1e6:.2f} M tokens/s, compilação completa "
+              f"{total * 1000:.2f} ms ({r['tokens'] / total / 1e3:.0f} K tokens/s)\n")
+    return regressions
+
+# ------------------------------------------------------------------------------
+# Despacho: cadeia de isinstance (ordem do gerador antigo, com os nós mais
+# recentes no fim) vs tabela por classe. A cadeia tem de cobrir todas as
+# classes de CodeGen.HANDLERS, o que é verificado antes de medir.
+# ------------------------------------------------------------------------------
+def chain_lookup(node):
+    if isinstance(node, Program): return gen_program
+    elif isinstance(node, SubProgramDecl): return gen_subprogram
+    elif isinstance(node, Block): return gen_block
+    elif isinstance(node, Assign): return gen_assign
+    elif isinstance(node, FunctionCall): return gen_call
+    elif isinstance(node, VarAccess): return gen_var
+    elif isinstance(node, BinOp): return gen_binop
+    elif isinstance(node, Literal): return gen_literal
+    elif isinstance(node, Write): return gen_write
+    elif isinstance(node, Read): return gen_read
+    elif isinstance(node, If): return gen_if
+    elif isinstance(node, While): return gen_while
+    elif isinstance(node, Repeat): return gen_repeat
+    elif isinstance(node, For): return gen_for
+    elif isinstance(node, Case): return gen_case
+    elif isinstance(node, Branch): return gen_branch
+    elif isinstance(node, InlineCall): return gen_inline
+    elif isinstance(node, TailCall): return gen_tailcall
+
+class ChainCodeGen(CodeGen):
+    """ O mesmo gerador, mas a escolher o handler pela cadeia de isinstance. """
+    def gen(self, root):
+        stack = [root]
+        pop, extend = stack.pop, stack.extend
+        emit = self.instrs.append
+        while stack:
+            item = pop()
+            if type(item) is tuple: emit(item)
+            else: extend(reversed(chain_lookup(item)(self, item)))
+
+def dispatch_bench(repeat):
+    stale = [cls.__name__ for cls, fn in CodeGen.HANDLERS.items() if chain_lookup(object.__new__(cls)) is not fn]
+    if stale: raise SystemExit(f"chain_lookup desatualizada: falta {', '.join(stale)}")
+    trees = load_trees()
+    nodes = [n for _, tree in trees for n in walk(tree)]
+    handlers = CodeGen.HANDLERS
+
+    def by_chain():
+        for n in nodes: chain_lookup(n)
+    def by_table():
+        for n in nodes: handlers[type(n)]
+    def empty():
+        for n in nodes: pass
+
+    def codegen(cls):
+        def run():
+            for st, tree in trees: cls(st).gen(tree)
+        return run
+
+    n = len(nodes)
+    base = best_of(empty, repeat)
+    rows = [('despacho isinstance', best_of(by_chain, repeat) - base),
+            ('despacho tabela', best_of(by_table, repeat) - base),
+            ('codegen isinstance', best_of(codegen(ChainCodeGen), repeat)),
+            ('codegen tabela', best_of(codegen(CodeGen), repeat))]
+    print(f"{n} nós ({len(trees)} programas), melhor de {repeat}\n")
+    for name, secs in rows:
+        print(f"{name:22} {secs * 1e9 / n:8.1f} ns/nó")
+    print(f"\nDespacho: {rows[0][1] / rows[1][1]:.2f}x   codegen: {rows[2][1] / rows[3][1]:.2f}x")
+
+    # os dois geradores têm de produzir exatamente o mesmo código
+    for st, tree in trees[:len(trees) // 20 or 1]:
+        a, b = ChainCodeGen(st), CodeGen(st)
+        a.gen(tree); b.gen(tree)
+        assert a.instrs == b.instrs
+
+def add_generator_args(ap):
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--depth', dest='expr_depth', type=int, default=3, help='profundidade das expressões')
+    ap.add_argument('--subprograms', type=int, default=4, help='nº de funções/procedimentos')
+    ap.add_argument('--array-size', type=int, default=10)
+    ap.add_argument('--nesting', type=int, default=2, help='aninhamento máximo de if/while/for/repeat')
+
+def generator_params(args):
+    return {k: getattr(args, k) for k in ('seed', 'expr_depth', 'subprograms', 'array_size', 'nesting')}
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(prog='bench')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+
+    s = sub.add_parser('suite', help='mede cada fase para programas de vários tamanhos')
+    s.add_argument('--sizes', default=','.join(map(str, SIZES)), help='nº de comandos, separados por vírgulas')
+    s.add_argument('-n', '--repeat', type=int, default=3, help='repetições (conta a melhor)')
+    s.add_argument('-O', dest='optimize', type=int, default=0, choices=[0, 1, 2])
+    s.add_argument('--scanner', default='ply', choices=['ply', 'fast'])
+    s.add_argument('--checked', action='store_true', help='compila com a verificação dos índices')
+    s.add_argument('--all-errors', action='store_true', help='compila no modo de diagnóstico')
+    s.add_argument('--save', nargs='?', const=BASELINE, metavar='F', help=f'guarda os resultados (por omissão {BASELINE})')
+    s.add_argument('--compare', nargs='?', const=BASELINE, metavar='F', help='compara com resultados guardados')
+    s.add_argument('--threshold', type=float, default=0.10, help='abrandamento que conta como regressão')
+    add_generator_args(s)
+
+    g = sub.add_parser('generate', help='escreve um programa sintético em stdout')
+    g.add_argument('--statements', type=int, default=1000)
+    add_generator_args(g)
+
+    d = sub.add_parser('dispatch', help='despacho por tabela vs cadeia de isinstance no CodeGen')
+    d.add_argument('-n', '--repeat', type=int, default=7, help='repetições (conta a melhor)')
+    args = ap.parse_args(argv)
+
+    if args.cmd == 'generate':
+        print(generate(statements=args.statements, **generator_params(args)), end='')
+    elif args.cmd == 'dispatch':
+        dispatch_bench(args.repeat)
+    elif args.cmd == 'suite':
+        base = None
+        if args.compare:
+            with open(args.compare) as f: base = json.load(f)
+            if (base['params'], base['optimize'], base.get('scanner', 'ply'),
+                base.get('checked', False), base.get('all_errors', False)) != \
+               (generator_params(args), args.optimize, args.scanner, args.checked, args.all_errors):
+                print("Aviso: a base foi gerada com outros parâmetros; a comparação não é direta.\n")
+        sizes = [int(n) for n in args.sizes.split(',')]
+        suite = run_suite(sizes, args.repeat, args.optimize, generator_params(args), args.scanner,
+                          args.checked, args.all_errors)
+        regressions = print_suite(suite, base, args.threshold)
+        if args.save:
+            os.makedirs(os.path.dirname(args.save) or '.', exist_ok=True)
+            with open(args.save, 'w') as f: json.dump(suite, f, indent=1)
+            print(f"[-] Resultados guardados em {args.save}")
+        if regressions:
+            print(f"{len(regressions)} fases acima do limite de {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
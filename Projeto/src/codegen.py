@@ -0,0 +1,546 @@
+from ast_nodes import *
+from optimizer import is_pure, statements
+
+def format_instr(instr):
+    """ Converte (opcode, operando) na linha de texto da VM. """
+    op, arg = instr
+    if op == 'label': return f"{arg}:"
+    if op == 'pushs': return f'pushs "{arg}"'
+    if op == 'check': return f"check {arg[0]}, {arg[1]}"
+    if arg is None: return op
+    return f"{op} {arg}"
+
+# ==============================================================================
+# TABELAS DE OPCODES
+# Instruções sem estado são construídas uma única vez e partilhadas.
+# ==============================================================================
+START, STOP, RETURN, CALL = ('start', None), ('stop', None), ('return', None), ('call', None)
+ADD, SUB, NOT, EQUAL = ('add', None), ('sub', None), ('not', None), ('equal', None)
+INF, SUP, INFEQ, SUPEQ = ('inf', None), ('sup', None), ('infeq', None), ('supeq', None)
+LOADN, STOREN, CHARAT, STRLEN = ('loadn', None), ('storen', None), ('charat', None), ('strlen', None)
+READ, ATOI, WRITEI, WRITES = ('read', None), ('atoi', None), ('writei', None), ('writes', None)
+PUSH_0, PUSH_1, PUSHS_0, NEWLINE = ('pushi', 0), ('pushi', 1), ('pushs', '0'), ('pushs', '\\n')
+DUP = ('dup', 1)
+
+# Operador Pascal -> instruções que o implementam
+BINOPS = {
+    '+': (ADD,), '-': (SUB,), '*': (('mul', None),), '/': (('div', None),),
+    'DIV': (('div', None),), 'MOD': (('mod', None),),
+    'AND': (('mul', None),), 'OR': (ADD,),
+    '=': (EQUAL,), '<>': (EQUAL, NOT),
+    '<': (INF,), '>': (SUP,), '<=': (INFEQ,), '>=': (SUPEQ,),
+}
+
+# Operador relacional -> instruções que dão 0 quando a condição é verdadeira
+# (o jz do fim de um ciclo rodado salta de volta enquanto a condição se mantém)
+NEGATED = {'<': (SUPEQ,), '>': (INFEQ,), '<=': (SUP,), '>=': (INF,), '<>': (EQUAL,)}
+
+# Escolha do código de um case pelo nº de intervalos de rótulos (ver gen_case)
+CASE_LINEAR = 3         # até aqui, comparações em sequência
+CASE_TABLE = 8          # a partir daqui, tabela de saltos se os rótulos forem densos
+CASE_TABLE_MAX = 256    # tamanho máximo de uma tabela
+
+# ==============================================================================
+# GERADOR DE CÓDIGO (Assembly da VM)
+# Todo o estado (tabela de símbolos, instruções, contador de labels) vive na
+# instância, para que cada compilação seja independente das restantes.
+# Espera uma AST já validada pelo TypeChecker (semantics.py).
+# ==============================================================================
+class CodeGen:
+    # Classe do nó -> método que o expande (preenchida por @handles)
+    HANDLERS = {}
+
+    def __init__(self, st, bulk=False, rotate=False, checked=False, short=False, pool=False):
+        self.st = st
+        self.bulk = bulk        # reservar escalares seguidos com um só pushn (-O1)
+        self.rotate = rotate    # ciclos com o teste no fim (-O1)
+        self.short = short      # AND/OR em curto-circuito (-O1)
+        self.pool = pool        # juntar as constantes escritas e partilhar as repetidas (-O1)
+        self.strings = {}       # texto -> slot global da string partilhada
+        self.tables = {}        # Case -> (slot global, menor rótulo, tamanho, labels dos ramos, label do else, frame)
+        self.checked = checked  # verificar os índices dos arrays (--checked)
+        self.safe = ()          # acessos que a IndexRanges provou estarem dentro dos limites
+        self.entry = None       # label do corpo do subprograma atual (destino dos TailCall)
+        self.checks = 0
+        self.instrs = []
+        self.label_count = 0
+
+    def new_label(self):
+        self.label_count += 1
+        return f"L{self.label_count}"
+
+    def output(self):
+        return "\n".join(format_instr(i) for i in self.instrs) + "\n"
+
+    # ==========================================================================
+    # EMISSÃO DE INSTRUÇÕES
+    # A AST é percorrida com uma pilha explícita, pelo que a profundidade das
+    # expressões não está limitada pela recursão do Python. Cada nó é expandido
+    # pelo handler da sua classe numa lista ordenada de instruções e de nós
+    # filhos ainda por gerar. Cada instrução é um par (opcode, operando); as
+    # labels são ('label', nome).
+    # ==========================================================================
+    def gen(self, root):
+        stack = [root]
+        pop, extend = stack.pop, stack.extend
+        emit = self.instrs.append
+        handlers = self.HANDLERS
+        while stack:
+            item = pop()
+            if type(item) is tuple: emit(item)
+            else: extend(reversed(handlers[type(item)](self, item)))
+
+    def expand(self, node):
+        return self.HANDLERS[type(node)](self, node)
+
+    def logical(self, node):
+        """ 'AND'/'OR' se node é um AND/OR entre booleanos avaliado em
+            curto-circuito, senão None. """
+        if self.short and isinstance(node, BinOp) and node.left.type == node.right.type == 'BOOLEAN':
+            op = node.op.upper()
+            if op in ('AND', 'OR'): return op
+        return None
+
+    def rotates(self, cond):
+        """ Rodar um while só compensa se saltar quando cond é verdadeira não
+            custar mais do que saltar quando é falsa; nos AND/OR isso só depende
+            do operando mais à direita. """
+        while self.logical(cond): cond = cond.right
+        return self.negated(cond) is not None
+
+    def negated(self, cond):
+        """ Código que deixa 0 na pilha quando cond é verdadeira, ou None se
+            custar mais do que cond (aí o ciclo não é rodado). """
+        if isinstance(cond, BinOp):
+            op = cond.op.upper()
+            if op in NEGATED: return [cond.left, cond.right, *NEGATED[op]]
+            if op == '=' and cond.left.type == cond.right.type == 'INTEGER':
+                return [cond.left, cond.right, SUB]
+        return None
+
+    # --------------------------------------------------------------------------
+    # Acesso a elementos de arrays
+    # O endereço de a[i] é base + (i - lower), com o limite inferior declarado.
+    # Um índice constante dentro dos limites dá logo o deslocamento (load k /
+    # store k). Com --checked, um 'check lower, upper' antes da subtração
+    # pára a VM se o índice estiver fora dos limites.
+    # --------------------------------------------------------------------------
+    def offset(self, node):
+        """ Deslocamento constante de node[index_expr] num array, ou None. """
+        kind, index = node.scope.type, node.index_expr
+        if not isinstance(kind, dict) or not isinstance(index, Literal) or index.type_name != 'INTEGER':
+            return None
+        k = index.value - kind['lower']
+        return k if 0 <= k < kind['size'] else None
+
+    def index(self, node):
+        """ Instruções que põem na pilha o índice (a partir de 0) de node. """
+        kind = node.scope.type
+        if not isinstance(kind, dict): return [node.index_expr, PUSH_1, SUB]    # strings
+        out = [node.index_expr]
+        if self.checked and node not in self.safe:
+            out.append(('check', (kind['lower'], kind['lower'] + kind['size'] - 1)))
+            self.checks += 1
+        lower = kind['lower']
+        if lower == 1: out += [PUSH_1, SUB]
+        elif lower: out += [('pushi', lower), SUB]
+        return out
+
+    def reserve(self, symbols):
+        """ Instruções que criam os slots das variáveis, por ordem de offset: alloc
+            para arrays, pushs "0" para strings e pushi 0 (ou, com bulk, um
+            único pushn N por sequência) para os restantes. """
+        slots = {v.offset: v.type for v in symbols if v.live and v.offset >= 0}
+        out = []
+        for i in range(frame_size(symbols)):
+            instr = self.initial(slots.get(i))
+            if instr != PUSH_0 or not self.bulk or not out: out.append(instr)
+            elif out[-1][0] == 'pushn': out[-1] = ('pushn', out[-1][1] + 1)
+            elif out[-1] == PUSH_0: out[-1] = ('pushn', 2)
+            else: out.append(instr)
+        return out
+
+    def initial(self, kind):
+        """ Instrução que põe na pilha o valor inicial de uma variável do tipo kind. """
+        if isinstance(kind, dict): return ("alloc", kind['size'])
+        if str(kind).upper() == 'STRING': return PUSHS_0
+        return PUSH_0
+
+    # --------------------------------------------------------------------------
+    # Constantes de texto
+    # Com pool, os argumentos constantes seguidos de um write/writeln (e a
+    # mudança de linha) são juntos num só texto, escrito com um único writes.
+    # Cada texto que aparece mais de uma vez no programa é posto uma só vez
+    # num slot global, a seguir às variáveis, e lido com pushg.
+    # --------------------------------------------------------------------------
+    def pieces(self, node):
+        """ Argumentos de node (Write), com as constantes seguidas já juntas em texto (str). """
+        items = [e if not isinstance(e, Literal) else e.value if e.type_name == 'STRING' else str(e.value)
+                 for e in node.exprs]
+        if node.newline: items.append(NEWLINE[1])
+        out = []
+        for e in items:
+            # uma barra no fim formaria uma sequência de escape com o texto seguinte
+            if type(e) is str and out and type(out[-1]) is str and not out[-1].endswith('\\'): out[-1] += e
+            else: out.append(e)
+        return out
+
+    def share(self, root, base):
+        """ Dá um slot global, a seguir aos das variáveis, a cada texto repetido
+            em root; devolve as instruções que os preenchem. """
+        count, inside = {}, set()
+        for n in walk(root):
+            if isinstance(n, Write):
+                for p in self.pieces(n):
+                    if type(p) is str: count[p] = count.get(p, 0) + 1
+                inside.update(id(e) for e in n.exprs)
+            elif isinstance(n, Literal) and n.type_name == 'STRING' and id(n) not in inside:
+                count[n.value] = count.get(n.value, 0) + 1
+        shared = [text for text, c in count.items() if c > 1]
+        self.strings = {text: base + i for i, text in enumerate(shared)}
+        return [("pushs", text) for text in shared]
+
+    def string(self, text):
+        k = self.strings.get(text)
+        return ("pushs", text) if k is None else ("pushg", k)
+
+    # --------------------------------------------------------------------------
+    # case
+    # O seletor é comparado com os intervalos de rótulos ordenados: em
+    # sequência se forem poucos (CASE_LINEAR), senão por pesquisa binária, em
+    # que cada comparação divide os intervalos ao meio e as folhas só testam
+    # os limites que ainda não se conhecem. Um seletor que não é uma variável
+    # simples é calculado uma vez e fica na pilha (dup 1 em cada comparação,
+    # pop 1 à entrada de cada ramo).
+    # A VM só tem saltos para labels; a tabela de saltos é um array global de
+    # endereços (pusha) preenchido no arranque, e o ramo é executado com call
+    # e acaba em return. O call põe o fp no topo da pilha, que num comando de
+    # um subprograma está sempre a tantos slots do fp quantos os das variáveis
+    # locais (o frame): o código do ramo é gerado à parte, com os pushl/storel
+    # deslocados do frame. No corpo principal (só com globais) a tabela só é
+    # usada dentro de ciclos, onde o custo de a preencher no arranque é pago
+    # pelas várias execuções; num subprograma, que pode ser chamado várias
+    # vezes, é usada sempre. Um case com chamadas finais (saltos para o início
+    # do subprograma) ou dentro de uma função expandida (com valores na pilha)
+    # fica com as comparações.
+    # --------------------------------------------------------------------------
+    def case_tables(self, program, base):
+        """ Dá um slot global (a partir de base) à tabela de cada case denso que
+            a pode usar; devolve as instruções que as criam e preenchem. """
+        allocs, fills = [], []
+        stack = [(program.body, False, 0)]
+        stack += [(sub.body, True, frame_size(sub.locals_data)) for sub in program.subprograms]
+        while stack:
+            node, eligible, frame = stack.pop()
+            if isinstance(node, Case) and eligible and not any(isinstance(n, TailCall) for n in walk(node)):
+                ranges = case_ranges(node)
+                if dense(ranges):
+                    slot, low = base + len(allocs), ranges[0][0]
+                    size = ranges[-1][1] - low + 1
+                    targets = [self.new_label() for _ in node.arms]
+                    l_else = self.new_label()
+                    entries = [l_else] * size
+                    for lo, hi, k in ranges: entries[lo - low:hi - low + 1] = [targets[k]] * (hi - lo + 1)
+                    self.tables[node] = (slot, low, size, targets, l_else, frame)
+                    allocs.append(("alloc", size))
+                    for i, label in enumerate(entries): fills += [("pushg", slot), ("pusha", label), ("store", i)]
+                    frame = 0       # os ramos correm com o fp no topo da pilha
+            eligible = eligible or isinstance(node, (While, Repeat, For))
+            stack.extend((s, eligible, frame) for s in statements(node))
+        return allocs + fills
+
+    def subroutine(self, node, shift):
+        """ Instruções de node para correr com call, com o fp shift slots acima
+            do frame onde node está. """
+        saved, self.instrs = self.instrs, []
+        self.gen(node)
+        code, self.instrs = self.instrs, saved
+        if not shift: return code
+        return [(op, arg - shift) if op in ('pushl', 'storel') else (op, arg) for op, arg in code]
+
+    def dispatch(self, ranges, probe, low, high, targets, l_else):
+        """ Instruções que saltam para targets[k] se o seletor (posto na pilha por
+            probe) está num intervalo (lo, hi, k) de ranges, senão para l_else;
+            low e high são os limites já conhecidos do seletor (None: nenhum). """
+        if len(ranges) <= CASE_LINEAR:
+            out = []
+            for lo, hi, k in ranges:
+                out += self.case_test(probe, lo, hi, low, high, targets[k])
+            return out + [("jump", l_else)]
+        mid = len(ranges) // 2
+        pivot, right = ranges[mid][0], self.new_label()
+        return [probe, ("pushi", pivot), INF, ("jz", right),
+                *self.dispatch(ranges[:mid], probe, low, pivot - 1, targets, l_else),
+                ('label', right), *self.dispatch(ranges[mid:], probe, pivot, high, targets, l_else)]
+
+    def case_test(self, probe, lo, hi, low, high, target):
+        """ Salto para target se lo <= seletor <= hi. """
+        below, above = low is None or low < lo, high is None or high > hi
+        if below and above:
+            if lo == hi: return [probe, ("pushi", lo), SUB, ("jz", target)]
+            skip = self.new_label()
+            return [probe, ("pushi", lo), SUPEQ, ("jz", skip),
+                    probe, ("pushi", hi), SUP, ("jz", target), ('label', skip)]
+        if below: return [probe, ("pushi", lo), INF, ("jz", target)]
+        if above: return [probe, ("pushi", hi), SUP, ("jz", target)]
+        return [("jump", target)]
+
+def case_ranges(node):
+    """ Intervalos (lo, hi, ramo) dos rótulos de node, ordenados e com os
+        intervalos seguidos do mesmo ramo juntos. """
+    out = []
+    for lo, hi, k in sorted((a.value, b.value, k) for k, labels in enumerate(node.labels) for a, b in labels):
+        if out and out[-1][2] == k and out[-1][1] + 1 == lo: out[-1] = (out[-1][0], hi, k)
+        else: out.append((lo, hi, k))
+    return out
+
+def frame_size(symbols):
+    """ Nº de slots que reserve(symbols) cria. """
+    return max((v.offset for v in symbols if v.live and v.offset >= 0), default=-1) + 1
+
+def dense(ranges):
+    """ True se compensa uma tabela de saltos para estes intervalos. """
+    if len(ranges) < CASE_TABLE: return False
+    size = ranges[-1][1] - ranges[0][0] + 1
+    return size <= CASE_TABLE_MAX and size <= 2 * sum(hi - lo + 1 for lo, hi, _ in ranges)
+
+class Branch:
+    """ Salto condicional ainda por gerar: para label se cond valer value. """
+    __slots__ = ('cond', 'label', 'value')
+
+    def __init__(self, cond, label, value):
+        self.cond = cond
+        self.label = label
+        self.value = value
+
+def handles(*classes):
+    """ Regista a função decorada como handler das classes de nó indicadas. """
+    def register(fn):
+        for cls in classes: CodeGen.HANDLERS[cls] = fn
+        return fn
+    return register
+
+# ------------------------------------------------------------------------------
+# Programa e subprogramas
+# ------------------------------------------------------------------------------
+@handles(Program)
+def gen_program(self, node):
+    out = [START]
+    out += self.reserve(self.st.globals.values())
+    base = frame_size(self.st.globals.values())
+    if self.pool: out += self.share(node, base)
+    out += self.case_tables(node, base + len(self.strings))
+    l_main = self.new_label()
+    out.append(("jump", l_main))
+    out.extend(node.subprograms)
+    out += [('label', l_main), node.body, STOP]
+    return out
+
+@handles(SubProgramDecl)
+def gen_subprogram(self, node):
+    out = [('label', node.scope.label)]
+    out += self.reserve(node.locals_data)
+    if node.tail:
+        self.entry = self.new_label()
+        out.append(('label', self.entry))
+    out += [node.body, RETURN]
+    return out
+
+@handles(Block)
+def gen_block(self, node):
+    return node.statements
+
+# ------------------------------------------------------------------------------
+# Atribuições, chamadas e expressões
+# ------------------------------------------------------------------------------
+@handles(Assign)
+def gen_assign(self, node):
+    info = node.scope
+    if node.index_expr:
+        k = self.offset(node)
+        if k is not None: return [info.push, node.expr, ('store', k)]
+        return [info.push, *self.index(node), node.expr, STOREN]
+    return [node.expr, info.store]
+
+@handles(FunctionCall)
+def gen_call(self, node):
+    if node.name.lower() == 'length':
+        return [node.args[0], STRLEN]
+
+    info = node.scope or self.st.get_func(node.name)
+    out = [PUSH_0] if info.ret else []
+    out += node.args
+    out += [("pusha", info.label), CALL]
+    if node.args: out.append(("pop", len(node.args)))
+    return out
+
+@handles(VarAccess)
+def gen_var(self, node):
+    info = node.scope
+    if node.index_expr:
+        k = self.offset(node)
+        if k is not None: return [info.push, ('load', k)]
+        load = CHARAT if str(info.type).upper() == 'STRING' else LOADN
+        return [info.push, *self.index(node), load]
+    return [info.push]
+
+@handles(BinOp)
+def gen_binop(self, node):
+    op = self.logical(node)
+    if op and not is_pure(node.right):
+        # operando direito caro (chamada, acesso indexado, divisão): só é
+        # calculado se o esquerdo não decidir o resultado
+        l1, l2 = self.new_label(), self.new_label()
+        return [Branch(node, l1, False), PUSH_1, ("jump", l2), ('label', l1), PUSH_0, ('label', l2)]
+    if op == 'OR':
+        return [node.left, node.right, ADD, PUSH_0, SUP]     # 0 ou 1, não 2
+    return [node.left, node.right, *BINOPS.get(node.op.upper(), (ADD,))]
+
+@handles(TailCall)
+def gen_tailcall(self, node):
+    # os argumentos são todos calculados antes de se escrever nos parâmetros,
+    # que ainda podem ser lidos por eles
+    out = []
+    for arg, param in zip(node.args, node.params):
+        out.append(arg)
+        if param is None: out.append(("pop", 1))
+    out += [param.store for param in reversed(node.params) if param is not None]
+    for sym in node.reset: out += [self.initial(sym.type), sym.store]
+    out.append(("jump", self.entry))
+    return out
+
+@handles(InlineCall)
+def gen_inline(self, node):
+    return [node.body, node.result]
+
+@handles(Literal)
+def gen_literal(self, node):
+    if node.type_name == 'STRING': return [self.string(node.value)]
+    return [("pushi", node.value)]
+
+# ------------------------------------------------------------------------------
+# Entrada e saída
+# ------------------------------------------------------------------------------
+@handles(Write)
+def gen_write(self, node):
+    if self.pool:
+        out = []
+        for e in self.pieces(node):
+            if type(e) is str: out += [self.string(e), WRITES]
+            elif isinstance(e, VarAccess) and str(e.scope.type).upper() == 'STRING': out += [e, WRITES]
+            else: out += [e, WRITEI]
+        return out
+    out = []
+    for e in node.exprs:
+        out.append(e)
+        if isinstance(e, Literal) and e.type_name == 'STRING':
+            out.append(WRITES)
+        elif isinstance(e, VarAccess):
+            out.append(WRITES if str(e.scope.type).upper() == 'STRING' else WRITEI)
+        else:
+            out.append(WRITEI)
+    if node.newline:
+        out += [NEWLINE, WRITES]
+    return out
+
+@handles(Read)
+def gen_read(self, node):
+    info = node.scope
+    if node.index_expr:
+        k = self.offset(node)
+        if k is not None: return [info.push, READ, ATOI, ('store', k)]
+        return [info.push, *self.index(node), READ, ATOI, STOREN]
+    if str(info.type).upper() != 'STRING':
+        return [READ, ATOI, info.store]
+    return [READ, info.store]
+
+# ------------------------------------------------------------------------------
+# Estruturas de controlo
+# ------------------------------------------------------------------------------
+# Os testes são gerados por Branch: com short (-O1) um AND/OR salta logo para
+# o destino assim que um dos operandos decide o resultado, sem calcular o
+# outro nem deixar na pilha o valor booleano intermédio.
+@handles(Branch)
+def gen_branch(self, node):
+    cond, label, value = node.cond, node.label, node.value
+    op = self.logical(cond)
+    if op:
+        if (op == 'OR') == value:
+            # OR verdadeiro / AND falso: basta um dos operandos
+            return [Branch(cond.left, label, value), Branch(cond.right, label, value)]
+        skip = self.new_label()
+        return [Branch(cond.left, skip, not value), Branch(cond.right, label, value), ('label', skip)]
+    if value: return [*(self.negated(cond) or [cond, NOT]), ("jz", label)]
+    return [cond, ("jz", label)]
+
+@handles(If)
+def gen_if(self, node):
+    l1, l2 = self.new_label(), self.new_label()
+    if node.else_b:
+        return [Branch(node.cond, l1, False), node.then_b, ("jump", l2),
+                ('label', l1), node.else_b, ('label', l2)]
+    return [Branch(node.cond, l1, False), node.then_b, ('label', l1)]
+
+# Com rotate (-O1) o teste dos ciclos for, e dos while em que saltar quando a
+# condição é verdadeira não custa mais (rotates), passa para o fim: à entrada
+# salta-se para o teste, e cada iteração faz só um jz (de volta ao corpo) em
+# vez de jz + jump.
+@handles(While)
+def gen_while(self, node):
+    if node.forever:
+        l1 = self.new_label()
+        return [('label', l1), node.body, ("jump", l1)]
+    l1, l2 = self.new_label(), self.new_label()
+    if self.rotate and self.rotates(node.cond):
+        return [("jump", l2), ('label', l1), node.body, ('label', l2), Branch(node.cond, l1, True)]
+    return [('label', l1), Branch(node.cond, l2, False), node.body, ("jump", l1), ('label', l2)]
+
+@handles(Repeat)
+def gen_repeat(self, node):
+    l1 = self.new_label()
+    return [('label', l1), *node.statements, Branch(node.cond, l1, False)]
+
+@handles(Case)
+def gen_case(self, node):
+    l_end = self.new_label()
+    if node in self.tables:
+        slot, low, size, targets, l_else, frame = self.tables[node]
+        l_out = self.new_label()
+        out = [("pushg", slot), node.selector]
+        if low: out += [("pushi", low), SUB]
+        out += [DUP, PUSH_0, SUPEQ, ("jz", l_out), DUP, ("pushi", size), INF, ("jz", l_out),
+                LOADN, CALL, ("jump", l_end), ('label', l_out), ("pop", 2), ("pusha", l_else), CALL, ("jump", l_end)]
+        for label, arm in zip(targets, node.arms): out += [('label', label), *self.subroutine(arm, frame), RETURN]
+        if node.else_b: out += [('label', l_else), *self.subroutine(node.else_b, frame), RETURN]
+        else: out += [('label', l_else), RETURN]
+        return out + [('label', l_end)]
+
+    sel = node.selector
+    simple = isinstance(sel, Literal) or (isinstance(sel, VarAccess) and sel.index_expr is None)
+    probe, drop = (self.expand(sel)[0], []) if simple else (DUP, [("pop", 1)])
+    targets = [self.new_label() for _ in node.arms]
+    l_else = self.new_label()
+    out = [] if simple else [sel]
+    out += self.dispatch(case_ranges(node), probe, None, None, targets, l_else)
+    out += [('label', l_else), *drop]
+    if node.else_b: out.append(node.else_b)
+    for label, arm in zip(targets, node.arms):
+        out += [("jump", l_end), ('label', label), *drop, arm]
+    return out + [('label', l_end)]
+
+@handles(For)
+def gen_for(self, node):
+    push, store = node.scope.push, node.scope.store
+    l1, l2 = self.new_label(), self.new_label()
+    up = node.direction == 'to'
+    if self.rotate:
+        out = [node.start, store]
+        end = node.end
+        if node.limit:
+            out += [node.end, node.limit.store]
+            end = node.limit.push
+        return out + [("jump", l2), ('label', l1), node.body, push, PUSH_1, ADD if up else SUB, store,
+                      ('label', l2), push, end, SUP if up else INF, ("jz", l1)]
+    return [node.start, store, ('label', l1), push, node.end, INFEQ if up else SUPEQ,
+            ("jz", l2), node.body, push, PUSH_1, ADD if up else SUB, store,
+            ("jump", l1), ('label', l2)]
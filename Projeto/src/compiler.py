@@ -0,0 +1,156 @@
+import argparse
+import os
+import sys
+import time
+
+# ==============================================================================
+# COMPILAÇÃO EM LOTE
+# Uso: python -m compiler build <ficheiros ou pastas> [-j N]
+# Cada worker importa o parser (e as tabelas PLY) uma única vez e compila
+# todos os ficheiros que lhe forem atribuídos.
+# Os módulos do compilador (e o PLY) só são importados quando são precisos.
+# ==============================================================================
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def find_sources(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, n) for n in names if n.endswith('.pas')]
+        else:
+            files.append(path)
+    return sorted(files)
+
+def write_atomic(path, data):
+    """ Escreve para um ficheiro temporário na mesma pasta e troca-o de uma vez. """
+    import tempfile
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='\n') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def compile_file(path, optimize=0, scanner=None, parser=None, max_errors=None, checked=False):
+    """ Compila um ficheiro; devolve (path, ok, segundos, mensagem). Com
+        max_errors (modo --all-errors) a mensagem traz todos os erros. """
+    from parser import Compiler
+    from semantics import CompileError
+
+    t0 = time.perf_counter()
+    try:
+        with open(path, 'r', newline='') as f:
+            text = f.read().replace('\r', '')
+        diagnostics = None
+        if max_errors is not None:
+            from diagnostics import Diagnostics
+            diagnostics = Diagnostics(max_errors)
+        compiler = Compiler(optimize, scanner=scanner, parser=parser, diagnostics=diagnostics, checked=checked)
+        code = compiler.compile(text)
+        out = os.path.splitext(path)[0] + '.vm'
+        write_atomic(out, code)
+        note = f"-{compiler.peephole.removed} instruções" if compiler.peephole else ''
+        return path, True, time.perf_counter() - t0, note
+    except (CompileError, OSError) as e:
+        return path, False, time.perf_counter() - t0, str(e)
+
+def build(paths, jobs, optimize=0, scanner=None, parser=None, max_errors=None, checked=False):
+    files = find_sources(paths)
+    if jobs <= 1:
+        results = [compile_file(f, optimize, scanner, parser, max_errors, checked) for f in files]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(compile_file, files, [optimize] * len(files), [scanner] * len(files), [parser] * len(files),
+                                    [max_errors] * len(files), [checked] * len(files),
+                                    chunksize=max(1, len(files) // (jobs * 4))))
+    return results
+
+def print_summary(results, elapsed):
+    ok = 0
+    for path, success, secs, msg in results:
+        status = 'OK  ' if success else 'ERRO'
+        line = f"{status} {secs * 1000:8.2f} ms  {path}"
+        if msg: line += "  -> " + msg.replace("\n", "\n" + " " * 8)
+        print(line)
+        ok += success
+    print(f"\n{ok} compilados, {len(results) - ok} com erro, {len(results)} no total ({elapsed:.2f} s)")
+
+# ==============================================================================
+# TABELAS E ARRANQUE
+# ==============================================================================
+
+def regenerate_tables():
+    """ Reconstrói lextab.py, parsetab.py e parser.out com o PLY completo. """
+    os.environ['PLC_TABLES'] = 'build'
+    import lexer
+    import parser
+    parser.get_parser()
+    lexer.lexer.writetab('lextab', SRC_DIR)
+    print(f"[-] Tabelas atualizadas em {SRC_DIR}")
+
+def startup_bench(runs):
+    """ Mede o custo de arrancar um processo e compilar um programa mínimo. """
+    import statistics
+    import subprocess
+
+    prog = "from parser import compile_source; compile_source('program p; begin writeln(1) end.')"
+    cases = [('python (sem compilador)', 'pass', 'frozen', 'lalr'),
+             ('tabelas congeladas', prog, 'frozen', 'lalr'),
+             ('PLY completo (yacc.yacc)', prog, 'build', 'lalr'),
+             ('parser descendente (rd)', prog, 'frozen', 'rd')]
+    medians = {}
+    for name, code, mode, parser in cases:
+        env = dict(os.environ, PLC_TABLES=mode, PLC_PARSER=parser)
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, env=env, check=True)
+            times.append(time.perf_counter() - t0)
+        medians[name] = statistics.median(times)
+        print(f"{name:26} min {min(times) * 1000:8.2f} ms   mediana {medians[name] * 1000:8.2f} ms")
+    base = medians['python (sem compilador)']
+    print(f"\nCusto fixo do compilador: {(medians['tabelas congeladas'] - base) * 1000:.2f} ms "
+          f"(PLY completo: {(medians['PLY completo (yacc.yacc)'] - base) * 1000:.2f} ms, "
+          f"parser descendente: {(medians['parser descendente (rd)'] - base) * 1000:.2f} ms)")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='compiler')
+    ap.add_argument('--startup-bench', action='store_true', help='mede o tempo de arranque a frio')
+    ap.add_argument('--runs', type=int, default=20, help='repetições do --startup-bench')
+    sub = ap.add_subparsers(dest='cmd')
+    b = sub.add_parser('build', help='compila ficheiros .pas ou pastas inteiras')
+    b.add_argument('paths', nargs='+')
+    b.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1)
+    b.add_argument('-O', dest='optimize', type=int, default=0, choices=[0, 1, 2], help='nível de otimização')
+    b.add_argument('--checked', action='store_true', help='verifica os índices dos arrays durante a execução')
+    b.add_argument('--scanner', choices=['ply', 'fast'], help='lexer a usar (por omissão PLC_SCANNER ou ply)')
+    b.add_argument('--parser', choices=['lalr', 'rd'], help='parser a usar (por omissão PLC_PARSER ou lalr)')
+    b.add_argument('--all-errors', action='store_true', help='reporta todos os erros de cada ficheiro')
+    b.add_argument('--max-errors', type=int, metavar='N', help='com --all-errors, máximo de erros por ficheiro (por omissão 20; 0 sem limite)')
+    sub.add_parser('tables', help='regenera lextab.py, parsetab.py e parser.out')
+    args = ap.parse_args(argv)
+
+    if args.startup_bench:
+        startup_bench(args.runs)
+        return 0
+    if args.cmd == 'tables':
+        regenerate_tables()
+        return 0
+    if args.cmd is None:
+        ap.print_help()
+        return 1
+    if args.cmd == 'build':
+        t0 = time.perf_counter()
+        max_errors = args.max_errors
+        if args.all_errors and max_errors is None: max_errors = 20
+        results = build(args.paths, args.jobs, args.optimize, args.scanner, args.parser, max_errors, args.checked)
+        print_summary(results, time.perf_counter() - t0)
+        return 0 if all(r[1] for r in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
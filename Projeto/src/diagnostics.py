@@ -0,0 +1,87 @@
+import json
+
+from semantics import CompileError
+
+# ==============================================================================
+# MODO DE DIAGNÓSTICO (--all-errors)
+# Em vez de parar no primeiro erro, a compilação regista todos os erros
+# léxicos, sintáticos e semânticos que encontrar numa só passagem:
+#   - caracteres ilegais: registados pelo t_error do lexer
+#   - erros de sintaxe: o parser recupera no ';' seguinte (produções 'error'
+#     em statement e var_line) e continua
+#   - variáveis não definidas: registadas no parse (só no primeiro uso de cada
+#     uma), o nó fica com um símbolo de tipo UNKNOWN (que o TypeChecker não
+#     volta a reportar); as variáveis de uma declaração com erro que chegaram
+#     a ser lidas ficam declaradas
+#   - erros de tipos: o TypeChecker regista o erro de cada comando e passa ao
+#     seguinte
+# Ao chegar a 'limit' erros a compilação pára (TooManyErrors). As posições são
+# guardadas como lexpos e só convertidas em linha/coluna (contando todas as
+# mudanças de linha do texto) na saída.
+# ==============================================================================
+KINDS = ('lexico', 'sintaxe', 'semantico')
+
+class TooManyErrors(CompileError):
+    pass
+
+class Diagnostics:
+    def __init__(self, limit=20):
+        self.limit = limit
+        self.text = ''
+        self.errors = []        # [(kind, mensagem, lexpos ou None)]
+        self.seen = set()       # mensagens registadas com error_once
+        self.truncated = False
+
+    def error(self, kind, message, lexpos=None):
+        self.errors.append((kind, message, lexpos))
+        if self.limit and len(self.errors) >= self.limit:
+            self.truncated = True
+            raise TooManyErrors(message)
+
+    def error_once(self, kind, message, lexpos=None):
+        """ Como error, mas só da primeira vez que a mensagem aparece (uma
+            variável não definida é reportada no primeiro uso). """
+        if message in self.seen: return
+        self.seen.add(message)
+        self.error(kind, message, lexpos)
+
+    def syntax_error(self, tok):
+        """ Substitui o p_error do parser: regista e deixa o PLY recuperar. """
+        if tok is None: self.error('sintaxe', "Erro: Fim inesperado", len(self.text))
+        else: self.error('sintaxe', f"Erro Sintaxe: '{tok.value}' linha {tok.lineno}", tok.lexpos)
+
+    def position(self, lexpos):
+        """ (linha, coluna), ambas a partir de 1. """
+        if lexpos is None: return None, None
+        line_start = self.text.rfind('\n', 0, lexpos) + 1
+        return self.text.count('\n', 0, lexpos) + 1, lexpos - line_start + 1
+
+    def sorted(self):
+        """ Erros por ordem de posição no texto (os sem posição no fim). """
+        keyed = [(lexpos is None, lexpos or 0, i) for i, (_, _, lexpos) in enumerate(self.errors)]
+        return [self.errors[i] for _, _, i in sorted(keyed)]
+
+    # --------------------------------------------------------------------------
+    # Saída
+    # --------------------------------------------------------------------------
+    def as_dict(self):
+        errors = []
+        for kind, message, lexpos in self.sorted():
+            line, column = self.position(lexpos)
+            errors.append({'kind': kind, 'message': message, 'line': line, 'column': column})
+        return {'errors': errors, 'count': len(errors), 'truncated': self.truncated}
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=1, ensure_ascii=False)
+
+    def format(self):
+        lines = []
+        for kind, message, lexpos in self.sorted():
+            line, column = self.position(lexpos)
+            where = f"{line}:{column}" if line else "-"
+            lines.append(f"{where}: {message}")
+        n = len(self.errors)
+        summary = f"{n} erro{'s' if n != 1 else ''}"
+        if self.truncated: summary += f" (parou ao atingir o limite de {self.limit})"
+        lines.append(summary)
+        return "\n".join(lines)
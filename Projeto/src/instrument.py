@@ -0,0 +1,123 @@
+import json
+import time
+from collections import Counter
+
+from ast_nodes import walk
+
+# ==============================================================================
+# INSTRUMENTAÇÃO DA COMPILAÇÃO (--timings / --stats)
+# Um Compiler sem CompileStats não passa por nenhum código daqui: os contadores
+# de tokens e de procuras na tabela de símbolos só são instalados, na cópia do
+# lexer e na tabela de símbolos dessa compilação, quando a instrumentação está
+# ligada. As fases são medidas com perf_counter; 'lex' é o tempo gasto dentro
+# do lexer durante o parse e já é descontado de 'parse'.
+# ==============================================================================
+
+class CompileStats:
+    def __init__(self):
+        self.times = {}
+        self.tokens = 0
+        self.lex_time = 0.0
+        self.lookups = Counter()
+        self.lookup_time = 0.0
+        self.nodes = Counter()
+        self.opcodes = Counter()
+        self.labels = 0
+
+    def phase(self, name, fn, *args):
+        """ Executa fn(*args) e acumula o tempo na fase name. """
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - t0
+
+    def lex_input(self, lx, text):
+        """ lx.input(text), contado como tempo do lexer (o scanner rápido faz aí o trabalho todo). """
+        t0 = time.perf_counter()
+        lx.input(text)
+        self.lex_time += time.perf_counter() - t0
+
+    def lex_all(self, scan, text):
+        """ scan(text) de uma só vez (parser descendente): tempo do lexer e nº de tokens. """
+        t0 = time.perf_counter()
+        stream = scan(text)
+        self.lex_time += time.perf_counter() - t0
+        self.tokens += len(stream)
+        return stream
+
+    def token_counter(self, token):
+        """ Envolve a função de tokens do lexer: conta e cronometra cada token. """
+        clock = time.perf_counter
+        def next_token():
+            t0 = clock()
+            tok = token()
+            self.lex_time += clock() - t0
+            if tok is not None: self.tokens += 1
+            return tok
+        return next_token
+
+    def count_lookups(self, st):
+        """ Substitui get/get_func desta tabela de símbolos por versões contadas. """
+        clock = time.perf_counter
+        def counted(kind, fn):
+            def lookup(name):
+                t0 = clock()
+                try:
+                    return fn(name)
+                finally:
+                    self.lookup_time += clock() - t0
+                    self.lookups[kind] += 1
+            return lookup
+        st.get = counted('var', st.get)
+        st.get_func = counted('func', st.get_func)
+
+    def collect(self, compiler):
+        """ Contagens finais: nós da AST, instruções por opcode e labels. """
+        if 'parse' in self.times:
+            self.times['parse'] -= self.lex_time
+            self.times = {'lex': self.lex_time, **self.times}
+        if compiler.tree is not None:
+            self.nodes.update(type(n).__name__ for n in walk(compiler.tree))
+        self.opcodes.update(op for op, _ in compiler.codegen.instrs if op != 'label')
+        self.labels = compiler.codegen.label_count
+
+    # --------------------------------------------------------------------------
+    # Saída
+    # --------------------------------------------------------------------------
+    def as_dict(self):
+        return {
+            'times': self.times,
+            'total': sum(self.times.values()),
+            'tokens': self.tokens,
+            'lookups': dict(self.lookups),
+            'lookup_time': self.lookup_time,
+            'nodes': dict(self.nodes.most_common()),
+            'instructions': dict(self.opcodes.most_common()),
+            'labels': self.labels,
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=1)
+
+    def format_timings(self):
+        total = sum(self.times.values()) or 1e-12
+        lines = [f"{'Fase':12} {'ms':>10} {'%':>6}"]
+        for name, secs in self.times.items():
+            lines.append(f"{name:12} {secs * 1000:10.3f} {secs / total:6.1%}")
+        lines.append(f"{'TOTAL':12} {total * 1000:10.3f}")
+        if self.lookups:
+            lines.append(f"(procuras na tabela de símbolos: {self.lookup_time * 1000:.3f} ms, dentro de parse/check/codegen)")
+        return "\n".join(lines)
+
+    def format_stats(self):
+        n_lookups = sum(self.lookups.values())
+        lines = [f"Tokens: {self.tokens}",
+                 f"Procuras na tabela de símbolos: {n_lookups} "
+                 f"({self.lookups['var']} variáveis, {self.lookups['func']} funções)",
+                 f"Labels: {self.labels}",
+                 f"Nós da AST: {sum(self.nodes.values())}"]
+        lines += [f"  {name:16} {count:>8}" for name, count in self.nodes.most_common()]
+        lines.append(f"Instruções: {sum(self.opcodes.values())}")
+        lines += [f"  {op:16} {count:>8}" for op, count in self.opcodes.most_common()]
+        return "\n".join(lines)
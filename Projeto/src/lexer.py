@@ -1,51 +1,9 @@
 import ply.lex as lex
+import os
+import sys
 
-# Palavras Reservadas do Pascal
-reserved = {
-    'program': 'PROGRAM',
-    'var': 'VAR',
-    'integer': 'INTEGER',
-    'boolean': 'BOOLEAN',
-    'string': 'STRING',
-    'begin': 'BEGIN',
-    'end': 'END',
-    'if': 'IF',
-    'then': 'THEN',
-    'else': 'ELSE',
-    'while': 'WHILE',
-    'do': 'DO',
-    'for': 'FOR',
-    'to': 'TO',
-    'downto': 'DOWNTO',
-    'repeat': 'REPEAT',
-    'until': 'UNTIL',
-    'function': 'FUNCTION',
-    'procedure': 'PROCEDURE',
-    'of': 'OF',
-    'array': 'ARRAY',
-    'write': 'WRITE',
-    'writeln': 'WRITELN',
-    'read': 'READ',
-    'readln': 'READLN',
-    'true': 'TRUE',
-    'false': 'FALSE',
-    # --- OPERADORES TEXTUAIS ---
-    'div': 'DIV',
-    'mod': 'MOD',
-    'and': 'AND',
-    'or': 'OR',
-    'not': 'NOT'
-}
-
-# Lista de Tokens
-tokens = [
-    'ID', 'NUM', 'STRING_LITERAL',
-    'PLUS', 'MINUS', 'TIMES', 'SLASH', 
-    'EQ', 'NEQ', 'LT', 'GT', 'LE', 'GE',
-    'ASSIGN',
-    'LPAREN', 'RPAREN', 'LBRACKET', 'RBRACKET',
-    'COLON', 'SEMICOLON', 'COMMA', 'DOT', 'RANGE'
-] + list(reserved.values())
+# Palavras reservadas e lista de tokens (partilhadas com o scanner rápido)
+from lexicon import reserved, tokens
 
 # Expressões Regulares (Regex) para operadores
 t_PLUS    = r'\+'
@@ -81,6 +39,7 @@ def t_COMMENT(t):
 def t_ID(t):
     r'[a-zA-Z_][a-zA-Z_0-9]*'
     t.type = reserved.get(t.value.lower(), 'ID') # Verifica se é reservada (incluindo div, mod, and...)
+    t.value = sys.intern(t.value) # Nomes repetidos partilham a mesma string na AST
     return t
 
 # Reconhecimento de Números
@@ -102,8 +61,35 @@ def t_newline(t):
 
 # Tratamento de Erros Léxicos
 def t_error(t):
-    print(f"Caractere ilegal '{t.value[0]}' na linha {t.lexer.lineno}")
+    message = f"Caractere ilegal '{t.value[0]}' na linha {t.lexer.lineno}"
+    diagnostics = getattr(t.lexer, 'diagnostics', None)   # modo --all-errors
+    if diagnostics: diagnostics.error('lexico', message, t.lexpos)
+    else: print(message)
     t.lexer.skip(1)
 
-# Construir o Lexer
-lexer = lex.lex()
\ No newline at end of file
+# ==============================================================================
+# CONSTRUÇÃO DO LEXER
+# Por omissão as regras já compiladas são carregadas de lextab.py, sem validar
+# o código-fonte nem escrever ficheiros, desde que coincidam com as regras
+# acima. Com PLC_TABLES=build usa-se o lex.lex() completo.
+# Para regenerar: python -m compiler tables
+# ==============================================================================
+FROZEN_TABLES = os.environ.get('PLC_TABLES', 'frozen') != 'build'
+
+def lextab_valid():
+    try:
+        import lextab
+    except ImportError:
+        return False
+    saved = ''.join(r for r, _ in lextab._lexstatere['INITIAL'])
+    rules = [(n, v.__doc__ if callable(v) else v) for n, v in globals().items()
+             if n.startswith('t_') and n not in ('t_ignore', 't_error')]
+    return (lextab._lextokens == set(tokens)
+            and lextab._lexstateignore['INITIAL'] == t_ignore
+            and saved.count('(?P<') == len(rules)
+            and all(f'(?P<{n}>{r})' in saved for n, r in rules))
+
+if FROZEN_TABLES and lextab_valid():
+    lexer = lex.lex(optimize=True, lextab='lextab')
+else:
+    lexer = lex.lex()
\ No newline at end of file
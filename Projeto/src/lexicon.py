@@ -0,0 +1,53 @@
+# ==============================================================================
+# VOCABULÁRIO DO PASCAL
+# Palavras reservadas e nomes dos tokens, comuns ao lexer PLY (lexer.py) e ao
+# scanner rápido (scanner.py). Não importa o PLY.
+# ==============================================================================
+
+# Palavras Reservadas do Pascal
+reserved = {
+    'program': 'PROGRAM',
+    'var': 'VAR',
+    'integer': 'INTEGER',
+    'boolean': 'BOOLEAN',
+    'string': 'STRING',
+    'begin': 'BEGIN',
+    'end': 'END',
+    'if': 'IF',
+    'then': 'THEN',
+    'else': 'ELSE',
+    'while': 'WHILE',
+    'do': 'DO',
+    'for': 'FOR',
+    'to': 'TO',
+    'downto': 'DOWNTO',
+    'repeat': 'REPEAT',
+    'until': 'UNTIL',
+    'case': 'CASE',
+    'function': 'FUNCTION',
+    'procedure': 'PROCEDURE',
+    'of': 'OF',
+    'array': 'ARRAY',
+    'write': 'WRITE',
+    'writeln': 'WRITELN',
+    'read': 'READ',
+    'readln': 'READLN',
+    'true': 'TRUE',
+    'false': 'FALSE',
+    # --- OPERADORES TEXTUAIS ---
+    'div': 'DIV',
+    'mod': 'MOD',
+    'and': 'AND',
+    'or': 'OR',
+    'not': 'NOT'
+}
+
+# Lista de Tokens
+tokens = [
+    'ID', 'NUM', 'STRING_LITERAL',
+    'PLUS', 'MINUS', 'TIMES', 'SLASH', 
+    'EQ', 'NEQ', 'LT', 'GT', 'LE', 'GE',
+    'ASSIGN',
+    'LPAREN', 'RPAREN', 'LBRACKET', 'RBRACKET',
+    'COLON', 'SEMICOLON', 'COMMA', 'DOT', 'RANGE'
+] + list(reserved.values())
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ARRAY', 'ASSIGN', 'BEGIN', 'BOOLEAN', 'CASE', 'COLON', 'COMMA', 'DIV', 'DO', 'DOT', 'DOWNTO', 'ELSE', 'END', 'EQ', 'FALSE', 'FOR', 'FUNCTION', 'GE', 'GT', 'ID', 'IF', 'INTEGER', 'LBRACKET', 'LE', 'LPAREN', 'LT', 'MINUS', 'MOD', 'NEQ', 'NOT', 'NUM', 'OF', 'OR', 'PLUS', 'PROCEDURE', 'PROGRAM', 'RANGE', 'RBRACKET', 'READ', 'READLN', 'REPEAT', 'RPAREN', 'SEMICOLON', 'SLASH', 'STRING', 'STRING_LITERAL', 'THEN', 'TIMES', 'TO', 'TRUE', 'UNTIL', 'VAR', 'WHILE', 'WRITE', 'WRITELN'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [("(?P<t_COMMENT>\\{[^}]*\\})|(?P<t_ID>[a-zA-Z_][a-zA-Z_0-9]*)|(?P<t_NUM>\\d+)|(?P<t_STRING_LITERAL>\\'([^\\']|\\'\\')*\\')|(?P<t_newline>\\n+)|(?P<t_RANGE>\\.\\.)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_NEQ><>)|(?P<t_LE><=)|(?P<t_GE>>=)|(?P<t_ASSIGN>:=)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACKET>\\[)|(?P<t_RBRACKET>\\])|(?P<t_DOT>\\.)|(?P<t_MINUS>-)|(?P<t_SLASH>/)|(?P<t_EQ>=)|(?P<t_LT><)|(?P<t_GT>>)|(?P<t_COLON>:)|(?P<t_SEMICOLON>;)|(?P<t_COMMA>,)", [None, ('t_COMMENT', 'COMMENT'), ('t_ID', 'ID'), ('t_NUM', 'NUM'), ('t_STRING_LITERAL', 'STRING_LITERAL'), None, ('t_newline', 'newline'), (None, 'RANGE'), (None, 'PLUS'), (None, 'TIMES'), (None, 'NEQ'), (None, 'LE'), (None, 'GE'), (None, 'ASSIGN'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACKET'), (None, 'RBRACKET'), (None, 'DOT'), (None, 'MINUS'), (None, 'SLASH'), (None, 'EQ'), (None, 'LT'), (None, 'GT'), (None, 'COLON'), (None, 'SEMICOLON'), (None, 'COMMA')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
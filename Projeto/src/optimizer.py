@@ -0,0 +1,1053 @@
+from ast_nodes import *
+from semantics import CompileError, Symbol
+
+# ==============================================================================
+# OTIMIZAÇÕES SOBRE A AST (-O1: LoopOptimizer, DeadCode, FrameLayout, TailCalls;
+# -O2: ConstantFolder, Inliner; --checked: IndexRanges)
+# Correm depois do parsing e antes do gen(). Os resultados reproduzem
+# exatamente o que a VM calcularia (AND -> mul, OR -> add, div truncada; um
+# OR entre booleanos dá 0 ou 1, como no código em curto-circuito do -O1).
+# ==============================================================================
+
+RELATIONAL = {'=', '<>', '<', '>', '<=', '>='}
+
+def _trunc_div(a, b):
+    q = abs(a) // abs(b)
+    return -q if (a < 0) != (b < 0) else q
+
+FOLD = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    'DIV': _trunc_div,
+    '/': _trunc_div,
+    'MOD': lambda a, b: a - b * _trunc_div(a, b),
+    'AND': lambda a, b: a * b,
+    'OR': lambda a, b: a + b,
+    '=': lambda a, b: int(a == b),
+    '<>': lambda a, b: int(a != b),
+    '<': lambda a, b: int(a < b),
+    '>': lambda a, b: int(a > b),
+    '<=': lambda a, b: int(a <= b),
+    '>=': lambda a, b: int(a >= b),
+}
+
+def var_key(info):
+    """ O registo de uma variável escalar (None para arrays e retorno de função). """
+    if not info or info.kind == 'return' or isinstance(info.type, dict): return None
+    return info
+
+def children(node):
+    """ Sub-expressões de uma expressão, pela ordem de avaliação. """
+    if isinstance(node, BinOp): return (node.left, node.right)
+    if isinstance(node, FunctionCall): return node.args
+    if isinstance(node, VarAccess) and node.index_expr is not None: return (node.index_expr,)
+    return ()
+
+def has_call(node):
+    """ True se a expressão contém uma chamada a uma função do utilizador. """
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, FunctionCall) and n.name.lower() != 'length': return True
+        stack.extend(children(n))
+    return False
+
+def assigned_vars(node):
+    """ Devolve (variáveis escritas, contém chamadas) para um comando. """
+    keys, calls = set(), False
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, Block):
+            stack.extend(n.statements)
+        elif isinstance(n, Assign):
+            if n.index_expr is None: keys.add(var_key(n.scope))
+            calls = calls or has_call(n.expr) or (n.index_expr is not None and has_call(n.index_expr))
+        elif isinstance(n, Read):
+            keys.add(var_key(n.scope))
+        elif isinstance(n, FunctionCall):
+            calls = True
+        elif isinstance(n, Write):
+            calls = calls or any(has_call(e) for e in n.exprs)
+        elif isinstance(n, If):
+            calls = calls or has_call(n.cond)
+            stack.append(n.then_b)
+            if n.else_b: stack.append(n.else_b)
+        elif isinstance(n, While):
+            calls = calls or has_call(n.cond)
+            stack.append(n.body)
+        elif isinstance(n, Repeat):
+            calls = calls or has_call(n.cond)
+            stack.extend(n.statements)
+        elif isinstance(n, For):
+            keys.add(var_key(n.scope))
+            calls = calls or has_call(n.start) or has_call(n.end)
+            stack.append(n.body)
+        elif isinstance(n, Case):
+            calls = calls or has_call(n.selector)
+            stack.extend(n.arms)
+            if n.else_b: stack.append(n.else_b)
+    keys.discard(None)
+    return keys, calls
+
+def select(node, value):
+    """ Comando de node (Case) executado quando o seletor vale value (None se nenhum). """
+    for labels, arm in zip(node.labels, node.arms):
+        if any(low.value <= value <= high.value for low, high in labels): return arm
+    return node.else_b
+
+# ==============================================================================
+# DOBRAGEM E PROPAGAÇÃO DE CONSTANTES
+# 1ª passagem: dobra expressões só com literais; um divisor literal 0 em
+#              div/mod/'/' é um erro de compilação.
+# 2ª passagem: propaga valores constantes de variáveis escalares ao longo de
+#              código linear (os ciclos e as chamadas invalidam o que escrevem)
+#              e volta a dobrar. Aqui não há diagnósticos: uma divisão por
+#              zero obtida por propagação fica para a execução.
+# Corre depois do TypeChecker (os erros de tipos são reportados antes dos de
+# divisão por zero): os literais que cria já levam o tipo.
+# ==============================================================================
+def typed(value, type_name):
+    node = Literal(value, type_name)
+    node.type = type_name
+    return node
+
+class ConstantFolder:
+    def __init__(self):
+        self.folded = 0
+        self.propagated = 0
+        self.propagate = False
+        self.env = {}
+
+    def run(self, program):
+        for self.propagate in (False, True):
+            for sub in program.subprograms:
+                self.env = {}
+                self.stmt(sub.body)
+            self.env = {}
+            self.stmt(program.body)
+        return program
+
+    # --- ambiente de constantes ------------------------------------------------
+    def kill(self, keys, calls=False):
+        for k in keys: self.env.pop(k, None)
+        if calls:
+            for k in [k for k in self.env if k.kind == 'global']: del self.env[k]
+
+    def record(self, info, value):
+        key = var_key(info)
+        if key is None: return
+        self.env.pop(key, None)
+        if self.propagate and isinstance(value, Literal) and \
+           value.type_name in ('INTEGER', 'BOOLEAN') and value.type_name == str(info.type).upper():
+            self.env[key] = value
+
+    # --- expressões ------------------------------------------------------------
+    # Dobra uma expressão em pós-ordem com uma pilha explícita; devolve o nó
+    # resultante (os filhos são substituídos nos campos do pai)
+    def expr(self, root):
+        stack, values = [(root, False)], []
+        while stack:
+            node, done = stack.pop()
+            kids = children(node)
+            if not done:
+                # uma chamada pode alterar qualquer global a partir deste ponto
+                if isinstance(node, FunctionCall) and node.name.lower() != 'length':
+                    self.kill((), calls=True)
+                if kids:
+                    stack.append((node, True))
+                    stack.extend((k, False) for k in reversed(kids))
+                else:
+                    values.append(self.leaf(node))
+                continue
+            args = values[len(values) - len(kids):]
+            del values[len(values) - len(kids):]
+            if isinstance(node, BinOp):
+                node.left, node.right = args
+                values.append(self.fold(node))
+            elif isinstance(node, FunctionCall):
+                node.args = args
+                values.append(node)
+            else:
+                node.index_expr = args[0]
+                values.append(node)
+        return values.pop()
+
+    def leaf(self, node):
+        if self.propagate and isinstance(node, VarAccess):
+            lit = self.env.get(var_key(node.scope))
+            if lit is not None:
+                self.propagated += 1
+                return typed(lit.value, lit.type_name)
+        return node
+
+    def fold(self, node):
+        left, right, op = node.left, node.right, node.op.upper()
+        if not (isinstance(left, Literal) and isinstance(right, Literal)):
+            if not self.propagate and op in ('DIV', 'MOD', '/') and \
+               isinstance(right, Literal) and right.type_name == 'INTEGER' and right.value == 0:
+                raise CompileError(f"⚠️  ERRO SEMÂNTICO: Divisão por zero ('{node.op}' com divisor constante 0).")
+            return node
+
+        tl, tr = left.type_name, right.type_name
+        if op in RELATIONAL:
+            ok, rtype = 'STRING' not in (tl, tr), 'BOOLEAN'
+        elif op in ('DIV', 'MOD', '/'):
+            ok, rtype = tl == tr == 'INTEGER', 'REAL' if op == '/' else 'INTEGER'
+            if ok and right.value == 0:
+                if self.propagate: return node
+                raise CompileError(f"⚠️  ERRO SEMÂNTICO: Divisão por zero ('{node.op}' com divisor constante 0).")
+        elif op in ('+', '-', '*'):
+            ok = (tl == tr and tl in ('INTEGER', 'BOOLEAN')) or {tl, tr} <= {'INTEGER', 'REAL'}
+            rtype = tl
+        elif op in ('AND', 'OR'):
+            ok, rtype = {tl, tr} <= {'INTEGER', 'BOOLEAN'}, tl
+        else:
+            ok = False
+        if not ok: return node
+
+        self.folded += 1
+        if op == 'OR' and tl == tr == 'BOOLEAN':
+            return typed(int(bool(left.value or right.value)), rtype)    # como o OR em curto-circuito
+        return typed(FOLD[op](left.value, right.value), rtype)
+
+    # --- comandos --------------------------------------------------------------
+    def stmt(self, node):
+        if isinstance(node, Block):
+            for s in node.statements: self.stmt(s)
+
+        elif isinstance(node, Assign):
+            if node.index_expr is not None:
+                node.index_expr = self.expr(node.index_expr)
+            node.expr = self.expr(node.expr)
+            if node.index_expr is None: self.record(node.scope, node.expr)
+
+        elif isinstance(node, FunctionCall):
+            node.args = [self.expr(a) for a in node.args]
+            self.kill((), calls=True)
+
+        elif isinstance(node, Write):
+            node.exprs = [self.expr(e) for e in node.exprs]
+
+        elif isinstance(node, Read):
+            if node.index_expr is not None:
+                node.index_expr = self.expr(node.index_expr)
+            self.kill({var_key(node.scope)})
+
+        elif isinstance(node, If):
+            node.cond = self.expr(node.cond)
+            before = dict(self.env)
+            self.stmt(node.then_b)
+            after_then, self.env = self.env, before
+            if node.else_b: self.stmt(node.else_b)
+            self.env = {k: v for k, v in self.env.items()
+                        if k in after_then and after_then[k].value == v.value}
+
+        elif isinstance(node, Case):
+            node.selector = self.expr(node.selector)
+            before, merged = self.env, None
+            for arm in node.arms + [node.else_b or Block([])]:
+                self.env = dict(before)
+                self.stmt(arm)
+                merged = self.env if merged is None else \
+                    {k: v for k, v in merged.items() if k in self.env and self.env[k].value == v.value}
+            self.env = merged
+
+        elif isinstance(node, While):
+            self.kill(*assigned_vars(node))
+            node.cond = self.expr(node.cond)
+            self.stmt(node.body)
+            self.kill(*assigned_vars(node))
+
+        elif isinstance(node, Repeat):
+            self.kill(*assigned_vars(node))
+            for s in node.statements: self.stmt(s)
+            node.cond = self.expr(node.cond)
+            self.kill(*assigned_vars(node))
+
+        elif isinstance(node, For):
+            # o limite é reavaliado em cada iteração, depois do corpo
+            node.start = self.expr(node.start)
+            self.kill(*assigned_vars(node))
+            node.end = self.expr(node.end)
+            self.stmt(node.body)
+            self.kill(*assigned_vars(node))
+
+# ==============================================================================
+# CICLOS (-O1)
+#   - o valor final de um for é calculado uma só vez, antes da primeira
+#     comparação, para uma variável escondida (For.limit), como no Pascal;
+#     fica como está se for uma constante ou uma variável que o ciclo não
+#     escreve
+#   - as sub-expressões puras de um while, repeat ou for que só leem
+#     variáveis que o ciclo não escreve (nem globais, se o ciclo chama
+#     funções) são calculadas antes do ciclo, também para variáveis escondidas
+# As variáveis escondidas ('$1', '$2', ...) entram no frame onde o ciclo está
+# e recebem slot no FrameLayout, que corre a seguir. A rotação dos ciclos
+# (teste no fim) é feita pelo gerador (CodeGen com rotate).
+# ==============================================================================
+def invariant(node, written, calls):
+    """ True se a expressão é pura e não lê variáveis que o ciclo pode mudar. """
+    if not is_pure(node): return False
+    for n in walk(node):
+        if isinstance(n, VarAccess):
+            sym = var_key(n.scope)
+            if sym is None or sym in written or (calls and sym.kind == 'global'): return False
+    return True
+
+def worth_hoisting(node):
+    """ Só compensa tirar do ciclo o que custa mais do que ler uma variável. """
+    if node.type not in ('INTEGER', 'BOOLEAN'): return False
+    return isinstance(node, BinOp) or (isinstance(node, FunctionCall) and node.name.lower() == 'length')
+
+class LoopOptimizer:
+    def __init__(self):
+        self.limits = 0         # for com o valor final calculado uma vez
+        self.hoisted = 0        # expressões tiradas de ciclos
+        self.temps = 0
+
+    def run(self, program, st):
+        self.frame(program.body, 'global', 0)
+        for sym in self.new: st.globals[sym.name] = sym
+        for sub in program.subprograms:
+            self.frame(sub.body, 'local', sub.scope.level)
+            sub.locals_data = sub.locals_data + self.new
+        return program
+
+    def frame(self, body, kind, level):
+        self.kind, self.level, self.new = kind, level, []
+        self.stmt(body)
+
+    def temp(self, type_name):
+        """ Nova variável escondida no frame atual (o FrameLayout dá-lhe o slot). """
+        self.temps += 1
+        sym = Symbol(f"${self.temps}", type_name, 1 << 30 | self.temps, self.kind, self.level)
+        self.new.append(sym)
+        return sym
+
+    def stmt(self, node):
+        """ Processa um comando e devolve o que o substitui (o ciclo precedido
+            dos cálculos tirados de dentro dele). """
+        if isinstance(node, Block):
+            node.statements = [self.stmt(s) for s in node.statements]
+        elif isinstance(node, If):
+            node.then_b = self.stmt(node.then_b)
+            if node.else_b: node.else_b = self.stmt(node.else_b)
+        elif isinstance(node, Case):
+            node.arms = [self.stmt(s) for s in node.arms]
+            if node.else_b: node.else_b = self.stmt(node.else_b)
+        elif isinstance(node, (While, Repeat, For)):
+            return self.loop(node)
+        return node
+
+    def loop(self, node):
+        written, calls = assigned_vars(node)
+        pre = []
+
+        def hoist(e):
+            if worth_hoisting(e) and invariant(e, written, calls):
+                sym = self.temp(e.type)
+                pre.append(assign(sym, e))
+                self.hoisted += 1
+                return read(sym, e.type)
+            if isinstance(e, BinOp):
+                e.left, e.right = hoist(e.left), hoist(e.right)
+            elif isinstance(e, FunctionCall):
+                e.args = [hoist(a) for a in e.args]
+            elif isinstance(e, VarAccess) and e.index_expr is not None:
+                e.index_expr = hoist(e.index_expr)
+            return e
+
+        if isinstance(node, For):
+            if not isinstance(node.end, Literal) and \
+               not (isinstance(node.end, VarAccess) and invariant(node.end, written, calls)):
+                node.limit = self.temp('INTEGER')
+                self.limits += 1
+            rewrite(node.body, hoist)
+        else:
+            rewrite(node, hoist)
+        # Os ciclos interiores tratam depois das suas próprias invariantes
+        if isinstance(node, Repeat): node.statements = [self.stmt(s) for s in node.statements]
+        else: node.body = self.stmt(node.body)
+        return Block(pre + [node]) if pre else node
+
+def rewrite(node, fn):
+    """ Substitui cada expressão e dos comandos de node (incluindo os
+        ciclos interiores) por fn(e). """
+    if isinstance(node, Block):
+        for s in node.statements: rewrite(s, fn)
+    elif isinstance(node, (Assign, Read)):
+        if isinstance(node, Assign): node.expr = fn(node.expr)
+        if node.index_expr is not None: node.index_expr = fn(node.index_expr)
+    elif isinstance(node, FunctionCall):
+        node.args = [fn(a) for a in node.args]
+    elif isinstance(node, Write):
+        node.exprs = [fn(e) for e in node.exprs]
+    elif isinstance(node, If):
+        node.cond = fn(node.cond)
+        rewrite(node.then_b, fn)
+        if node.else_b: rewrite(node.else_b, fn)
+    elif isinstance(node, While):
+        node.cond = fn(node.cond)
+        rewrite(node.body, fn)
+    elif isinstance(node, Repeat):
+        for s in node.statements: rewrite(s, fn)
+        node.cond = fn(node.cond)
+    elif isinstance(node, For):
+        node.start, node.end = fn(node.start), fn(node.end)
+        rewrite(node.body, fn)
+    elif isinstance(node, Case):
+        node.selector = fn(node.selector)
+        for s in node.arms: rewrite(s, fn)
+        if node.else_b: rewrite(node.else_b, fn)
+
+def assign(sym, expr):
+    node = Assign(sym.name, expr)
+    node.scope = sym
+    return node
+
+def read(sym, type_name):
+    node = VarAccess(sym.name)
+    node.scope, node.type = sym, type_name
+    return node
+
+# ==============================================================================
+# FUNÇÕES PURAS: EXPANSÃO NO SÍTIO E CÁLCULO NA COMPILAÇÃO (-O2)
+# Uma função é pura se só lê e escreve os seus argumentos e locais (inteiros
+# ou booleanos), não faz leituras nem escritas e só chama funções puras.
+#   - uma chamada com todos os argumentos constantes é calculada durante a
+#     compilação por um pequeno interpretador da AST (com uma tabela de
+#     resultados já calculados e um limite de passos; se não terminar a tempo
+#     ou encontrar uma divisão por zero, a chamada fica como está)
+#   - as restantes chamadas a funções puras, não recursivas e com um corpo
+#     até INLINE_BUDGET nós são substituídas por uma cópia do corpo
+#     (InlineCall), em que os argumentos, os locais e o valor de retorno
+#     passam a variáveis escondidas do frame de quem chama. Argumentos
+#     constantes ou variáveis (que a função não altera) entram diretamente; se
+#     o corpo é só 'f := expr', a chamada passa a ser a própria expressão.
+# As funções são tratadas das chamadas para quem as chama, para que o corpo
+# copiado já venha com as suas próprias chamadas expandidas. Corre depois do
+# LoopOptimizer (as cópias levam os seus limites de for e invariantes) e
+# antes do FrameLayout, que dá slot às variáveis escondidas.
+# ==============================================================================
+INLINE_BUDGET = 40      # nós do corpo de uma função para ser expandida
+EVAL_STEPS = 20000      # passos do interpretador por chamada calculada
+
+SCALAR = ('INTEGER', 'BOOLEAN')
+
+class EvalError(Exception):
+    pass
+
+def first_use(node, sym):
+    """ 'write' se node escreve sym antes de qualquer leitura em todos os
+        caminhos, 'read' se pode ler (ou escrever só nalguns caminhos), None
+        se não lhe toca. """
+    if isinstance(node, Block):
+        for s in node.statements:
+            use = first_use(s, sym)
+            if use: return use
+        return None
+    if isinstance(node, Assign):
+        if mentions(node.expr, sym): return 'read'
+        return 'write' if node.scope is sym else None
+    if isinstance(node, If) and not mentions(node.cond, sym):
+        a = first_use(node.then_b, sym)
+        b = first_use(node.else_b, sym) if node.else_b else None
+        if a is None and b is None: return None
+        return 'write' if a == b == 'write' else 'read'
+    if isinstance(node, Case) and not mentions(node.selector, sym):
+        uses = {first_use(s, sym) for s in node.arms + [node.else_b] if s is not None}
+        if node.else_b is None: uses.add(None)
+        if uses == {None}: return None
+        return 'write' if uses == {'write'} else 'read'
+    return 'read' if mentions(node, sym) else None
+
+def mentions(node, sym):
+    return any(getattr(n, 'scope', None) is sym or getattr(n, 'limit', None) is sym for n in walk(node))
+
+class Inliner:
+    def __init__(self):
+        self.inlined = 0        # chamadas expandidas
+        self.evaluated = 0      # chamadas calculadas na compilação
+        self.memo = {}          # (função, argumentos) -> valor (None: não se calcula)
+        self.budget = None      # passos que restam ao interpretador
+        self.temps = 0
+
+    def run(self, program, st):
+        self.st = st
+        self.subs = {sub.scope: sub for sub in program.subprograms}
+        calls = {sub: self.callees(sub) for sub in program.subprograms}
+        self.pure = {sub for sub in calls if self.local_pure(sub)}
+        changed = True
+        while changed:
+            impure = {sub for sub in self.pure if not calls[sub] <= self.pure}
+            self.pure -= impure
+            changed = bool(impure)
+        self.recursive = {sub for sub in calls if sub in self.reachable(sub, calls)}
+
+        # das funções chamadas para quem as chama (pós-ordem no grafo de chamadas)
+        order, seen = [], set()
+        def visit(sub):
+            if sub in seen: return
+            seen.add(sub)
+            for callee in calls[sub]: visit(callee)
+            order.append(sub)
+        for sub in program.subprograms: visit(sub)
+        for sub in order:
+            self.frame(sub.body, 'local', sub.scope.level)
+            sub.locals_data = sub.locals_data + self.new
+        self.frame(program.body, 'global', 0)
+        for sym in self.new: st.globals[sym.name] = sym
+        return program
+
+    # --- análise ---------------------------------------------------------------
+    def callee(self, node):
+        return self.subs.get(node.scope or self.st.find_func(node.name))
+
+    def callees(self, sub):
+        return {self.callee(n) for n in walk(sub.body)
+                if isinstance(n, FunctionCall) and n.name.lower() != 'length'} - {None}
+
+    def reachable(self, sub, calls):
+        seen, stack = set(), list(calls[sub])
+        while stack:
+            s = stack.pop()
+            if s not in seen:
+                seen.add(s)
+                stack.extend(calls[s])
+        return seen
+
+    def local_pure(self, sub):
+        """ Pureza sem olhar para as funções chamadas. """
+        if not sub.is_func or str(sub.ret_type).upper() not in SCALAR: return False
+        if any(str(t).upper() not in SCALAR for _, t in sub.args): return False
+        if any(str(v.type).upper() not in SCALAR for v in sub.locals_data): return False
+        for n in walk(sub.body):
+            if isinstance(n, (Write, Read)): return False
+            if isinstance(n, Literal) and n.type_name not in SCALAR: return False
+            if isinstance(n, FunctionCall) and (n.name.lower() == 'length' or self.callee(n) is None): return False
+            if isinstance(n, (Assign, VarAccess, For)):
+                if n.scope.kind == 'global' or getattr(n, 'index_expr', None) is not None: return False
+        return True
+
+    # --- chamadas --------------------------------------------------------------
+    def frame(self, body, kind, level):
+        self.kind, self.level, self.new = kind, level, []
+        rewrite(body, self.expr)
+
+    def temp(self, sym, type_name):
+        # "$" antes do contador: sem ele, x1 no temp 1 e x no temp 11 davam ambos $x11
+        self.temps += 1
+        new = Symbol(f"${sym.name}${self.temps}", type_name, 1 << 30 | self.temps, self.kind, self.level)
+        self.new.append(new)
+        return new
+
+    def expr(self, node):
+        if isinstance(node, BinOp):
+            node.left, node.right = self.expr(node.left), self.expr(node.right)
+        elif isinstance(node, VarAccess) and node.index_expr is not None:
+            node.index_expr = self.expr(node.index_expr)
+        elif isinstance(node, FunctionCall):
+            node.args = [self.expr(a) for a in node.args]
+            sub = self.callee(node) if node.name.lower() != 'length' else None
+            if sub in self.pure: return self.call(node, sub)
+        return node
+
+    def call(self, node, sub):
+        ret = str(sub.ret_type).upper()
+        if all(isinstance(a, Literal) and a.type_name in SCALAR for a in node.args):
+            value = self.evaluate(sub, tuple(a.value for a in node.args))
+            if value is not None:
+                self.evaluated += 1
+                lit = Literal(value, ret)
+                lit.type = ret
+                return lit
+        if sub in self.recursive or sum(1 for _ in walk(sub.body)) > INLINE_BUDGET:
+            return node
+        self.inlined += 1
+        return self.inline(node, sub, ret)
+
+    def inline(self, node, sub, ret):
+        """ Cópia do corpo de sub para o frame atual, com os argumentos de node. """
+        used = {n.scope for n in walk(sub.body) if isinstance(n, (Assign, VarAccess, For))}
+        params = {s.offset + len(sub.args): s for s in used if s.kind == 'arg'}
+        written = {n.scope for n in walk(sub.body) if isinstance(n, (Assign, For))}
+        stable = all(is_pure(a) for a in node.args)
+        body, self.mapping, self.subst = [], {}, {}
+        for i, arg in enumerate(node.args):
+            param = params.get(i)
+            if param is None:
+                # argumento que a função não usa: só é calculado se tiver efeitos
+                if not is_pure(arg): body.append(assign(self.temp(sub.scope, 'INTEGER'), arg))
+            elif param not in written and (isinstance(arg, Literal) or
+                                           (stable and isinstance(arg, VarAccess) and arg.index_expr is None)):
+                self.subst[param] = arg
+            else:
+                body.append(assign(self.symbol(param, ret), arg))
+
+        # locais e retorno começam a 0, como no prólogo da função, se puderem
+        # ser lidos antes de escritos (as variáveis escondidas nunca são)
+        zero = [s for s in used if s.kind in ('local', 'return') and not s.name.startswith('$')
+                and first_use(sub.body, s) != 'write']
+        ret_sym = next((s for s in used if s.kind == 'return'), None)
+        stmts = flatten(sub.body)
+        if len(stmts) == 1 and isinstance(stmts[0], Assign) and stmts[0].scope is ret_sym and ret_sym not in zero:
+            # 'f := expr': a chamada passa a ser a expressão
+            body += [assign(self.symbol(s, ret), zero_of(s)) for s in zero]
+            result = self.clone(stmts[0].expr)
+        else:
+            body += [assign(self.symbol(s, ret), zero_of(ret if s.kind == 'return' else s)) for s in zero]
+            body.append(self.clone(sub.body))
+            result = read(self.symbol(ret_sym, ret), ret) if ret_sym else zero_of(ret)
+        if not body: return result
+        inlined = InlineCall(Block(body), result)
+        inlined.type = ret
+        return inlined
+
+    def symbol(self, sym, ret):
+        """ Variável escondida que faz de sym (da função expandida) neste frame. """
+        if sym.kind == 'global': return sym
+        if sym not in self.mapping:
+            self.mapping[sym] = self.temp(sym, ret if sym.kind == 'return' else str(sym.type).upper())
+        return self.mapping[sym]
+
+    def clone(self, node):
+        """ Cópia de uma sub-árvore do corpo com as variáveis da função trocadas. """
+        if isinstance(node, VarAccess) and node.scope in self.subst:
+            return copy_node(self.subst[node.scope])
+        new = object.__new__(type(node))
+        for name in node.__slots__:
+            v = getattr(node, name, None)
+            if isinstance(v, Node): v = self.clone(v)
+            elif type(v) is list: v = [self.clone(x) if isinstance(x, Node) else x for x in v]
+            elif isinstance(v, Symbol): v = self.symbol(v, str(v.type).upper())
+            setattr(new, name, v)
+        return new
+
+    # --- interpretador ---------------------------------------------------------
+    # Segue o código gerado em -O2: o valor final de um for é calculado uma vez,
+    # AND/OR entre booleanos em curto-circuito, div truncada.
+    def evaluate(self, sub, args):
+        """ Valor de sub(args), ou None se não se consegue calcular. """
+        key = (sub.scope, args)
+        if key in self.memo: return self.memo[key]
+        self.memo[key] = None           # em curso: f(x) a chamar f(x) não termina
+        top = self.budget is None
+        if top: self.budget = EVAL_STEPS
+        try:
+            env = {s: args[s.offset + len(args)] for s in self.arg_symbols(sub)}
+            self.exec(sub.body, env)
+            ret = next((v for s, v in env.items() if s.kind == 'return'), 0)
+            self.memo[key] = ret
+        except (EvalError, RecursionError):
+            if not top: raise
+        finally:
+            if top: self.budget = None
+        return self.memo[key]
+
+    def arg_symbols(self, sub):
+        return {n.scope for n in walk(sub.body) if isinstance(n, VarAccess) and n.scope.kind == 'arg'}
+
+    def tick(self):
+        self.budget -= 1
+        if self.budget < 0: raise EvalError()
+
+    def exec(self, node, env):
+        self.tick()
+        if isinstance(node, Block):
+            for s in node.statements: self.exec(s, env)
+        elif isinstance(node, Assign):
+            env[node.scope] = self.eval(node.expr, env)
+        elif isinstance(node, If):
+            if self.eval(node.cond, env): self.exec(node.then_b, env)
+            elif node.else_b: self.exec(node.else_b, env)
+        elif isinstance(node, While):
+            while self.eval(node.cond, env): self.exec(node.body, env)
+        elif isinstance(node, Repeat):
+            while True:
+                for s in node.statements: self.exec(s, env)
+                if self.eval(node.cond, env): break
+        elif isinstance(node, For):
+            i, step = node.scope, 1 if node.direction == 'to' else -1
+            env[i] = self.eval(node.start, env)
+            end = self.eval(node.end, env)
+            while (env[i] - end) * step <= 0:
+                self.exec(node.body, env)
+                env[i] += step
+        elif isinstance(node, Case):
+            arm = select(node, self.eval(node.selector, env))
+            if arm is not None: self.exec(arm, env)
+        else:
+            raise EvalError()
+
+    def eval(self, node, env):
+        self.tick()
+        if isinstance(node, Literal):
+            if node.type_name not in SCALAR: raise EvalError()
+            return node.value
+        if isinstance(node, VarAccess):
+            if node.index_expr is not None: raise EvalError()
+            return env.get(node.scope, 0)
+        if isinstance(node, InlineCall):
+            self.exec(node.body, env)
+            return self.eval(node.result, env)
+        if isinstance(node, FunctionCall):
+            sub = self.callee(node) if node.name.lower() != 'length' else None
+            if sub not in self.pure: raise EvalError()
+            value = self.evaluate(sub, tuple(self.eval(a, env) for a in node.args))
+            if value is None: raise EvalError()
+            return value
+        if isinstance(node, BinOp):
+            op = node.op.upper()
+            if op in ('AND', 'OR') and node.left.type == node.right.type == 'BOOLEAN':
+                left = self.eval(node.left, env)
+                if (op == 'AND') == (left == 0): return int(op == 'OR')
+                return int(self.eval(node.right, env) != 0)
+            left, right = self.eval(node.left, env), self.eval(node.right, env)
+            if op not in FOLD or (op in ('DIV', 'MOD', '/') and right == 0): raise EvalError()
+            return FOLD[op](left, right)
+        raise EvalError()
+
+def flatten(node):
+    """ Comandos de um Block, sem os Blocks encaixados. """
+    if not isinstance(node, Block): return [node]
+    return [s for st in node.statements for s in flatten(st)]
+
+def zero_of(sym_or_type):
+    type_name = sym_or_type if isinstance(sym_or_type, str) else str(sym_or_type.type).upper()
+    node = Literal(0, 'BOOLEAN' if type_name == 'BOOLEAN' else 'INTEGER')
+    node.type = node.type_name
+    return node
+
+def copy_node(node):
+    """ Cópia de uma folha (constante ou variável de quem chama). """
+    new = object.__new__(type(node))
+    for name in node.__slots__: setattr(new, name, getattr(node, name, None))
+    return new
+
+# ==============================================================================
+# CÓDIGO MORTO E SUBPROGRAMAS NÃO USADOS (-O1)
+# Condições constantes (true/false, ou as que o ConstantFolder calcula em -O2):
+#   - um 'if' fica só com o ramo que é executado
+#   - 'while false' desaparece e 'repeat ... until true' passa a um bloco
+#   - os comandos a seguir a um ciclo que nunca termina ('while true',
+#     'repeat ... until false'), e ao que o contém, são removidos; o ciclo
+#     fica marcado (While.forever) e é gerado sem o teste nem a label de saída
+# Depois ficam só os subprogramas que o corpo principal chama, direta ou
+# indiretamente. Corre depois do Inliner, cujas expansões e cálculos podem
+# deixar funções sem chamadas, e antes do FrameLayout, para que as variáveis
+# só lidas no código removido deixem de ter slot.
+# ==============================================================================
+def constant(cond):
+    """ Valor de uma condição constante, ou None. """
+    return bool(cond.value) if isinstance(cond, Literal) else None
+
+class DeadCode:
+    def __init__(self):
+        self.subprograms = 0    # subprogramas removidos
+        self.statements = 0     # comandos removidos
+
+    def run(self, program, st):
+        self.stmt(program.body)
+        for sub in program.subprograms: self.stmt(sub.body)
+
+        subs = {sub.scope: sub for sub in program.subprograms}
+        live, stack = set(), [program.body]
+        while stack:
+            for n in walk(stack.pop()):
+                if isinstance(n, FunctionCall):
+                    sub = subs.get(n.scope or st.find_func(n.name))
+                    if sub is not None and sub not in live:
+                        live.add(sub)
+                        stack.append(sub.body)
+        kept = [sub for sub in program.subprograms if sub in live]
+        self.subprograms += len(program.subprograms) - len(kept)
+        program.subprograms = kept
+        return program
+
+    def drop(self, node):
+        if node is not None: self.statements += len(flatten(node))
+
+    def stmt(self, node):
+        """ Devolve (comando que substitui node, True se a execução pode passar
+            para o comando seguinte). """
+        if isinstance(node, Block):
+            for i, s in enumerate(node.statements):
+                node.statements[i], ends = self.stmt(s)
+                if not ends:
+                    for rest in node.statements[i + 1:]: self.drop(rest)
+                    del node.statements[i + 1:]
+                    return node, False
+            return node, True
+        if isinstance(node, If):
+            value = constant(node.cond)
+            if value is None:
+                node.then_b, a = self.stmt(node.then_b)
+                if not node.else_b: return node, True
+                node.else_b, b = self.stmt(node.else_b)
+                return node, a or b
+            taken, dropped = (node.then_b, node.else_b) if value else (node.else_b, node.then_b)
+            self.drop(dropped)
+            return self.stmt(taken) if taken else (Block([]), True)
+        if isinstance(node, While):
+            value = constant(node.cond)
+            if value is False:
+                self.drop(node.body)
+                return Block([]), True
+            node.body, _ = self.stmt(node.body)
+            node.forever = value is True
+            return node, value is None
+        if isinstance(node, Repeat):
+            value = constant(node.cond)
+            body, ends = self.stmt(Block(node.statements))
+            if value: return body, ends
+            if value is False:
+                # 'repeat ... until false' é o mesmo ciclo sem fim que 'while true'
+                loop = While(node.cond, body)
+                loop.forever = True
+                return loop, False
+            node.statements = body.statements
+            return node, ends
+        if isinstance(node, Case):
+            if isinstance(node.selector, Literal):
+                taken = select(node, node.selector.value)
+                for s in node.arms + [node.else_b]:
+                    if s is not taken: self.drop(s)
+                return self.stmt(taken) if taken else (Block([]), True)
+            ends = node.else_b is None
+            for i, arm in enumerate(node.arms):
+                node.arms[i], e = self.stmt(arm)
+                ends = ends or e
+            if node.else_b:
+                node.else_b, e = self.stmt(node.else_b)
+                ends = ends or e
+            return node, ends
+        if isinstance(node, For):
+            node.body, _ = self.stmt(node.body)
+        return node, True
+
+# ==============================================================================
+# VARIÁVEIS MORTAS E DISPOSIÇÃO DOS SLOTS (-O1)
+# Uma variável global ou local que nunca é lida (nem como contador de um for,
+# nem através de um índice) não precisa de slot:
+#   - as atribuições a essa variável cujo valor não tem efeitos (sem chamadas,
+#     acessos indexados nem divisões por algo que não seja uma constante
+#     diferente de 0) são removidas da AST
+#   - nas restantes, e nos readln, o valor é calculado e descartado (pop 1)
+# As variáveis que ficam são renumeradas com os escalares inteiros primeiro,
+# para que o gerador os reserve de uma vez (pushn N), e depois as strings e
+# os arrays. Corre depois do ConstantFolder, que pode deixar variáveis sem
+# leituras ao propagar os seus valores.
+# ==============================================================================
+def is_pure(node):
+    """ True se a expressão não tem efeitos nem pode falhar na execução. """
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, FunctionCall) and n.name.lower() != 'length': return False
+        if isinstance(n, InlineCall): return False
+        if isinstance(n, BinOp) and n.op.upper() in ('DIV', 'MOD', '/') and \
+           not (isinstance(n.right, Literal) and n.right.type_name == 'INTEGER' and n.right.value != 0):
+            return False
+        if isinstance(n, VarAccess) and n.index_expr is not None: return False
+        stack.extend(children(n))
+    return True
+
+def read_vars(node):
+    """ Variáveis lidas em node (contadores de for e arrays indexados incluídos). """
+    read = set()
+    for n in walk(node):
+        if isinstance(n, VarAccess): read.add(n.scope)
+        elif isinstance(n, For): read.update((n.scope, n.limit))
+        elif isinstance(n, (Assign, Read)) and n.index_expr is not None: read.add(n.scope)
+    return read
+
+def slot_order(sym):
+    """ Ordem dos slots: escalares (reservados com pushn), strings, arrays. """
+    if isinstance(sym.type, dict): return 2
+    return 1 if str(sym.type).upper() == 'STRING' else 0
+
+class FrameLayout:
+    def __init__(self):
+        self.removed = 0        # variáveis sem slot
+        self.stores = 0         # atribuições removidas
+
+    def run(self, program, st):
+        read = read_vars(program)
+        self.layout(list(st.globals.values()), read)
+        for sub in program.subprograms:
+            sub.locals_data = self.layout(sub.locals_data, read)
+        if self.removed:
+            for n in walk(program): self.drop_stores(n)
+        return program
+
+    def layout(self, symbols, read):
+        """ Descarta as variáveis não lidas e renumera as restantes a partir de 0. """
+        frame = [s for s in symbols if s.kind in ('global', 'local')]
+        live = []
+        for sym in sorted(frame, key=lambda s: s.offset):
+            if sym in read: live.append(sym)
+            else:
+                sym.discard()
+                self.removed += 1
+        live.sort(key=slot_order)
+        for offset, sym in enumerate(live): sym.relocate(offset)
+        return live
+
+    def dead_store(self, node):
+        return isinstance(node, Assign) and not node.scope.live and is_pure(node.expr)
+
+    def drop_stores(self, node):
+        """ Remove dos filhos de node as atribuições puras a variáveis sem slot. """
+        if isinstance(node, (Block, Repeat)):
+            kept = [s for s in node.statements if not self.dead_store(s)]
+            self.stores += len(node.statements) - len(kept)
+            node.statements = kept
+        elif isinstance(node, If):
+            if self.dead_store(node.then_b): node.then_b = Block([]); self.stores += 1
+            if self.dead_store(node.else_b): node.else_b = Block([]); self.stores += 1
+        elif isinstance(node, (While, For)):
+            if self.dead_store(node.body): node.body = Block([]); self.stores += 1
+        elif isinstance(node, Case):
+            for i, arm in enumerate(node.arms):
+                if self.dead_store(arm): node.arms[i] = Block([]); self.stores += 1
+
+# ==============================================================================
+# CHAMADAS RECURSIVAS FINAIS (-O1)
+# Uma chamada de um subprograma a si próprio que é a última coisa que ele faz
+# ('f := f(...)' numa função, 'p(...)' num procedimento, no fim do corpo ou
+# de um ramo de um if que está no fim) não precisa de um frame novo: os
+# argumentos são calculados, passam para os slots dos parâmetros e salta-se
+# para o início do corpo (TailCall). Os locais e o valor de retorno que podem
+# ser lidos antes de escritos voltam ao valor que o prólogo lhes dá; os
+# arrays locais são sempre alocados de novo. Corre depois do FrameLayout, para
+# que as variáveis sem slot já não sejam repostas.
+# ==============================================================================
+def empty(node):
+    return isinstance(node, Block) and all(empty(s) for s in node.statements)
+
+class TailCalls:
+    def __init__(self):
+        self.calls = 0          # chamadas trocadas por saltos
+
+    def run(self, program, st):
+        self.st = st
+        for sub in program.subprograms:
+            self.sub, self.read = sub, read_vars(sub.body)
+            used = {n.scope for n in walk(sub.body) if isinstance(n, (Assign, VarAccess, Read, For))}
+            self.params = {s.offset + len(sub.args): s for s in used if s.kind == 'arg'}
+            frame = [s for s in used if s.kind == 'return'] + [s for s in sub.locals_data if s.live]
+            self.reset = [s for s in frame if not s.name.startswith('$') and
+                          (isinstance(s.type, dict) or first_use(sub.body, s) != 'write')]
+            self.reset.sort(key=lambda s: s.offset)
+            sub.body = self.tail(sub.body)
+        return program
+
+    def tail(self, node):
+        """ node, que acaba o subprograma, com a chamada final trocada por um TailCall. """
+        if isinstance(node, Block):
+            last = len(node.statements) - 1
+            while last >= 0 and empty(node.statements[last]): last -= 1
+            if last >= 0: node.statements[last] = self.tail(node.statements[last])
+            return node
+        if isinstance(node, If):
+            node.then_b = self.tail(node.then_b)
+            if node.else_b: node.else_b = self.tail(node.else_b)
+            return node
+        if isinstance(node, Case):
+            node.arms = [self.tail(s) for s in node.arms]
+            if node.else_b: node.else_b = self.tail(node.else_b)
+            return node
+        call = node.expr if self.sub.is_func and isinstance(node, Assign) and node.scope.kind == 'return' else node
+        if not isinstance(call, FunctionCall) or (call.scope or self.st.find_func(call.name)) is not self.sub.scope:
+            return node
+        if self.sub.is_func and call is node: return node
+
+        args, params = [], []
+        for i, arg in enumerate(call.args):
+            param = self.params.get(i)
+            if param not in self.read: param = None
+            if param is None and is_pure(arg): continue
+            # um parâmetro passado tal como está não muda
+            if param is not None and isinstance(arg, VarAccess) and arg.scope is param: continue
+            args.append(arg)
+            params.append(param)
+        self.sub.tail = True
+        self.calls += 1
+        jump = TailCall(args, params, self.reset)
+        jump.pos = getattr(node, 'pos', None)
+        return jump
+
+# ==============================================================================
+# INTERVALOS DOS ÍNDICES (--checked)
+# Intervalo de valores de cada índice, calculado a partir dos contadores de
+# for com limites conhecidos que o corpo do ciclo não escreve (nem, sendo o
+# contador global, através de chamadas). Os acessos a arrays cujo índice fica
+# dentro dos limites declarados dispensam o 'check' do gerador.
+# ==============================================================================
+def value_range(node, env):
+    """ (mínimo, máximo) dos valores da expressão, ou None se não se sabe. """
+    if isinstance(node, Literal):
+        return (node.value, node.value) if node.type_name == 'INTEGER' else None
+    if isinstance(node, VarAccess):
+        return env.get(node.scope) if node.index_expr is None else None
+    if isinstance(node, BinOp) and node.op in ('+', '-', '*'):
+        a, b = value_range(node.left, env), value_range(node.right, env)
+        if a is None or b is None: return None
+        if node.op == '+': return a[0] + b[0], a[1] + b[1]
+        if node.op == '-': return a[0] - b[1], a[1] - b[0]
+        products = [x * y for x in a for y in b]
+        return min(products), max(products)
+    return None
+
+def own_exprs(node):
+    """ Expressões de um comando, sem as dos comandos que ele contém. """
+    if isinstance(node, (Assign, Read)):
+        exprs = [node.expr] if isinstance(node, Assign) else []
+        return exprs + [node.index_expr] if node.index_expr is not None else exprs
+    if isinstance(node, (FunctionCall, TailCall)): return node.args
+    if isinstance(node, Write): return node.exprs
+    if isinstance(node, (If, While, Repeat)): return [node.cond]
+    if isinstance(node, For): return [node.start, node.end]
+    if isinstance(node, Case): return [node.selector]
+    return []
+
+def statements(node):
+    """ Comandos contidos diretamente num comando. """
+    if isinstance(node, (Block, Repeat)): return node.statements
+    if isinstance(node, If): return [node.then_b, node.else_b] if node.else_b else [node.then_b]
+    if isinstance(node, (While, For)): return [node.body]
+    if isinstance(node, Case): return node.arms + [node.else_b] if node.else_b else node.arms
+    return []
+
+class IndexRanges:
+    def __init__(self):
+        self.safe = set()       # acessos sem check
+
+    def run(self, program):
+        stack = [(program.body, {})] + [(sub.body, {}) for sub in program.subprograms]
+        while stack:
+            node, env = stack.pop()
+            accesses = [node] if isinstance(node, (Assign, Read)) and node.index_expr is not None else []
+            for e in own_exprs(node):
+                accesses += [n for n in walk(e) if isinstance(n, VarAccess) and n.index_expr is not None]
+            self.safe.update(n for n in accesses if self.within(n, env))
+            if isinstance(node, For): env = self.enter(node, env)
+            stack.extend((s, env) for s in statements(node))
+        return self.safe
+
+    def within(self, node, env):
+        kind = node.scope.type
+        if not isinstance(kind, dict): return False
+        r = value_range(node.index_expr, env)
+        return r is not None and kind['lower'] <= r[0] and r[1] < kind['lower'] + kind['size']
+
+    def enter(self, node, env):
+        """ Ambiente do corpo de um for: o contador fica com o intervalo do ciclo. """
+        written, calls = assigned_vars(node.body)
+        sym = node.scope
+        if sym in written or (calls and sym.kind == 'global'): return env
+        a, b = value_range(node.start, env), value_range(node.end, env)
+        if a is None or b is None: return env
+        return {**env, sym: (a[0], b[1]) if node.direction == 'to' else (b[0], a[1])}
@@ -1,292 +1,16 @@
-import ply.yacc as yacc
-from lexer import tokens
+from lexicon import tokens
 from ast_nodes import *
-from semantics import SymbolTable
+from semantics import SymbolTable, TypeChecker, CompileError, UNDEFINED
+from diagnostics import TooManyErrors
+from codegen import CodeGen
+from peephole import Peephole
+from optimizer import ConstantFolder, LoopOptimizer, Inliner, DeadCode, FrameLayout, TailCalls, IndexRanges
+from rdparser import RDParser
+from scanner import scan
+import copy
 import sys
 import os
 
-# ==============================================================================
-# VARIÁVEIS GLOBAIS E FUNÇÕES AUXILIARES
-# ==============================================================================
-
-st = SymbolTable()
-instrs = []
-label_count = 0
-
-def new_label():
-    global label_count
-    label_count += 1
-    return f"L{label_count}"
-
-def emit(s):
-    instrs.append(s)
-
-# ==============================================================================
-# INFERÊNCIA DE TIPOS (Type Checking)
-# ==============================================================================
-def infer_type(node):
-    if isinstance(node, Literal):
-        return node.type_name
-
-    elif isinstance(node, VarAccess):
-        if not node.scope: return 'UNKNOWN'
-        t = node.scope.get('type')
-        if node.index_expr:
-            if isinstance(t, dict) and t.get('kind') == 'array':
-                return str(t['base']).upper()
-        if isinstance(t, dict): return 'ARRAY'
-        return str(t).upper()
-
-    elif isinstance(node, BinOp):
-        op = node.op.upper()
-        if op in ['=', '<>', '<', '>', '<=', '>=']: return 'BOOLEAN'
-        if op == '/': return 'REAL' # Divisão real devolve sempre REAL
-        return infer_type(node.left)
-
-    elif isinstance(node, FunctionCall):
-        if node.name.lower() == 'length': return 'INTEGER'
-        try:
-            info = st.get_func(node.name)
-            if info and info['ret']: return str(info['ret']).upper()
-        except: pass
-        return 'UNKNOWN'
-
-    return 'UNKNOWN'
-
-# ==============================================================================
-# GERADOR DE CÓDIGO (Assembly da VM)
-# ==============================================================================
-def gen(node):
-    if isinstance(node, Program):
-        emit("start")
-        for v in sorted(st.globals.values(), key=lambda x: x['offset']):
-            kind = v['type']
-            if isinstance(kind, dict) and kind['kind']=='array':
-                emit(f"alloc {kind['size']}")
-            elif str(kind).upper() == 'STRING':
-                emit('pushs "0"') 
-            else:
-                emit("pushi 0")
-        
-        l_main = new_label()
-        emit(f"jump {l_main}")
-        for sub in node.subprograms: gen(sub)
-        emit(f"{l_main}:")
-        gen(node.body)
-        emit("stop")
-
-    elif isinstance(node, SubProgramDecl):
-        emit(f"f{st.normalize(node.name)}:")
-        locs = [v for v in node.locals_data if v['offset'] >= 0]
-        max_off = -1
-        for v in locs: 
-            if v['offset'] > max_off: max_off = v['offset']
-        
-        alloc_map = {}
-        for v in locs:
-            kind = v['type']
-            if isinstance(kind, dict): alloc_map[v['offset']] = f"alloc {kind['size']}"
-            elif str(kind).upper() == 'STRING': alloc_map[v['offset']] = 'pushs "0"'
-        
-        for i in range(max_off + 1):
-            if i in alloc_map: emit(alloc_map[i])
-            else: emit("pushi 0")
-        
-        gen(node.body)
-        emit("return")
-
-    elif isinstance(node, Block):
-        for s in node.statements: gen(s)
-
-    elif isinstance(node, Assign):
-        info = node.scope
-        # --- VERIFICAÇÃO DE TIPOS ---
-        var_type = str(info['type']).upper()
-        if isinstance(info['type'], dict): 
-             var_type = str(info['type']['base']).upper() if node.index_expr else 'ARRAY'
-        
-        expr_type = infer_type(node.expr)
-        
-        if expr_type != 'UNKNOWN' and var_type != 'UNKNOWN' and var_type != 'ANY':
-             if var_type == 'REAL' and expr_type == 'INTEGER': pass
-             elif var_type != expr_type:
-                 print(f"⚠️  ERRO SEMÂNTICO: Tentativa de atribuir {expr_type} a uma variável {var_type} ('{node.name}')")
-                 sys.exit(1)
-        # ----------------------------
-
-        if info['scope'] == 'return':
-            gen(node.expr)
-            emit(f"storel {info['offset']}")
-            return
-
-        off = info['offset']
-        base = "storeg" if info['scope'] == 'global' else "storel"
-        
-        if node.index_expr:
-            if info['scope'] == 'global': emit(f"pushg {off}")
-            else: emit(f"pushl {off}")
-            gen(node.index_expr)
-            emit("pushi 1")
-            emit("sub")
-            gen(node.expr)
-            emit("storen")
-        else:
-            gen(node.expr)
-            emit(f"{base} {off}")
-
-    elif isinstance(node, FunctionCall):
-        if node.name.lower() == 'length':
-            gen(node.args[0])
-            emit("strlen")
-            return
-        
-        info = st.get_func(node.name)
-        if info['ret']: emit("pushi 0")
-        for arg in node.args: gen(arg)
-        emit(f"pusha {info['label']}")
-        emit("call")
-        if node.args: emit(f"pop {len(node.args)}")
-
-    elif isinstance(node, VarAccess):
-        info = node.scope
-        off = info['offset']
-        base = "pushg" if info['scope'] == 'global' else "pushl"
-        
-        if node.index_expr:
-            if info['scope'] == 'global': emit(f"pushg {off}")
-            else: emit(f"pushl {off}")
-            gen(node.index_expr)
-            emit("pushi 1")
-            emit("sub")
-            t = info.get('type')
-            if str(t).upper() == 'STRING': 
-                emit("charat")
-            else: 
-                emit("loadn")
-        else:
-            emit(f"{base} {off}")
-
-    elif isinstance(node, BinOp):
-        # --- VERIFICAÇÃO DE TIPOS ---
-        t_left = infer_type(node.left)
-        t_right = infer_type(node.right)
-        op = node.op.upper()
-
-        if op in ['DIV', 'MOD']:
-            if (t_left != 'INTEGER' and t_left != 'UNKNOWN') or \
-               (t_right != 'INTEGER' and t_right != 'UNKNOWN'):
-                print(f"⚠️  ERRO SEMÂNTICO: Operador '{op}' exige Inteiros. Recebeu {t_left} e {t_right}.")
-                sys.exit(1)
-        
-        if op in ['+', '-', '*']:
-            if t_left != t_right and 'UNKNOWN' not in (t_left, t_right):
-                 if not ({t_left, t_right} <= {'INTEGER', 'REAL'}):
-                     print(f"⚠️  ERRO SEMÂNTICO: Operação '{op}' inválida entre {t_left} e {t_right}.")
-                     sys.exit(1)
-        # ----------------------------
-
-        gen(node.left)
-        gen(node.right)
-        ops = {'+':'add','-':'sub','*':'mul','/':'div','DIV':'div','MOD':'mod',
-               'AND':'mul','OR':'add','=':'equal','<>':'equal\nnot',
-               '<':'inf','>':'sup','<=':'infeq','>=':'supeq'}
-        
-        if op == '<>': 
-            emit("equal")
-            emit("not")
-        else: 
-            emit(ops.get(op, 'add'))
-
-    elif isinstance(node, Literal):
-        if node.type_name == 'STRING': emit(f'pushs "{node.value}"')
-        else: emit(f"pushi {node.value}")
-
-    elif isinstance(node, Write):
-        for e in node.exprs:
-            gen(e)
-            if isinstance(e, Literal) and e.type_name == 'STRING':
-                emit("writes")
-            elif isinstance(e, VarAccess):
-                t = e.scope.get('type')
-                if str(t).upper() == 'STRING': emit("writes")
-                else: emit("writei")
-            else:
-                emit("writei")
-        if node.newline:
-            emit('pushs "\\n"')
-            emit("writes")
-
-    elif isinstance(node, Read):
-        info = node.scope
-        off = info['offset']
-        base = "storeg" if info['scope'] == 'global' else "storel"
-        if node.index_expr:
-            if info['scope'] == 'global': emit(f"pushg {off}")
-            else: emit(f"pushl {off}")
-            gen(node.index_expr)
-            emit("pushi 1")
-            emit("sub")
-            emit("read")
-            emit("atoi")
-            emit("storen")
-        else:
-            emit("read")
-            t = info.get('type')
-            if str(t).upper() != 'STRING': emit("atoi")
-            emit(f"{base} {off}")
-
-    elif isinstance(node, If):
-        l1, l2 = new_label(), new_label()
-        gen(node.cond)
-        emit(f"jz {l1}")
-        gen(node.then_b)
-        if node.else_b:
-            emit(f"jump {l2}")
-            emit(f"{l1}:")
-            gen(node.else_b)
-            emit(f"{l2}:")
-        else:
-            emit(f"{l1}:")
-
-    elif isinstance(node, While):
-        l1, l2 = new_label(), new_label()
-        emit(f"{l1}:")
-        gen(node.cond)
-        emit(f"jz {l2}")
-        gen(node.body)
-        emit(f"jump {l1}")
-        emit(f"{l2}:")
-        
-    elif isinstance(node, Repeat):
-        l1 = new_label()
-        emit(f"{l1}:")
-        for s in node.statements: 
-            gen(s)
-        gen(node.cond)
-        emit(f"jz {l1}")
-
-    elif isinstance(node, For):
-        info = node.scope
-        push = f"pushg {info['offset']}" if info['scope']=='global' else f"pushl {info['offset']}"
-        store = f"storeg {info['offset']}" if info['scope']=='global' else f"storel {info['offset']}"
-        gen(node.start)
-        emit(store)
-        l1, l2 = new_label(), new_label()
-        emit(f"{l1}:")
-        emit(push)
-        gen(node.end)
-        if node.direction == 'to': emit("infeq")
-        else: emit("supeq")
-        emit(f"jz {l2}")
-        gen(node.body)
-        emit(push)
-        emit("pushi 1")
-        if node.direction == 'to': emit("add")
-        else: emit("sub")
-        emit(store)
-        emit(f"jump {l1}")
-        emit(f"{l2}:")
-
 # ==============================================================================
 # REGRAS DO PARSER (Gramática BNF)
 # ==============================================================================
@@ -301,14 +25,6 @@ precedence = (
 def p_program(p):
     """ program : header declarations subprograms declarations BEGIN block END DOT """
     p[0] = Program(p[2], p[3], Block(p[6]))
-    global instrs
-    instrs = []
-    gen(p[0])
-    
-    base = os.path.splitext(filename)[0]
-    with open(f"{base}.vm", 'w') as f:
-        f.write("\n".join(instrs) + "\n")
-    print(f"[-] Compilação Sucesso: {base}.vm")
 
 def p_header(p): 
     """ header : PROGRAM ID SEMICOLON """
@@ -326,12 +42,22 @@ def p_var_list(p):
 
 def p_var_line(p):
     """ var_line : id_list COLON type_def SEMICOLON """
-    for name in p[1]: st.add_var(name, p[3])
+    for name in p[1]: p.parser.st.add_var(name, p[3])
+
+def p_var_line_error(p):
+    """ var_line : error SEMICOLON
+                 | id_list error SEMICOLON
+                 | id_list COLON type_def error SEMICOLON """
+    # as variáveis que chegaram a ser lidas ficam declaradas (com o tipo, se
+    # também foi lido), para não gerarem um erro em cada uso
+    if len(p) > 3:
+        for name in p[1]: p.parser.st.add_var(name, p[3] if len(p) == 6 else 'UNKNOWN')
 
 def p_id_list(p):
     """ id_list : ID 
                 | id_list COMMA ID """
-    p[0] = [p[1]] if len(p)==2 else p[1] + [p[3]]
+    if len(p) == 2: p[0] = [p[1]]
+    else: p[1].append(p[3]); p[0] = p[1]
 
 def p_type_def(p):
     """ type_def : INTEGER 
@@ -344,31 +70,38 @@ def p_type_def(p):
 def p_subprograms(p):
     """ subprograms : subprograms subprogram 
                     | """
-    p[0] = [] if len(p)==1 else p[1] + [p[2]]
+    if len(p) == 1: p[0] = []
+    else: p[1].append(p[2]); p[0] = p[1]
 
 def p_subprogram(p):
     """ subprogram : func_head vars_local compound_stmt SEMICOLON 
                    | proc_head vars_local compound_stmt SEMICOLON """
     head = p[1]
-    locals_data = [v for v in st.locals.values() if v['offset'] >= 0]
+    st = p.parser.st
+    locals_data = [v for v in st.locals.values() if v.offset >= 0]
     p[0] = SubProgramDecl(head['name'], head['args'], head['ret'], locals_data, p[3], head['is_func'])
+    p[0].scope = head['info']
     st.exit_func()
 
 def p_func_head(p):
     """ func_head : FUNCTION ID args_decl COLON type_def SEMICOLON """
+    st = p.parser.st
     st.add_func(p[2], p[5], p[3])
+    info = st.find_func(p[2])
     st.enter_func(p[2], len(p[3]))
     for i, (n, t) in enumerate(p[3]):
         st.add_arg(n, t, i - len(p[3]))
-    p[0] = {'name': p[2], 'args': p[3], 'ret': p[5], 'is_func': True}
+    p[0] = {'name': p[2], 'args': p[3], 'ret': p[5], 'is_func': True, 'info': info}
 
 def p_proc_head(p):
     """ proc_head : PROCEDURE ID args_decl SEMICOLON """
+    st = p.parser.st
     st.add_func(p[2], None, p[3])
+    info = st.find_func(p[2])
     st.enter_func(p[2], len(p[3]))
     for i, (n, t) in enumerate(p[3]):
         st.add_arg(n, t, i - len(p[3]))
-    p[0] = {'name': p[2], 'args': p[3], 'ret': None, 'is_func': False}
+    p[0] = {'name': p[2], 'args': p[3], 'ret': None, 'is_func': False, 'info': info}
 
 def p_args_decl(p):
     """ args_decl : LPAREN arg_list RPAREN 
@@ -378,7 +111,8 @@ def p_args_decl(p):
 def p_arg_list(p):
     """ arg_list : arg_item 
                  | arg_list SEMICOLON arg_item """
-    p[0] = p[1] if len(p)==2 else p[1] + [p[3]]
+    if len(p) == 2: p[0] = p[1]
+    else: p[1].append(p[3]); p[0] = p[1]
 
 def p_arg_item(p):
     """ arg_item : id_list COLON type_def """
@@ -395,7 +129,8 @@ def p_block(p):
 def p_statements(p):
     """ statements : statement 
                    | statements SEMICOLON statement """
-    p[0] = [p[1]] if len(p)==2 else p[1] + [p[3]]
+    if len(p) == 2: p[0] = [p[1]]
+    else: p[1].append(p[3]); p[0] = p[1]
 
 def p_statement(p):
     """ statement : assignment 
@@ -405,18 +140,23 @@ def p_statement(p):
                   | while_stmt 
                   | repeat_stmt
                   | for_stmt 
+                  | case_stmt 
                   | func_call_stmt 
                   | compound_stmt 
                   | """
     p[0] = p[1] if len(p)>1 else Block([]) 
 
+def p_statement_error(p):
+    """ statement : error """
+    p[0] = Block([])
+
 def p_repeat_stmt(p):
     """ repeat_stmt : REPEAT statements UNTIL expression """
-    p[0] = Repeat(p[2], p[4])
+    p[0] = at(p, Repeat(p[2], p[4]))
 
 def p_func_call_stmt(p):
     """ func_call_stmt : ID LPAREN expr_list RPAREN """
-    p[0] = FunctionCall(p[1], p[3])
+    p[0] = at(p, FunctionCall(p[1], p[3])); p[0].scope = p.parser.st.find_func(p[1])
 
 def p_compound_stmt(p):
     """ compound_stmt : BEGIN statements END """
@@ -425,9 +165,9 @@ def p_compound_stmt(p):
 def p_assignment(p):
     """ assignment : ID ASSIGN expression
                    | ID LBRACKET expression RBRACKET ASSIGN expression """
-    info = st.get(p[1])
-    if len(p) == 4: p[0] = Assign(p[1], p[3]); p[0].scope = info
-    else: p[0] = Assign(p[1], p[6], index_expr=p[3]); p[0].scope = info
+    info = lookup(p, 1)
+    if len(p) == 4: p[0] = at(p, Assign(p[1], p[3])); p[0].scope = info
+    else: p[0] = at(p, Assign(p[1], p[6], index_expr=p[3])); p[0].scope = info
 
 def p_expression_binop(p):
     # Correção: Adicionada a regra 'expression SLASH expression'
@@ -471,62 +211,333 @@ def p_expression_call_or_var(p):
     """ expression : ID 
                    | ID LPAREN expr_list RPAREN 
                    | ID LBRACKET expression RBRACKET """
+    st = p.parser.st
     if len(p) == 2:
-        info = st.get(p[1])
+        info = lookup(p, 1)
         try:
             p[0] = VarAccess(p[1]); p[0].scope = info
         except:
             p[0] = FunctionCall(p[1], [])
     elif p[2] == '(': 
-        p[0] = FunctionCall(p[1], p[3])
+        p[0] = at(p, FunctionCall(p[1], p[3])); p[0].scope = st.find_func(p[1])
     else: 
-        info = st.get(p[1])
+        info = lookup(p, 1)
         p[0] = VarAccess(p[1], index_expr=p[3]); p[0].scope = info
 
 def p_io(p):
     """ write_stmt : WRITELN LPAREN expr_list RPAREN 
                    | WRITE LPAREN expr_list RPAREN """
-    p[0] = Write(p[3], (p[1].upper() == 'WRITELN'))
+    p[0] = at(p, Write(p[3], (p[1].upper() == 'WRITELN')))
 
 def p_read(p):
     """ read_stmt : READLN LPAREN ID RPAREN 
                   | READLN LPAREN ID LBRACKET expression RBRACKET RPAREN """
-    info = st.get(p[3])
-    if len(p)==5: p[0] = Read(p[3]); p[0].scope = info
-    else: p[0] = Read(p[3], index_expr=p[5]); p[0].scope = info
+    info = lookup(p, 3)
+    if len(p)==5: p[0] = at(p, Read(p[3])); p[0].scope = info
+    else: p[0] = at(p, Read(p[3], index_expr=p[5])); p[0].scope = info
 
 def p_control(p):
     """ if_stmt : IF expression THEN statement 
                 | IF expression THEN statement ELSE statement """
-    p[0] = If(p[2], p[4]) if len(p)==5 else If(p[2], p[4], p[6])
+    p[0] = at(p, If(p[2], p[4]) if len(p)==5 else If(p[2], p[4], p[6]))
 
 def p_while(p):
     """ while_stmt : WHILE expression DO statement """
-    p[0] = While(p[2], p[4])
+    p[0] = at(p, While(p[2], p[4]))
 
 def p_for(p):
     """ for_stmt : FOR ID ASSIGN expression TO expression DO statement 
                  | FOR ID ASSIGN expression DOWNTO expression DO statement """
-    p[0] = For(p[2], p[4], p[6], p[8], p[5].lower()); p[0].scope = st.get(p[2])
+    p[0] = at(p, For(p[2], p[4], p[6], p[8], p[5].lower())); p[0].scope = lookup(p, 2)
+
+def p_case(p):
+    """ case_stmt : CASE expression OF case_list END 
+                 | CASE expression OF case_list ELSE statements END """
+    items = [item for item in p[4] if item is not None]
+    else_b = Block(p[6]) if len(p) == 8 else None
+    p[0] = at(p, Case(p[2], [labels for labels, _ in items], [arm for _, arm in items], else_b))
+
+def p_case_list(p):
+    """ case_list : case_item 
+                 | case_list SEMICOLON case_item """
+    if len(p) == 2: p[0] = [p[1]]
+    else: p[1].append(p[3]); p[0] = p[1]
+
+def p_case_item(p):
+    """ case_item : case_labels COLON statement 
+                 | """
+    p[0] = (p[1], p[3]) if len(p) == 4 else None    # None: ';' antes do 'else'/'end'
+
+def p_case_labels(p):
+    """ case_labels : case_label 
+                   | case_labels COMMA case_label """
+    if len(p) == 2: p[0] = [p[1]]
+    else: p[1].append(p[3]); p[0] = p[1]
+
+def p_case_label(p):
+    """ case_label : case_const 
+                  | case_const RANGE case_const """
+    p[0] = (p[1], p[1]) if len(p) == 2 else (p[1], p[3])
+
+def p_case_const(p):
+    """ case_const : NUM 
+                  | MINUS NUM 
+                  | STRING_LITERAL """
+    if len(p) == 3: p[0] = Literal(-p[2], 'INTEGER')
+    elif p.slice[1].type == 'NUM': p[0] = Literal(p[1], 'INTEGER')
+    elif len(p[1]) == 1: p[0] = Literal(ord(p[1]), 'INTEGER')
+    else: p[0] = Literal(p[1], 'STRING')
 
 def p_expr_list(p):
     """ expr_list : expression
                   | expr_list COMMA expression """
-    p[0] = [p[1]] if len(p)==2 else p[1] + [p[3]]
+    if len(p) == 2: p[0] = [p[1]]
+    else: p[1].append(p[3]); p[0] = p[1]
 
 def p_error(p):
-    if p: print(f"Erro Sintaxe: '{p.value}' linha {p.lineno}")
-    else: print("Erro: Fim inesperado")
-    sys.exit(1)
+    if p: raise CompileError(f"Erro Sintaxe: '{p.value}' linha {p.lineno}")
+    else: raise CompileError("Erro: Fim inesperado")
 
-parser = yacc.yacc()
+# ==============================================================================
+# MODO DE DIAGNÓSTICO (diagnostics.py)
+# Numa compilação normal p.parser.diagnostics é None e estas funções só fazem
+# a procura. No modo --all-errors o p_error é substituído por
+# Diagnostics.syntax_error e as produções 'error' acima recuperam no ';'.
+# ==============================================================================
+def at(p, node, i=1):
+    """ Guarda no nó a posição do token i da regra (só no modo de diagnóstico). """
+    if p.parser.diagnostics: node.pos = p.lexpos(i)
+    return node
+
+def lookup(p, i):
+    """ st.get(p[i]); no modo de diagnóstico regista o erro e devolve UNDEFINED. """
+    try:
+        return p.parser.st.get(p[i])
+    except CompileError as e:
+        if not p.parser.diagnostics: raise
+        p.parser.diagnostics.error_once('semantico', str(e), p.lexpos(i))
+        return UNDEFINED
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2: print("Uso: python3 src/parser.py <ficheiro.pas>")
-    else:
-        filename = sys.argv[1]
+# ==============================================================================
+# TABELAS LALR
+# Por omissão as tabelas são lidas de parsetab.py sem a validação completa do
+# PLY e sem escrever parsetab.py nem parser.out; apenas se confirma que a
+# assinatura da gramática coincide. Com PLC_TABLES=build usa-se yacc.yacc().
+# Para regenerar: python -m compiler tables
+#
+# O PLY (lexer e tabelas) só é carregado na primeira compilação que o usa, para
+# que o parser descendente (rdparser.py) arranque sem esse custo.
+# ==============================================================================
+def load_parser(frozen=None):
+    import ply.yacc as yacc
+    from lexer import FROZEN_TABLES
+    if frozen is None: frozen = FROZEN_TABLES
+    module = sys.modules[__name__]
+    if not frozen:
+        return yacc.yacc(module=module)
+    pinfo = yacc.ParserReflect(dict(globals()))
+    pinfo.get_all()
+    lr = yacc.LRTable()
+    try:
+        valid = lr.read_table('parsetab') == pinfo.signature()
+    except (ImportError, yacc.YaccError):
+        valid = False
+    if not valid:
+        print("Aviso: parsetab.py desatualizado; corre 'python -m compiler tables'.", file=sys.stderr)
+        return yacc.yacc(module=module, debug=False, write_tables=False, errorlog=yacc.NullLogger())
+    lr.bind_callables(pinfo.pdict)
+    return yacc.LRParser(lr, p_error)
+
+_parser = None
+
+def get_parser():
+    global _parser
+    if _parser is None: _parser = load_parser()
+    return _parser
+
+# ==============================================================================
+# API DO COMPILADOR
+# Cada Compiler tem a sua tabela de símbolos, contador de labels e buffer de
+# saída, e usa cópias próprias do lexer e do parser (as tabelas LALR são
+# partilhadas). Pode ser reutilizado no mesmo processo e em várias threads.
+# ==============================================================================
+SCANNERS = ('ply', 'fast')
+SCANNER = os.environ.get('PLC_SCANNER', 'ply')
+PARSERS = ('lalr', 'rd')
+PARSER = os.environ.get('PLC_PARSER', 'lalr')
+
+def _run(name, fn, *args):
+    return fn(*args)
+
+class Compiler:
+    def __init__(self, optimize=0, stats=None, scanner=None, parser=None, diagnostics=None, checked=False):
+        self.st = SymbolTable()
+        self.codegen = CodeGen(self.st, bulk=optimize >= 1, rotate=optimize >= 1, checked=checked,
+                               short=optimize >= 1, pool=optimize >= 1)
+        self.optimize = optimize
+        self.tree = None
+        self.peephole = Peephole() if optimize >= 1 else None
+        self.loops = LoopOptimizer() if optimize >= 1 else None
+        self.dead = DeadCode() if optimize >= 1 else None
+        self.layout = FrameLayout() if optimize >= 1 else None
+        self.tails = TailCalls() if optimize >= 1 else None
+        self.folder = ConstantFolder() if optimize >= 2 else None
+        self.inliner = Inliner() if optimize >= 2 else None
+        # --checked: verificação dos índices, exceto onde a IndexRanges a dispensa
+        self.ranges = IndexRanges() if checked else None
+        # lexer: 'ply' (lexer.py) ou 'fast' (scanner.py)
+        self.scanner = scanner or SCANNER
+        if self.scanner not in SCANNERS:
+            raise ValueError(f"Scanner desconhecido: {self.scanner} (opções: {', '.join(SCANNERS)})")
+        # parser: 'lalr' (PLY) ou 'rd' (rdparser.py, lê sempre do scanner rápido)
+        self.parser = parser or PARSER
+        if self.parser not in PARSERS:
+            raise ValueError(f"Parser desconhecido: {self.parser} (opções: {', '.join(PARSERS)})")
+        # modo --all-errors (diagnostics.Diagnostics): usa sempre o PLY e o LALR
+        self.diagnostics = diagnostics
+        if diagnostics: self.scanner, self.parser = 'ply', 'lalr'
+        if self.parser == 'lalr': get_parser()
+        # instrumentação opcional (instrument.CompileStats)
+        self.stats = stats
+        if stats: stats.count_lookups(self.st)
+
+    def parse(self, text):
+        text = text.replace('\r', '')
+        if self.parser == 'rd': return self.parse_rd(text)
+        if self.scanner == 'fast':
+            from scanner import Scanner
+            lx = Scanner()
+        else:
+            from lexer import lexer
+            lx = lexer.clone()
+        lx.lineno = 1
+        ps = copy.copy(get_parser())
+        ps.st = self.st
+        ps.diagnostics = self.diagnostics
+        if self.diagnostics:
+            self.diagnostics.text = text
+            lx.diagnostics = self.diagnostics
+            ps.errorfunc = self.diagnostics.syntax_error
+        if self.stats: self.stats.lex_input(lx, text)
+        else: lx.input(text)
+        tokenfunc = self.stats.token_counter(lx.token) if self.stats else None
+        return ps.parse(lexer=lx, tokenfunc=tokenfunc)
+
+    def parse_rd(self, text):
+        stream = self.stats.lex_all(scan, text) if self.stats else scan(text)
+        return RDParser(self.st).parse(text, stream)
+
+    def compile(self, text, run=None):
+        # run(nome, fn, *args) executa cada fase; por omissão mede-a no
+        # CompileStats, se houver (o bench.py passa a sua própria medição)
+        run = run or (self.stats.phase if self.stats else _run)
+        if self.diagnostics:
+            tree = self.tree = self.check_all(text, run)
+        else:
+            tree = self.tree = run('parse', self.parse, text)
+            run('check', TypeChecker(self.st).check, tree)
+            if self.folder: run('fold', self.folder.run, tree)
+        if self.loops: run('loops', self.loops.run, tree, self.st)
+        if self.inliner: run('inline', self.inliner.run, tree, self.st)
+        if self.dead: run('dead', self.dead.run, tree, self.st)
+        if self.layout: run('layout', self.layout.run, tree, self.st)
+        if self.tails: run('tail', self.tails.run, tree, self.st)
+        if self.ranges: self.codegen.safe = run('ranges', self.ranges.run, tree)
+        run('codegen', self.codegen.gen, tree)
+        if self.peephole:
+            self.codegen.instrs = run('peephole', self.peephole.optimize, self.codegen.instrs)
+        code = run('output', self.codegen.output)
+        if self.stats: self.stats.collect(self)
+        return code
+
+    def check_all(self, text, run):
+        """ parse, check e fold no modo de diagnóstico: os erros ficam todos em
+            self.diagnostics e, se houver algum, levanta CompileError com a lista.
+            A dobragem só corre numa árvore sem erros de tipos. """
+        diag = self.diagnostics
+        tree = None
         try:
-            with open(filename, 'r') as f: 
-                content = f.read().replace('\r', '') 
-                parser.parse(content)
-        except FileNotFoundError: print("Ficheiro não encontrado")
\ No newline at end of file
+            tree = run('parse', self.parse, text)
+            if tree is not None:
+                run('check', TypeChecker(self.st, diag).check, tree)
+                if self.folder and not diag.errors:
+                    try:
+                        run('fold', self.folder.run, tree)
+                    except TooManyErrors:
+                        raise
+                    except CompileError as e:
+                        diag.error('semantico', str(e))
+        except TooManyErrors:
+            pass
+        if diag.errors: raise CompileError(diag.format())
+        return tree
+
+def compile_source(text, optimize=0):
+    """ Compila código Pascal e devolve o código da VM como string. """
+    return Compiler(optimize).compile(text)
+
+if __name__ == '__main__':
+    import argparse
+    ap = argparse.ArgumentParser(prog='parser.py', usage='python3 src/parser.py [-O1|-O2] <ficheiro.pas>')
+    ap.add_argument('filename')
+    ap.add_argument('-O', dest='optimize', type=int, default=0, choices=[0, 1, 2], help='nível de otimização')
+    ap.add_argument('--checked', action='store_true', help='verifica os índices dos arrays durante a execução')
+    ap.add_argument('--scanner', choices=SCANNERS, help='lexer a usar (por omissão PLC_SCANNER ou ply)')
+    ap.add_argument('--parser', choices=PARSERS, help='parser a usar (por omissão PLC_PARSER ou lalr)')
+    ap.add_argument('--mem-report', action='store_true', help='mostra o nº de nós da AST e a memória ocupada')
+    ap.add_argument('--timings', action='store_true', help='mostra o tempo de cada fase')
+    ap.add_argument('--stats', action='store_true', help='mostra contagens (tokens, nós, procuras, instruções, labels)')
+    ap.add_argument('--json', action='store_true', help='escreve tempos e contagens em JSON no stdout (as mensagens vão para stderr)')
+    ap.add_argument('--all-errors', action='store_true', help='reporta todos os erros (léxicos, sintáticos e semânticos) de uma vez')
+    ap.add_argument('--max-errors', type=int, metavar='N', help='com --all-errors, pára ao fim de N erros (por omissão 20; 0 sem limite)')
+    args = ap.parse_args()
+    filename = args.filename
+    try:
+        with open(filename, 'r') as f:
+            content = f.read()
+    except FileNotFoundError:
+        print("Ficheiro não encontrado")
+        sys.exit(0)
+    stats = None
+    if args.timings or args.stats or args.json:
+        from instrument import CompileStats
+        stats = CompileStats()
+    diagnostics = None
+    if args.all_errors or args.max_errors is not None:
+        from diagnostics import Diagnostics
+        diagnostics = Diagnostics(20 if args.max_errors is None else args.max_errors)
+    compiler = Compiler(args.optimize, stats, args.scanner, args.parser, diagnostics, args.checked)
+    try:
+        code = compiler.compile(content)
+    except CompileError as e:
+        if diagnostics and args.json: print(diagnostics.to_json())
+        else: print(e)
+        sys.exit(1)
+    base = os.path.splitext(filename)[0]
+    with open(f"{base}.vm", 'w') as f:
+        f.write(code)
+    log = sys.stderr if args.json else sys.stdout
+    print(f"[-] Compilação Sucesso: {base}.vm", file=log)
+    if compiler.folder:
+        print(f"[-] Constantes: {compiler.folder.folded} expressões dobradas, {compiler.folder.propagated} usos propagados", file=log)
+    if compiler.loops:
+        print(f"[-] Ciclos: {compiler.loops.limits} limites de for calculados uma vez, {compiler.loops.hoisted} expressões invariantes tiradas", file=log)
+    if compiler.inliner:
+        print(f"[-] Funções: {compiler.inliner.inlined} chamadas expandidas no sítio, {compiler.inliner.evaluated} calculadas na compilação", file=log)
+    if compiler.dead:
+        print(f"[-] Código morto: {compiler.dead.subprograms} subprogramas nunca chamados e {compiler.dead.statements} comandos inalcançáveis removidos", file=log)
+    if compiler.layout:
+        print(f"[-] Variáveis: {compiler.layout.removed} nunca lidas sem slot, {compiler.layout.stores} atribuições removidas", file=log)
+    if compiler.tails:
+        print(f"[-] Recursão: {compiler.tails.calls} chamadas finais trocadas por saltos", file=log)
+    if compiler.ranges:
+        print(f"[-] Índices: {compiler.codegen.checks} verificações, {len(compiler.ranges.safe)} acessos dentro dos limites sem verificação", file=log)
+    if compiler.peephole:
+        print(f"[-] Peephole: {compiler.peephole.removed} instruções removidas", file=log)
+    if args.mem_report:
+        print(format_mem_report(mem_report(compiler.tree)), file=log)
+    if args.json:
+        print(stats.to_json())
+    elif stats:
+        if args.timings: print(stats.format_timings())
+        if args.stats: print(stats.format_stats())
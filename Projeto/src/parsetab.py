@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftORleftANDnonassocEQNEQLTGTLEGEleftPLUSMINUSleftTIMESDIVMODSLASHrightNOTnonassocTHENnonassocELSEAND ARRAY ASSIGN BEGIN BOOLEAN COLON COMMA DIV DO DOT DOWNTO ELSE END EQ FALSE FOR FUNCTION GE GT ID IF INTEGER LBRACKET LE LPAREN LT MINUS MOD NEQ NOT NUM OF OR PLUS PROCEDURE PROGRAM RANGE RBRACKET READ READLN REPEAT RPAREN SEMICOLON SLASH STRING STRING_LITERAL THEN TIMES TO TRUE UNTIL VAR WHILE WRITE WRITELN program : header declarations subprograms declarations BEGIN block END DOT  header : PROGRAM ID SEMICOLON  declarations : VAR var_list \n                     |  var_list : var_line \n                 | var_list var_line  var_line : id_list COLON type_def SEMICOLON  id_list : ID \n                | id_list COMMA ID  type_def : INTEGER \n                 | BOOLEAN \n                 | STRING \n                 | ARRAY LBRACKET NUM RANGE NUM RBRACKET OF type_def  subprograms : subprograms subprogram \n                    |  subprogram : func_head vars_local compound_stmt SEMICOLON \n                   | proc_head vars_local compound_stmt SEMICOLON  func_head : FUNCTION ID args_decl COLON type_def SEMICOLON  proc_head : PROCEDURE ID args_decl SEMICOLON  args_decl : LPAREN arg_list RPAREN \n                  |  arg_list : arg_item \n                 | arg_list SEMICOLON arg_item  arg_item : id_list COLON type_def  vars_local : declarations  block : statements  statements : statement \n                   | statements SEMICOLON statement  statement : assignment \n                  | write_stmt \n                  | read_stmt \n                  | if_stmt \n                  | while_stmt \n                  | repeat_stmt\n                  | for_stmt \n                  | func_call_stmt \n                  | compound_stmt \n                  |  repeat_stmt : REPEAT statements UNTIL expression  func_call_stmt : ID LPAREN expr_list RPAREN  compound_stmt : BEGIN statements END  assignment : ID ASSIGN expression\n                   | ID LBRACKET expression RBRACKET ASSIGN expression  expression : expression PLUS expression\n                   | expression MINUS expression\n                   | expression TIMES expression\n                   | expression DIV expression \n                   | expression SLASH expression\n                   | expression MOD expression\n                   | expression EQ expression\n                   | expression NEQ expression\n                   | expression LT expression\n                   | expression LE expression\n                   | expression GT expression\n                   | expression GE expression \n                   | expression AND expression\n                   | expression OR expression  expression : NUM \n                   | STRING_LITERAL \n                   | TRUE \n                   | FALSE \n                   | LPAREN expression RPAREN  expression : ID \n                   | ID LPAREN expr_list RPAREN \n                   | ID LBRACKET expression RBRACKET  write_stmt : WRITELN LPAREN expr_list RPAREN \n                   | WRITE LPAREN expr_list RPAREN  read_stmt : READLN LPAREN ID RPAREN \n                  | READLN LPAREN ID LBRACKET expression RBRACKET RPAREN  if_stmt : IF expression THEN statement \n                | IF expression THEN statement ELSE statement  while_stmt : WHILE expression DO statement  for_stmt : FOR ID ASSIGN expression TO expression DO statement \n                 | FOR ID ASSIGN expression DOWNTO expression DO statement  expr_list : expression\n                  | expr_list COMMA expression '
+_lr_signature = 'leftORleftANDnonassocEQNEQLTGTLEGEleftPLUSMINUSleftTIMESDIVMODSLASHrightNOTnonassocTHENnonassocELSEAND ARRAY ASSIGN BEGIN BOOLEAN CASE COLON COMMA DIV DO DOT DOWNTO ELSE END EQ FALSE FOR FUNCTION GE GT ID IF INTEGER LBRACKET LE LPAREN LT MINUS MOD NEQ NOT NUM OF OR PLUS PROCEDURE PROGRAM RANGE RBRACKET READ READLN REPEAT RPAREN SEMICOLON SLASH STRING STRING_LITERAL THEN TIMES TO TRUE UNTIL VAR WHILE WRITE WRITELN program : header declarations subprograms declarations BEGIN block END DOT  header : PROGRAM ID SEMICOLON  declarations : VAR var_list \n                     |  var_list : var_line \n                 | var_list var_line  var_line : id_list COLON type_def SEMICOLON  var_line : error SEMICOLON\n                 | id_list error SEMICOLON\n                 | id_list COLON type_def error SEMICOLON  id_list : ID \n                | id_list COMMA ID  type_def : INTEGER \n                 | BOOLEAN \n                 | STRING \n                 | ARRAY LBRACKET NUM RANGE NUM RBRACKET OF type_def  subprograms : subprograms subprogram \n                    |  subprogram : func_head vars_local compound_stmt SEMICOLON \n                   | proc_head vars_local compound_stmt SEMICOLON  func_head : FUNCTION ID args_decl COLON type_def SEMICOLON  proc_head : PROCEDURE ID args_decl SEMICOLON  args_decl : LPAREN arg_list RPAREN \n                  |  arg_list : arg_item \n                 | arg_list SEMICOLON arg_item  arg_item : id_list COLON type_def  vars_local : declarations  block : statements  statements : statement \n                   | statements SEMICOLON statement  statement : assignment \n                  | write_stmt \n                  | read_stmt \n                  | if_stmt \n                  | while_stmt \n                  | repeat_stmt\n                  | for_stmt \n                  | case_stmt \n                  | func_call_stmt \n                  | compound_stmt \n                  |  statement : error  repeat_stmt : REPEAT statements UNTIL expression  func_call_stmt : ID LPAREN expr_list RPAREN  compound_stmt : BEGIN statements END  assignment : ID ASSIGN expression\n                   | ID LBRACKET expression RBRACKET ASSIGN expression  expression : expression PLUS expression\n                   | expression MINUS expression\n                   | expression TIMES expression\n                   | expression DIV expression \n                   | expression SLASH expression\n                   | expression MOD expression\n                   | expression EQ expression\n                   | expression NEQ expression\n                   | expression LT expression\n                   | expression LE expression\n                   | expression GT expression\n                   | expression GE expression \n                   | expression AND expression\n                   | expression OR expression  expression : NUM \n                   | STRING_LITERAL \n                   | TRUE \n                   | FALSE \n                   | LPAREN expression RPAREN  expression : ID \n                   | ID LPAREN expr_list RPAREN \n                   | ID LBRACKET expression RBRACKET  write_stmt : WRITELN LPAREN expr_list RPAREN \n                   | WRITE LPAREN expr_list RPAREN  read_stmt : READLN LPAREN ID RPAREN \n                  | READLN LPAREN ID LBRACKET expression RBRACKET RPAREN  if_stmt : IF expression THEN statement \n                | IF expression THEN statement ELSE statement  while_stmt : WHILE expression DO statement  for_stmt : FOR ID ASSIGN expression TO expression DO statement \n                 | FOR ID ASSIGN expression DOWNTO expression DO statement  case_stmt : CASE expression OF case_list END \n                 | CASE expression OF case_list ELSE statements END  case_list : case_item \n                 | case_list SEMICOLON case_item  case_item : case_labels COLON statement \n                 |  case_labels : case_label \n                   | case_labels COMMA case_label  case_label : case_const \n                  | case_const RANGE case_const  case_const : NUM \n                  | MINUS NUM \n                  | STRING_LITERAL  expr_list : expression\n                  | expr_list COMMA expression '
     
-_lr_action_items = {'PROGRAM':([0,],[3,]),'$end':([1,90,],[0,-1,]),'VAR':([2,4,7,8,9,12,14,15,16,19,60,81,82,87,153,],[5,-15,5,-3,-5,-2,-14,5,5,-6,-7,-16,-17,-19,-18,]),'FUNCTION':([2,4,7,8,9,12,14,19,60,81,82,],[-4,-15,17,-3,-5,-2,-14,-6,-7,-16,-17,]),'PROCEDURE':([2,4,7,8,9,12,14,19,60,81,82,],[-4,-15,18,-3,-5,-2,-14,-6,-7,-16,-17,]),'BEGIN':([2,4,7,8,9,12,13,14,15,16,19,22,23,24,25,34,53,60,64,81,82,87,99,117,153,160,173,174,],[-4,-15,-4,-3,-5,-2,22,-14,-4,-4,-6,34,34,-25,34,34,34,-7,34,-16,-17,-19,34,34,-18,34,34,34,]),'ID':([3,5,8,9,17,18,19,21,22,34,51,52,53,54,58,60,64,65,66,67,68,69,70,76,99,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,117,118,119,122,127,131,157,160,163,164,173,174,],[6,11,11,-5,26,27,-6,33,47,47,77,77,47,80,11,-7,47,77,77,77,77,77,98,77,47,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,47,77,77,11,77,77,77,47,77,77,47,47,]),'SEMICOLON':([6,22,27,28,29,30,31,34,36,37,38,39,40,41,42,43,44,45,46,53,55,56,59,62,64,72,73,74,75,77,79,84,85,89,91,92,99,117,120,121,126,128,129,130,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,150,151,154,155,160,161,162,166,168,172,173,174,175,176,177,],[12,-38,-21,60,-10,-11,-12,-38,64,-27,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,81,82,87,64,-38,-58,-59,-60,-61,-63,64,122,-22,-41,-28,-42,-38,-38,153,-20,-40,-66,-67,-68,-70,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,-72,-39,-23,-24,-38,-64,-65,-43,-71,-69,-38,-38,-13,-73,-74,]),'COLON':([10,11,26,33,57,86,121,],[20,-8,-21,-9,83,123,-20,]),'COMMA':([10,11,33,72,73,74,75,77,86,94,95,96,97,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,158,161,162,],[21,-8,-9,-58,-59,-60,-61,-63,21,127,-75,127,127,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,127,-76,-64,-65,]),'INTEGER':([20,83,123,171,],[29,29,29,29,]),'BOOLEAN':([20,83,123,171,],[30,30,30,30,]),'STRING':([20,83,123,171,],[31,31,31,31,]),'ARRAY':([20,83,123,171,],[32,32,32,32,]),'END':([22,34,35,36,37,38,39,40,41,42,43,44,45,46,62,64,72,73,74,75,77,89,91,92,99,117,126,128,129,130,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,150,151,160,161,162,166,168,172,173,174,176,177,],[-38,-38,63,-26,-27,-29,-30,-31,-32,-33,-34,-35,-36,-37,89,-38,-58,-59,-60,-61,-63,-41,-28,-42,-38,-38,-40,-66,-67,-68,-70,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,-72,-39,-38,-64,-65,-43,-71,-69,-38,-38,-73,-74,]),'WRITELN':([22,34,53,64,99,117,160,173,174,],[48,48,48,48,48,48,48,48,48,]),'WRITE':([22,34,53,64,99,117,160,173,174,],[49,49,49,49,49,49,49,49,49,]),'READLN':([22,34,53,64,99,117,160,173,174,],[50,50,50,50,50,50,50,50,50,]),'IF':([22,34,53,64,99,117,160,173,174,],[51,51,51,51,51,51,51,51,51,]),'WHILE':([22,34,53,64,99,117,160,173,174,],[52,52,52,52,52,52,52,52,52,]),'REPEAT':([22,34,53,64,99,117,160,173,174,],[53,53,53,53,53,53,53,53,53,]),'FOR':([22,34,53,64,99,117,160,173,174,],[54,54,54,54,54,54,54,54,54,]),'LPAREN':([26,27,47,48,49,50,51,52,65,66,67,68,69,76,77,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,118,119,127,131,157,163,164,],[58,58,67,68,69,70,76,76,76,76,76,76,76,76,115,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,]),'RPAREN':([29,30,31,72,73,74,75,77,84,85,94,95,96,97,98,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,154,155,158,161,162,167,175,],[-10,-11,-12,-58,-59,-60,-61,-63,121,-22,126,-75,128,129,130,147,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,161,-23,-24,-76,-64,-65,172,-13,]),'LBRACKET':([32,47,77,98,],[61,66,116,131,]),'UNTIL':([37,38,39,40,41,42,43,44,45,46,53,64,72,73,74,75,77,79,89,91,92,99,117,126,128,129,130,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,150,151,160,161,162,166,168,172,173,174,176,177,],[-27,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-38,-58,-59,-60,-61,-63,118,-41,-28,-42,-38,-38,-40,-66,-67,-68,-70,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,-72,-39,-38,-64,-65,-43,-71,-69,-38,-38,-73,-74,]),'ELSE':([38,39,40,41,42,43,44,45,46,72,73,74,75,77,89,92,99,117,126,128,129,130,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,150,151,160,161,162,166,168,172,173,174,176,177,],[-29,-30,-31,-32,-33,-34,-35,-36,-37,-58,-59,-60,-61,-63,-41,-42,-38,-38,-40,-66,-67,-68,160,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,-72,-39,-38,-64,-65,-43,-71,-69,-38,-38,-73,-74,]),'ASSIGN':([47,80,125,],[65,119,157,]),'NUM':([51,52,61,65,66,67,68,69,76,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,118,119,124,127,131,157,163,164,],[72,72,88,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,156,72,72,72,72,72,]),'STRING_LITERAL':([51,52,65,66,67,68,69,76,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,118,119,127,131,157,163,164,],[73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,]),'TRUE':([51,52,65,66,67,68,69,76,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,118,119,127,131,157,163,164,],[74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,74,]),'FALSE':([51,52,65,66,67,68,69,76,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,118,119,127,131,157,163,164,],[75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,]),'DOT':([63,],[90,]),'THEN':([71,72,73,74,75,77,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,161,162,],[99,-58,-59,-60,-61,-63,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,-64,-65,]),'PLUS':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[100,-58,-59,-60,-61,-63,100,100,100,100,100,-44,-45,-46,-47,-48,-49,100,100,100,100,100,100,100,100,-62,100,100,100,100,100,-64,-65,100,100,100,]),'MINUS':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[101,-58,-59,-60,-61,-63,101,101,101,101,101,-44,-45,-46,-47,-48,-49,101,101,101,101,101,101,101,101,-62,101,101,101,101,101,-64,-65,101,101,101,]),'TIMES':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[102,-58,-59,-60,-61,-63,102,102,102,102,102,102,102,-46,-47,-48,-49,102,102,102,102,102,102,102,102,-62,102,102,102,102,102,-64,-65,102,102,102,]),'DIV':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[103,-58,-59,-60,-61,-63,103,103,103,103,103,103,103,-46,-47,-48,-49,103,103,103,103,103,103,103,103,-62,103,103,103,103,103,-64,-65,103,103,103,]),'SLASH':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[104,-58,-59,-60,-61,-63,104,104,104,104,104,104,104,-46,-47,-48,-49,104,104,104,104,104,104,104,104,-62,104,104,104,104,104,-64,-65,104,104,104,]),'MOD':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[105,-58,-59,-60,-61,-63,105,105,105,105,105,105,105,-46,-47,-48,-49,105,105,105,105,105,105,105,105,-62,105,105,105,105,105,-64,-65,105,105,105,]),'EQ':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[106,-58,-59,-60,-61,-63,106,106,106,106,106,-44,-45,-46,-47,-48,-49,None,None,None,None,None,None,106,106,-62,106,106,106,106,106,-64,-65,106,106,106,]),'NEQ':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[107,-58,-59,-60,-61,-63,107,107,107,107,107,-44,-45,-46,-47,-48,-49,None,None,None,None,None,None,107,107,-62,107,107,107,107,107,-64,-65,107,107,107,]),'LT':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[108,-58,-59,-60,-61,-63,108,108,108,108,108,-44,-45,-46,-47,-48,-49,None,None,None,None,None,None,108,108,-62,108,108,108,108,108,-64,-65,108,108,108,]),'LE':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[109,-58,-59,-60,-61,-63,109,109,109,109,109,-44,-45,-46,-47,-48,-49,None,None,None,None,None,None,109,109,-62,109,109,109,109,109,-64,-65,109,109,109,]),'GT':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[110,-58,-59,-60,-61,-63,110,110,110,110,110,-44,-45,-46,-47,-48,-49,None,None,None,None,None,None,110,110,-62,110,110,110,110,110,-64,-65,110,110,110,]),'GE':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[111,-58,-59,-60,-61,-63,111,111,111,111,111,-44,-45,-46,-47,-48,-49,None,None,None,None,None,None,111,111,-62,111,111,111,111,111,-64,-65,111,111,111,]),'AND':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[112,-58,-59,-60,-61,-63,112,112,112,112,112,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,112,-62,112,112,112,112,112,-64,-65,112,112,112,]),'OR':([71,72,73,74,75,77,78,92,93,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,152,158,159,161,162,166,169,170,],[113,-58,-59,-60,-61,-63,113,113,113,113,113,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,113,113,113,113,113,-64,-65,113,113,113,]),'DO':([72,73,74,75,77,78,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,161,162,169,170,],[-58,-59,-60,-61,-63,117,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,-64,-65,173,174,]),'RBRACKET':([72,73,74,75,77,93,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,156,159,161,162,],[-58,-59,-60,-61,-63,125,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,162,165,167,-64,-65,]),'TO':([72,73,74,75,77,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,152,161,162,],[-58,-59,-60,-61,-63,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,163,-64,-65,]),'DOWNTO':([72,73,74,75,77,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,152,161,162,],[-58,-59,-60,-61,-63,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-57,-62,164,-64,-65,]),'RANGE':([88,],[124,]),'OF':([165,],[171,]),}
+_lr_action_items = {'PROGRAM':([0,],[3,]),'$end':([1,100,],[0,-1,]),'VAR':([2,4,7,8,9,13,15,16,17,20,24,36,67,90,91,96,97,172,],[5,-18,5,-3,-5,-2,-17,5,5,-6,-8,-9,-7,-19,-20,-22,-10,-21,]),'FUNCTION':([2,4,7,8,9,13,15,20,24,36,67,90,91,97,],[-4,-18,18,-3,-5,-2,-17,-6,-8,-9,-7,-19,-20,-10,]),'PROCEDURE':([2,4,7,8,9,13,15,20,24,36,67,90,91,97,],[-4,-18,19,-3,-5,-2,-17,-6,-8,-9,-7,-19,-20,-10,]),'BEGIN':([2,4,7,8,9,13,14,15,16,17,20,24,25,26,27,28,36,38,59,67,72,90,91,96,97,109,127,172,179,185,187,204,205,],[-4,-18,-4,-3,-5,-2,25,-17,-4,-4,-6,-8,38,38,-28,38,-9,38,38,-7,38,-19,-20,-22,-10,38,38,-21,38,38,38,38,38,]),'ID':([3,5,8,9,18,19,20,23,24,25,36,38,57,58,59,60,61,65,67,72,73,74,75,76,77,78,84,97,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,127,128,129,133,138,142,176,179,182,183,185,187,204,205,],[6,12,12,-5,29,30,-6,37,-8,53,-9,53,85,85,53,88,85,12,-7,53,85,85,85,85,85,108,85,-10,53,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,53,85,85,12,85,85,85,53,85,85,53,53,53,53,]),'error':([5,8,9,10,12,20,24,25,31,32,33,34,36,37,38,59,67,72,97,109,127,179,185,187,204,205,207,],[11,11,-5,22,-11,-6,-8,52,68,-13,-14,-15,-9,-12,52,52,-7,52,-10,52,52,52,52,52,52,52,-16,]),'SEMICOLON':([6,11,22,25,30,31,32,33,34,38,40,41,42,43,44,45,46,47,48,49,50,51,52,59,62,63,66,68,70,72,80,81,82,83,85,87,93,94,99,101,102,109,127,130,131,132,137,139,140,141,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,161,162,164,165,173,174,179,180,181,184,185,186,187,192,194,197,198,199,203,204,205,206,207,208,209,],[13,24,36,-42,-24,67,-13,-14,-15,-42,72,-30,-32,-33,-34,-35,-36,-37,-38,-39,-40,-41,-43,-42,90,91,96,97,72,-42,-63,-64,-65,-66,-68,72,133,-25,-46,-31,-47,-42,-42,-85,172,-23,-45,-71,-72,-73,-75,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-77,-44,186,-82,-26,-27,-42,-69,-70,-80,-42,-85,-42,-48,-76,72,-83,-84,-74,-42,-42,-81,-16,-78,-79,]),'COLON':([10,12,29,37,64,95,132,166,167,168,169,171,190,200,201,],[21,-11,-24,-12,92,134,-23,187,-86,-88,-90,-92,-91,-87,-89,]),'COMMA':([10,12,37,80,81,82,83,85,95,104,105,106,107,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,159,166,167,168,169,171,177,180,181,190,200,201,],[23,-11,-12,-63,-64,-65,-66,-68,23,138,-93,138,138,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,138,188,-86,-88,-90,-92,-94,-69,-70,-91,-87,-89,]),'INTEGER':([21,92,134,202,],[32,32,32,32,]),'BOOLEAN':([21,92,134,202,],[33,33,33,33,]),'STRING':([21,92,134,202,],[34,34,34,34,]),'ARRAY':([21,92,134,202,],[35,35,35,35,]),'END':([25,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,70,72,80,81,82,83,85,99,101,102,109,127,130,137,139,140,141,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,161,162,164,165,179,180,181,184,185,186,187,192,194,197,198,199,203,204,205,206,208,209,],[-42,-42,71,-29,-30,-32,-33,-34,-35,-36,-37,-38,-39,-40,-41,-43,99,-42,-63,-64,-65,-66,-68,-46,-31,-47,-42,-42,-85,-45,-71,-72,-73,-75,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-77,-44,184,-82,-42,-69,-70,-80,-42,-85,-42,-48,-76,206,-83,-84,-74,-42,-42,-81,-78,-79,]),'WRITELN':([25,38,59,72,109,127,179,185,187,204,205,],[54,54,54,54,54,54,54,54,54,54,54,]),'WRITE':([25,38,59,72,109,127,179,185,187,204,205,],[55,55,55,55,55,55,55,55,55,55,55,]),'READLN':([25,38,59,72,109,127,179,185,187,204,205,],[56,56,56,56,56,56,56,56,56,56,56,]),'IF':([25,38,59,72,109,127,179,185,187,204,205,],[57,57,57,57,57,57,57,57,57,57,57,]),'WHILE':([25,38,59,72,109,127,179,185,187,204,205,],[58,58,58,58,58,58,58,58,58,58,58,]),'REPEAT':([25,38,59,72,109,127,179,185,187,204,205,],[59,59,59,59,59,59,59,59,59,59,59,]),'FOR':([25,38,59,72,109,127,179,185,187,204,205,],[60,60,60,60,60,60,60,60,60,60,60,]),'CASE':([25,38,59,72,109,127,179,185,187,204,205,],[61,61,61,61,61,61,61,61,61,61,61,]),'LPAREN':([29,30,53,54,55,56,57,58,61,73,74,75,76,77,84,85,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,128,129,138,142,176,182,183,],[65,65,75,76,77,78,84,84,84,84,84,84,84,84,84,125,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,]),'RPAREN':([32,33,34,80,81,82,83,85,93,94,104,105,106,107,108,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,159,173,174,177,180,181,193,207,],[-13,-14,-15,-63,-64,-65,-66,-68,132,-25,137,-93,139,140,141,158,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,180,-26,-27,-94,-69,-70,203,-16,]),'LBRACKET':([35,53,85,108,],[69,74,126,142,]),'UNTIL':([41,42,43,44,45,46,47,48,49,50,51,52,59,72,80,81,82,83,85,87,99,101,102,109,127,137,139,140,141,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,161,162,179,180,181,184,192,194,203,204,205,206,208,209,],[-30,-32,-33,-34,-35,-36,-37,-38,-39,-40,-41,-43,-42,-42,-63,-64,-65,-66,-68,128,-46,-31,-47,-42,-42,-45,-71,-72,-73,-75,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-77,-44,-42,-69,-70,-80,-48,-76,-74,-42,-42,-81,-78,-79,]),'ELSE':([42,43,44,45,46,47,48,49,50,51,52,80,81,82,83,85,99,102,109,127,130,137,139,140,141,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,161,162,164,165,179,180,181,184,186,187,192,194,198,199,203,204,205,206,208,209,],[-32,-33,-34,-35,-36,-37,-38,-39,-40,-41,-43,-63,-64,-65,-66,-68,-46,-47,-42,-42,-85,-45,-71,-72,-73,179,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-77,-44,185,-82,-42,-69,-70,-80,-85,-42,-48,-76,-83,-84,-74,-42,-42,-81,-78,-79,]),'ASSIGN':([53,88,136,],[73,129,176,]),'NUM':([57,58,61,69,73,74,75,76,77,84,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,128,129,130,135,138,142,170,176,182,183,186,188,189,],[80,80,80,98,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,169,175,80,80,190,80,80,80,169,169,169,]),'STRING_LITERAL':([57,58,61,73,74,75,76,77,84,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,128,129,130,138,142,176,182,183,186,188,189,],[81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,171,81,81,81,81,81,171,171,171,]),'TRUE':([57,58,61,73,74,75,76,77,84,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,128,129,138,142,176,182,183,],[82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,]),'FALSE':([57,58,61,73,74,75,76,77,84,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,128,129,138,142,176,182,183,],[83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,]),'DOT':([71,],[100,]),'THEN':([79,80,81,82,83,85,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,180,181,],[109,-63,-64,-65,-66,-68,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-69,-70,]),'PLUS':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[110,-63,-64,-65,-66,-68,110,110,110,110,110,110,-49,-50,-51,-52,-53,-54,110,110,110,110,110,110,110,110,-67,110,110,110,110,110,-69,-70,110,110,110,]),'MINUS':([79,80,81,82,83,85,86,89,102,103,105,124,130,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,186,188,189,192,195,196,],[111,-63,-64,-65,-66,-68,111,111,111,111,111,111,170,-49,-50,-51,-52,-53,-54,111,111,111,111,111,111,111,111,-67,111,111,111,111,111,-69,-70,170,170,170,111,111,111,]),'TIMES':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[112,-63,-64,-65,-66,-68,112,112,112,112,112,112,112,112,-51,-52,-53,-54,112,112,112,112,112,112,112,112,-67,112,112,112,112,112,-69,-70,112,112,112,]),'DIV':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[113,-63,-64,-65,-66,-68,113,113,113,113,113,113,113,113,-51,-52,-53,-54,113,113,113,113,113,113,113,113,-67,113,113,113,113,113,-69,-70,113,113,113,]),'SLASH':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[114,-63,-64,-65,-66,-68,114,114,114,114,114,114,114,114,-51,-52,-53,-54,114,114,114,114,114,114,114,114,-67,114,114,114,114,114,-69,-70,114,114,114,]),'MOD':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[115,-63,-64,-65,-66,-68,115,115,115,115,115,115,115,115,-51,-52,-53,-54,115,115,115,115,115,115,115,115,-67,115,115,115,115,115,-69,-70,115,115,115,]),'EQ':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[116,-63,-64,-65,-66,-68,116,116,116,116,116,116,-49,-50,-51,-52,-53,-54,None,None,None,None,None,None,116,116,-67,116,116,116,116,116,-69,-70,116,116,116,]),'NEQ':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[117,-63,-64,-65,-66,-68,117,117,117,117,117,117,-49,-50,-51,-52,-53,-54,None,None,None,None,None,None,117,117,-67,117,117,117,117,117,-69,-70,117,117,117,]),'LT':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[118,-63,-64,-65,-66,-68,118,118,118,118,118,118,-49,-50,-51,-52,-53,-54,None,None,None,None,None,None,118,118,-67,118,118,118,118,118,-69,-70,118,118,118,]),'LE':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[119,-63,-64,-65,-66,-68,119,119,119,119,119,119,-49,-50,-51,-52,-53,-54,None,None,None,None,None,None,119,119,-67,119,119,119,119,119,-69,-70,119,119,119,]),'GT':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[120,-63,-64,-65,-66,-68,120,120,120,120,120,120,-49,-50,-51,-52,-53,-54,None,None,None,None,None,None,120,120,-67,120,120,120,120,120,-69,-70,120,120,120,]),'GE':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[121,-63,-64,-65,-66,-68,121,121,121,121,121,121,-49,-50,-51,-52,-53,-54,None,None,None,None,None,None,121,121,-67,121,121,121,121,121,-69,-70,121,121,121,]),'AND':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[122,-63,-64,-65,-66,-68,122,122,122,122,122,122,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,122,-67,122,122,122,122,122,-69,-70,122,122,122,]),'OR':([79,80,81,82,83,85,86,89,102,103,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,162,163,177,178,180,181,192,195,196,],[123,-63,-64,-65,-66,-68,123,123,123,123,123,123,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,123,123,123,123,123,-69,-70,123,123,123,]),'DO':([80,81,82,83,85,86,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,180,181,195,196,],[-63,-64,-65,-66,-68,127,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-69,-70,204,205,]),'OF':([80,81,82,83,85,89,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,180,181,191,],[-63,-64,-65,-66,-68,130,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,-69,-70,202,]),'RBRACKET':([80,81,82,83,85,103,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,160,175,178,180,181,],[-63,-64,-65,-66,-68,136,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,181,191,193,-69,-70,]),'TO':([80,81,82,83,85,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,163,180,181,],[-63,-64,-65,-66,-68,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,182,-69,-70,]),'DOWNTO':([80,81,82,83,85,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,163,180,181,],[-63,-64,-65,-66,-68,-49,-50,-51,-52,-53,-54,-55,-56,-57,-58,-59,-60,-61,-62,-67,183,-69,-70,]),'RANGE':([98,168,169,171,190,],[135,189,-90,-92,-91,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'header':([0,],[2,]),'declarations':([2,7,15,16,],[4,13,24,24,]),'subprograms':([4,],[7,]),'var_list':([5,],[8,]),'var_line':([5,8,],[9,19,]),'id_list':([5,8,58,122,],[10,10,86,86,]),'subprogram':([7,],[14,]),'func_head':([7,],[15,]),'proc_head':([7,],[16,]),'vars_local':([15,16,],[23,25,]),'type_def':([20,83,123,171,],[28,120,155,175,]),'block':([22,],[35,]),'statements':([22,34,53,],[36,62,79,]),'statement':([22,34,53,64,99,117,160,173,174,],[37,37,37,91,132,150,168,176,177,]),'assignment':([22,34,53,64,99,117,160,173,174,],[38,38,38,38,38,38,38,38,38,]),'write_stmt':([22,34,53,64,99,117,160,173,174,],[39,39,39,39,39,39,39,39,39,]),'read_stmt':([22,34,53,64,99,117,160,173,174,],[40,40,40,40,40,40,40,40,40,]),'if_stmt':([22,34,53,64,99,117,160,173,174,],[41,41,41,41,41,41,41,41,41,]),'while_stmt':([22,34,53,64,99,117,160,173,174,],[42,42,42,42,42,42,42,42,42,]),'repeat_stmt':([22,34,53,64,99,117,160,173,174,],[43,43,43,43,43,43,43,43,43,]),'for_stmt':([22,34,53,64,99,117,160,173,174,],[44,44,44,44,44,44,44,44,44,]),'func_call_stmt':([22,34,53,64,99,117,160,173,174,],[45,45,45,45,45,45,45,45,45,]),'compound_stmt':([22,23,25,34,53,64,99,117,160,173,174,],[46,55,56,46,46,46,46,46,46,46,46,]),'args_decl':([26,27,],[57,59,]),'expression':([51,52,65,66,67,68,69,76,100,101,102,103,104,105,106,107,108,109,110,111,112,113,115,116,118,119,127,131,157,163,164,],[71,78,92,93,95,95,95,114,133,134,135,136,137,138,139,140,141,142,143,144,145,146,95,149,151,152,158,159,166,169,170,]),'arg_list':([58,],[84,]),'arg_item':([58,122,],[85,154,]),'expr_list':([67,68,69,115,],[94,96,97,148,]),}
+_lr_goto_items = {'program':([0,],[1,]),'header':([0,],[2,]),'declarations':([2,7,16,17,],[4,14,27,27,]),'subprograms':([4,],[7,]),'var_list':([5,],[8,]),'var_line':([5,8,],[9,20,]),'id_list':([5,8,65,133,],[10,10,95,95,]),'subprogram':([7,],[15,]),'func_head':([7,],[16,]),'proc_head':([7,],[17,]),'vars_local':([16,17,],[26,28,]),'type_def':([21,92,134,202,],[31,131,174,207,]),'block':([25,],[39,]),'statements':([25,38,59,185,],[40,70,87,197,]),'statement':([25,38,59,72,109,127,179,185,187,204,205,],[41,41,41,101,143,161,194,41,199,208,209,]),'assignment':([25,38,59,72,109,127,179,185,187,204,205,],[42,42,42,42,42,42,42,42,42,42,42,]),'write_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[43,43,43,43,43,43,43,43,43,43,43,]),'read_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[44,44,44,44,44,44,44,44,44,44,44,]),'if_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[45,45,45,45,45,45,45,45,45,45,45,]),'while_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[46,46,46,46,46,46,46,46,46,46,46,]),'repeat_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[47,47,47,47,47,47,47,47,47,47,47,]),'for_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[48,48,48,48,48,48,48,48,48,48,48,]),'case_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[49,49,49,49,49,49,49,49,49,49,49,]),'func_call_stmt':([25,38,59,72,109,127,179,185,187,204,205,],[50,50,50,50,50,50,50,50,50,50,50,]),'compound_stmt':([25,26,28,38,59,72,109,127,179,185,187,204,205,],[51,62,63,51,51,51,51,51,51,51,51,51,51,]),'args_decl':([29,30,],[64,66,]),'expression':([57,58,61,73,74,75,76,77,84,110,111,112,113,114,115,116,117,118,119,120,121,122,123,125,126,128,129,138,142,176,182,183,],[79,86,89,102,103,105,105,105,124,144,145,146,147,148,149,150,151,152,153,154,155,156,157,105,160,162,163,177,178,192,195,196,]),'arg_list':([65,],[93,]),'arg_item':([65,133,],[94,173,]),'expr_list':([75,76,77,125,],[104,106,107,159,]),'case_list':([130,],[164,]),'case_item':([130,186,],[165,198,]),'case_labels':([130,186,],[166,166,]),'case_label':([130,186,188,],[167,167,200,]),'case_const':([130,186,188,189,],[168,168,168,201,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,80 +27,98 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> header declarations subprograms declarations BEGIN block END DOT','program',8,'p_program','parser.py',302),
-  ('header -> PROGRAM ID SEMICOLON','header',3,'p_header','parser.py',314),
-  ('declarations -> VAR var_list','declarations',2,'p_declarations','parser.py',318),
-  ('declarations -> <empty>','declarations',0,'p_declarations','parser.py',319),
-  ('var_list -> var_line','var_list',1,'p_var_list','parser.py',323),
-  ('var_list -> var_list var_line','var_list',2,'p_var_list','parser.py',324),
-  ('var_line -> id_list COLON type_def SEMICOLON','var_line',4,'p_var_line','parser.py',328),
-  ('id_list -> ID','id_list',1,'p_id_list','parser.py',332),
-  ('id_list -> id_list COMMA ID','id_list',3,'p_id_list','parser.py',333),
-  ('type_def -> INTEGER','type_def',1,'p_type_def','parser.py',337),
-  ('type_def -> BOOLEAN','type_def',1,'p_type_def','parser.py',338),
-  ('type_def -> STRING','type_def',1,'p_type_def','parser.py',339),
-  ('type_def -> ARRAY LBRACKET NUM RANGE NUM RBRACKET OF type_def','type_def',8,'p_type_def','parser.py',340),
-  ('subprograms -> subprograms subprogram','subprograms',2,'p_subprograms','parser.py',345),
-  ('subprograms -> <empty>','subprograms',0,'p_subprograms','parser.py',346),
-  ('subprogram -> func_head vars_local compound_stmt SEMICOLON','subprogram',4,'p_subprogram','parser.py',350),
-  ('subprogram -> proc_head vars_local compound_stmt SEMICOLON','subprogram',4,'p_subprogram','parser.py',351),
-  ('func_head -> FUNCTION ID args_decl COLON type_def SEMICOLON','func_head',6,'p_func_head','parser.py',358),
-  ('proc_head -> PROCEDURE ID args_decl SEMICOLON','proc_head',4,'p_proc_head','parser.py',366),
-  ('args_decl -> LPAREN arg_list RPAREN','args_decl',3,'p_args_decl','parser.py',374),
-  ('args_decl -> <empty>','args_decl',0,'p_args_decl','parser.py',375),
-  ('arg_list -> arg_item','arg_list',1,'p_arg_list','parser.py',379),
-  ('arg_list -> arg_list SEMICOLON arg_item','arg_list',3,'p_arg_list','parser.py',380),
-  ('arg_item -> id_list COLON type_def','arg_item',3,'p_arg_item','parser.py',384),
-  ('vars_local -> declarations','vars_local',1,'p_vars_local','parser.py',388),
-  ('block -> statements','block',1,'p_block','parser.py',392),
-  ('statements -> statement','statements',1,'p_statements','parser.py',396),
-  ('statements -> statements SEMICOLON statement','statements',3,'p_statements','parser.py',397),
-  ('statement -> assignment','statement',1,'p_statement','parser.py',401),
-  ('statement -> write_stmt','statement',1,'p_statement','parser.py',402),
-  ('statement -> read_stmt','statement',1,'p_statement','parser.py',403),
-  ('statement -> if_stmt','statement',1,'p_statement','parser.py',404),
-  ('statement -> while_stmt','statement',1,'p_statement','parser.py',405),
-  ('statement -> repeat_stmt','statement',1,'p_statement','parser.py',406),
-  ('statement -> for_stmt','statement',1,'p_statement','parser.py',407),
-  ('statement -> func_call_stmt','statement',1,'p_statement','parser.py',408),
-  ('statement -> compound_stmt','statement',1,'p_statement','parser.py',409),
-  ('statement -> <empty>','statement',0,'p_statement','parser.py',410),
-  ('repeat_stmt -> REPEAT statements UNTIL expression','repeat_stmt',4,'p_repeat_stmt','parser.py',414),
-  ('func_call_stmt -> ID LPAREN expr_list RPAREN','func_call_stmt',4,'p_func_call_stmt','parser.py',418),
-  ('compound_stmt -> BEGIN statements END','compound_stmt',3,'p_compound_stmt','parser.py',422),
-  ('assignment -> ID ASSIGN expression','assignment',3,'p_assignment','parser.py',426),
-  ('assignment -> ID LBRACKET expression RBRACKET ASSIGN expression','assignment',6,'p_assignment','parser.py',427),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',433),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',434),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',435),
-  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parser.py',436),
-  ('expression -> expression SLASH expression','expression',3,'p_expression_binop','parser.py',437),
-  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',438),
-  ('expression -> expression EQ expression','expression',3,'p_expression_binop','parser.py',439),
-  ('expression -> expression NEQ expression','expression',3,'p_expression_binop','parser.py',440),
-  ('expression -> expression LT expression','expression',3,'p_expression_binop','parser.py',441),
-  ('expression -> expression LE expression','expression',3,'p_expression_binop','parser.py',442),
-  ('expression -> expression GT expression','expression',3,'p_expression_binop','parser.py',443),
-  ('expression -> expression GE expression','expression',3,'p_expression_binop','parser.py',444),
-  ('expression -> expression AND expression','expression',3,'p_expression_binop','parser.py',445),
-  ('expression -> expression OR expression','expression',3,'p_expression_binop','parser.py',446),
-  ('expression -> NUM','expression',1,'p_expression_atoms','parser.py',451),
-  ('expression -> STRING_LITERAL','expression',1,'p_expression_atoms','parser.py',452),
-  ('expression -> TRUE','expression',1,'p_expression_atoms','parser.py',453),
-  ('expression -> FALSE','expression',1,'p_expression_atoms','parser.py',454),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_atoms','parser.py',455),
-  ('expression -> ID','expression',1,'p_expression_call_or_var','parser.py',471),
-  ('expression -> ID LPAREN expr_list RPAREN','expression',4,'p_expression_call_or_var','parser.py',472),
-  ('expression -> ID LBRACKET expression RBRACKET','expression',4,'p_expression_call_or_var','parser.py',473),
-  ('write_stmt -> WRITELN LPAREN expr_list RPAREN','write_stmt',4,'p_io','parser.py',487),
-  ('write_stmt -> WRITE LPAREN expr_list RPAREN','write_stmt',4,'p_io','parser.py',488),
-  ('read_stmt -> READLN LPAREN ID RPAREN','read_stmt',4,'p_read','parser.py',492),
-  ('read_stmt -> READLN LPAREN ID LBRACKET expression RBRACKET RPAREN','read_stmt',7,'p_read','parser.py',493),
-  ('if_stmt -> IF expression THEN statement','if_stmt',4,'p_control','parser.py',499),
-  ('if_stmt -> IF expression THEN statement ELSE statement','if_stmt',6,'p_control','parser.py',500),
-  ('while_stmt -> WHILE expression DO statement','while_stmt',4,'p_while','parser.py',504),
-  ('for_stmt -> FOR ID ASSIGN expression TO expression DO statement','for_stmt',8,'p_for','parser.py',508),
-  ('for_stmt -> FOR ID ASSIGN expression DOWNTO expression DO statement','for_stmt',8,'p_for','parser.py',509),
-  ('expr_list -> expression','expr_list',1,'p_expr_list','parser.py',513),
-  ('expr_list -> expr_list COMMA expression','expr_list',3,'p_expr_list','parser.py',514),
+  ('program -> header declarations subprograms declarations BEGIN block END DOT','program',8,'p_program','parser.py',26),
+  ('header -> PROGRAM ID SEMICOLON','header',3,'p_header','parser.py',30),
+  ('declarations -> VAR var_list','declarations',2,'p_declarations','parser.py',34),
+  ('declarations -> <empty>','declarations',0,'p_declarations','parser.py',35),
+  ('var_list -> var_line','var_list',1,'p_var_list','parser.py',39),
+  ('var_list -> var_list var_line','var_list',2,'p_var_list','parser.py',40),
+  ('var_line -> id_list COLON type_def SEMICOLON','var_line',4,'p_var_line','parser.py',44),
+  ('var_line -> error SEMICOLON','var_line',2,'p_var_line_error','parser.py',48),
+  ('var_line -> id_list error SEMICOLON','var_line',3,'p_var_line_error','parser.py',49),
+  ('var_line -> id_list COLON type_def error SEMICOLON','var_line',5,'p_var_line_error','parser.py',50),
+  ('id_list -> ID','id_list',1,'p_id_list','parser.py',57),
+  ('id_list -> id_list COMMA ID','id_list',3,'p_id_list','parser.py',58),
+  ('type_def -> INTEGER','type_def',1,'p_type_def','parser.py',63),
+  ('type_def -> BOOLEAN','type_def',1,'p_type_def','parser.py',64),
+  ('type_def -> STRING','type_def',1,'p_type_def','parser.py',65),
+  ('type_def -> ARRAY LBRACKET NUM RANGE NUM RBRACKET OF type_def','type_def',8,'p_type_def','parser.py',66),
+  ('subprograms -> subprograms subprogram','subprograms',2,'p_subprograms','parser.py',71),
+  ('subprograms -> <empty>','subprograms',0,'p_subprograms','parser.py',72),
+  ('subprogram -> func_head vars_local compound_stmt SEMICOLON','subprogram',4,'p_subprogram','parser.py',77),
+  ('subprogram -> proc_head vars_local compound_stmt SEMICOLON','subprogram',4,'p_subprogram','parser.py',78),
+  ('func_head -> FUNCTION ID args_decl COLON type_def SEMICOLON','func_head',6,'p_func_head','parser.py',87),
+  ('proc_head -> PROCEDURE ID args_decl SEMICOLON','proc_head',4,'p_proc_head','parser.py',97),
+  ('args_decl -> LPAREN arg_list RPAREN','args_decl',3,'p_args_decl','parser.py',107),
+  ('args_decl -> <empty>','args_decl',0,'p_args_decl','parser.py',108),
+  ('arg_list -> arg_item','arg_list',1,'p_arg_list','parser.py',112),
+  ('arg_list -> arg_list SEMICOLON arg_item','arg_list',3,'p_arg_list','parser.py',113),
+  ('arg_item -> id_list COLON type_def','arg_item',3,'p_arg_item','parser.py',118),
+  ('vars_local -> declarations','vars_local',1,'p_vars_local','parser.py',122),
+  ('block -> statements','block',1,'p_block','parser.py',126),
+  ('statements -> statement','statements',1,'p_statements','parser.py',130),
+  ('statements -> statements SEMICOLON statement','statements',3,'p_statements','parser.py',131),
+  ('statement -> assignment','statement',1,'p_statement','parser.py',136),
+  ('statement -> write_stmt','statement',1,'p_statement','parser.py',137),
+  ('statement -> read_stmt','statement',1,'p_statement','parser.py',138),
+  ('statement -> if_stmt','statement',1,'p_statement','parser.py',139),
+  ('statement -> while_stmt','statement',1,'p_statement','parser.py',140),
+  ('statement -> repeat_stmt','statement',1,'p_statement','parser.py',141),
+  ('statement -> for_stmt','statement',1,'p_statement','parser.py',142),
+  ('statement -> case_stmt','statement',1,'p_statement','parser.py',143),
+  ('statement -> func_call_stmt','statement',1,'p_statement','parser.py',144),
+  ('statement -> compound_stmt','statement',1,'p_statement','parser.py',145),
+  ('statement -> <empty>','statement',0,'p_statement','parser.py',146),
+  ('statement -> error','statement',1,'p_statement_error','parser.py',150),
+  ('repeat_stmt -> REPEAT statements UNTIL expression','repeat_stmt',4,'p_repeat_stmt','parser.py',154),
+  ('func_call_stmt -> ID LPAREN expr_list RPAREN','func_call_stmt',4,'p_func_call_stmt','parser.py',158),
+  ('compound_stmt -> BEGIN statements END','compound_stmt',3,'p_compound_stmt','parser.py',162),
+  ('assignment -> ID ASSIGN expression','assignment',3,'p_assignment','parser.py',166),
+  ('assignment -> ID LBRACKET expression RBRACKET ASSIGN expression','assignment',6,'p_assignment','parser.py',167),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',173),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',174),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',175),
+  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parser.py',176),
+  ('expression -> expression SLASH expression','expression',3,'p_expression_binop','parser.py',177),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',178),
+  ('expression -> expression EQ expression','expression',3,'p_expression_binop','parser.py',179),
+  ('expression -> expression NEQ expression','expression',3,'p_expression_binop','parser.py',180),
+  ('expression -> expression LT expression','expression',3,'p_expression_binop','parser.py',181),
+  ('expression -> expression LE expression','expression',3,'p_expression_binop','parser.py',182),
+  ('expression -> expression GT expression','expression',3,'p_expression_binop','parser.py',183),
+  ('expression -> expression GE expression','expression',3,'p_expression_binop','parser.py',184),
+  ('expression -> expression AND expression','expression',3,'p_expression_binop','parser.py',185),
+  ('expression -> expression OR expression','expression',3,'p_expression_binop','parser.py',186),
+  ('expression -> NUM','expression',1,'p_expression_atoms','parser.py',191),
+  ('expression -> STRING_LITERAL','expression',1,'p_expression_atoms','parser.py',192),
+  ('expression -> TRUE','expression',1,'p_expression_atoms','parser.py',193),
+  ('expression -> FALSE','expression',1,'p_expression_atoms','parser.py',194),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_atoms','parser.py',195),
+  ('expression -> ID','expression',1,'p_expression_call_or_var','parser.py',211),
+  ('expression -> ID LPAREN expr_list RPAREN','expression',4,'p_expression_call_or_var','parser.py',212),
+  ('expression -> ID LBRACKET expression RBRACKET','expression',4,'p_expression_call_or_var','parser.py',213),
+  ('write_stmt -> WRITELN LPAREN expr_list RPAREN','write_stmt',4,'p_io','parser.py',228),
+  ('write_stmt -> WRITE LPAREN expr_list RPAREN','write_stmt',4,'p_io','parser.py',229),
+  ('read_stmt -> READLN LPAREN ID RPAREN','read_stmt',4,'p_read','parser.py',233),
+  ('read_stmt -> READLN LPAREN ID LBRACKET expression RBRACKET RPAREN','read_stmt',7,'p_read','parser.py',234),
+  ('if_stmt -> IF expression THEN statement','if_stmt',4,'p_control','parser.py',240),
+  ('if_stmt -> IF expression THEN statement ELSE statement','if_stmt',6,'p_control','parser.py',241),
+  ('while_stmt -> WHILE expression DO statement','while_stmt',4,'p_while','parser.py',245),
+  ('for_stmt -> FOR ID ASSIGN expression TO expression DO statement','for_stmt',8,'p_for','parser.py',249),
+  ('for_stmt -> FOR ID ASSIGN expression DOWNTO expression DO statement','for_stmt',8,'p_for','parser.py',250),
+  ('case_stmt -> CASE expression OF case_list END','case_stmt',5,'p_case','parser.py',254),
+  ('case_stmt -> CASE expression OF case_list ELSE statements END','case_stmt',7,'p_case','parser.py',255),
+  ('case_list -> case_item','case_list',1,'p_case_list','parser.py',261),
+  ('case_list -> case_list SEMICOLON case_item','case_list',3,'p_case_list','parser.py',262),
+  ('case_item -> case_labels COLON statement','case_item',3,'p_case_item','parser.py',267),
+  ('case_item -> <empty>','case_item',0,'p_case_item','parser.py',268),
+  ('case_labels -> case_label','case_labels',1,'p_case_labels','parser.py',272),
+  ('case_labels -> case_labels COMMA case_label','case_labels',3,'p_case_labels','parser.py',273),
+  ('case_label -> case_const','case_label',1,'p_case_label','parser.py',278),
+  ('case_label -> case_const RANGE case_const','case_label',3,'p_case_label','parser.py',279),
+  ('case_const -> NUM','case_const',1,'p_case_const','parser.py',283),
+  ('case_const -> MINUS NUM','case_const',2,'p_case_const','parser.py',284),
+  ('case_const -> STRING_LITERAL','case_const',1,'p_case_const','parser.py',285),
+  ('expr_list -> expression','expr_list',1,'p_expr_list','parser.py',292),
+  ('expr_list -> expr_list COMMA expression','expr_list',3,'p_expr_list','parser.py',293),
 ]
@@ -0,0 +1,180 @@
+# ==============================================================================
+# OTIMIZADOR PEEPHOLE (-O1)
+# Trabalha sobre a lista estruturada de instruções do CodeGen, i.e. pares
+# (opcode, operando) com as labels como ('label', nome), e aplica as regras
+# ativas até não haver mais alterações.
+#
+#   jump-next        jump L seguido de L:                -> (removido)
+#   jump-chain       jump/jz L onde L: jump M            -> jump/jz M
+#   dead-after-jump  código entre jump/return/stop e a próxima label é removido
+#   store-load       storeg k; pushg k                   -> dup 1; storeg k
+#   const-fold       pushi a; pushi b; add/sub/...       -> pushi (a op b)
+#   identity         pushi 0; add|sub  /  pushi 1; mul|div -> (removido)
+#   neq-jz           pushi c; equal; not; jz L           -> pushi c; sub; jz L
+#   const-jz         pushi 0; jz L  /  pushi c; jz L       -> jump L  /  (removido)
+# ==============================================================================
+
+RULES = ('jump-next', 'jump-chain', 'dead-after-jump', 'store-load',
+         'const-fold', 'identity', 'neq-jz', 'const-jz')
+
+def _trunc_div(a, b):
+    q = abs(a) // abs(b)
+    return -q if (a < 0) != (b < 0) else q
+
+FOLD = {
+    'add': lambda a, b: a + b,
+    'sub': lambda a, b: a - b,
+    'mul': lambda a, b: a * b,
+    'div': _trunc_div,
+    'mod': lambda a, b: a - b * _trunc_div(a, b),
+    'equal': lambda a, b: int(a == b),
+    'inf': lambda a, b: int(a < b),
+    'sup': lambda a, b: int(a > b),
+    'infeq': lambda a, b: int(a <= b),
+    'supeq': lambda a, b: int(a >= b),
+}
+
+IDENTITY = {('add', 0), ('sub', 0), ('mul', 1), ('div', 1)}
+
+# Depois destas instruções a execução nunca passa para a seguinte
+NO_FALLTHROUGH = {'jump', 'return', 'stop'}
+
+class Peephole:
+    def __init__(self, rules=RULES):
+        unknown = set(rules) - set(RULES)
+        if unknown: raise ValueError(f"Regras peephole desconhecidas: {', '.join(sorted(unknown))}")
+        self.rules = [r for r in RULES if r in rules]
+        self.stats = {r: 0 for r in self.rules}
+        self.removed = 0
+
+    def optimize(self, code):
+        before = count_instrs(code)
+        changed = True
+        while changed:
+            changed = False
+            for rule in self.rules:
+                code, n = getattr(self, '_' + rule.replace('-', '_'))(code)
+                if n:
+                    self.stats[rule] += n
+                    changed = True
+        self.removed += before - count_instrs(code)
+        return code
+
+    # --------------------------------------------------------------------------
+    # Regras: cada uma devolve (nova lista, nº de aplicações)
+    # --------------------------------------------------------------------------
+    def _jump_next(self, code):
+        out, n = [], 0
+        for i, (op, arg) in enumerate(code):
+            if op == 'jump':
+                j = i + 1
+                while j < len(code) and code[j][0] == 'label':
+                    if code[j][1] == arg: break
+                    j += 1
+                if j < len(code) and code[j] == ('label', arg):
+                    n += 1
+                    continue
+            out.append((op, arg))
+        return out, n
+
+    def _jump_chain(self, code):
+        # label -> destino final, se a primeira instrução após a label for um jump
+        target = {}
+        for i, (op, arg) in enumerate(code):
+            if op != 'label': continue
+            j = i + 1
+            while j < len(code) and code[j][0] == 'label': j += 1
+            if j < len(code) and code[j][0] == 'jump' and code[j][1] != arg:
+                target[arg] = code[j][1]
+
+        def resolve(label):
+            seen = {label}
+            while label in target and target[label] not in seen:
+                label = target[label]
+                seen.add(label)
+            return label
+
+        out, n = [], 0
+        for op, arg in code:
+            if op in ('jump', 'jz') and arg in target:
+                new = resolve(arg)
+                if new != arg:
+                    arg = new
+                    n += 1
+            out.append((op, arg))
+        return out, n
+
+    def _dead_after_jump(self, code):
+        out, n, dead = [], 0, False
+        for op, arg in code:
+            if op == 'label':
+                dead = False
+            elif dead:
+                n += 1
+                continue
+            out.append((op, arg))
+            if op in NO_FALLTHROUGH: dead = True
+        return out, n
+
+    def _store_load(self, code):
+        out, n = [], 0
+        for op, arg in code:
+            if out and op in ('pushg', 'pushl') and out[-1] == ('store' + op[4:], arg):
+                out[-1] = ('dup', 1)
+                out.append(('store' + op[4:], arg))
+                n += 1
+                continue
+            out.append((op, arg))
+        return out, n
+
+    def _const_fold(self, code):
+        out, n = [], 0
+        for op, arg in code:
+            if len(out) >= 2 and op in FOLD and out[-1][0] == 'pushi' and out[-2][0] == 'pushi':
+                a, b = out[-2][1], out[-1][1]
+                if not (op in ('div', 'mod') and b == 0):
+                    out[-2:] = [('pushi', FOLD[op](a, b))]
+                    n += 1
+                    continue
+            if out and op == 'not' and out[-1][0] == 'pushi':
+                out[-1] = ('pushi', int(out[-1][1] == 0))
+                n += 1
+                continue
+            out.append((op, arg))
+        return out, n
+
+    def _identity(self, code):
+        out, n = [], 0
+        for op, arg in code:
+            if out and out[-1][0] == 'pushi' and (op, out[-1][1]) in IDENTITY:
+                out.pop()
+                n += 1
+                continue
+            out.append((op, arg))
+        return out, n
+
+    def _neq_jz(self, code):
+        # "x <> c; jz" salta quando x = c, o mesmo que "x - c; jz" para inteiros
+        out, n = [], 0
+        for op, arg in code:
+            if op == 'jz' and len(out) >= 3 and out[-1][0] == 'not' and \
+               out[-2][0] == 'equal' and out[-3][0] == 'pushi':
+                out[-2:] = [('sub', None)]
+                n += 1
+            out.append((op, arg))
+        return out, n
+
+    def _const_jz(self, code):
+        # condição constante (while true, if false, ...): o salto é sempre ou nunca feito
+        out, n = [], 0
+        for op, arg in code:
+            if op == 'jz' and out and out[-1][0] == 'pushi':
+                value = out.pop()[1]
+                if value == 0: out.append(('jump', arg))
+                n += 1
+                continue
+            out.append((op, arg))
+        return out, n
+
+def count_instrs(code):
+    return sum(1 for op, _ in code if op != 'label')
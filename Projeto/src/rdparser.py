@@ -0,0 +1,491 @@
+from ast_nodes import *
+from scanner import scan
+from semantics import CompileError, FuncSymbol, Symbol
+
+# ==============================================================================
+# PARSER DESCENDENTE RECURSIVO
+# Alternativa ao parser LALR do PLY (parser.py) para a mesma gramática, no
+# estilo do TP6 (um método por não-terminal, um token de lookahead) e com as
+# expressões tratadas por precedência (Pratt). Não importa o PLY nem carrega
+# parsetab.py, e lê os tokens diretamente das listas do scanner rápido.
+#
+# Produz a mesma AST e faz as mesmas chamadas à tabela de símbolos, pela mesma
+# ordem, que as ações da gramática LALR. Para que os erros também sejam os
+# mesmos, cada ação com efeitos (declarações e procuras na tabela de símbolos)
+# só corre depois de confirmar que o token seguinte pode seguir a regra, tal
+# como o LALR só reduz com um lookahead válido (conjuntos tirados da tabela
+# LALR; nenhuma destas reduções é feita por omissão).
+#
+# Selecionado com Compiler(parser='rd'), --parser rd ou PLC_PARSER=rd.
+# ==============================================================================
+
+# Operadores binários -> nível de precedência (todos associativos à esquerda,
+# exceto os relacionais, que não são associativos)
+BINARY = {
+    'OR': 1, 'AND': 2,
+    'EQ': 3, 'NEQ': 3, 'LT': 3, 'GT': 3, 'LE': 3, 'GE': 3,
+    'PLUS': 4, 'MINUS': 4,
+    'TIMES': 5, 'DIV': 5, 'MOD': 5, 'SLASH': 5,
+}
+RELATIONAL = 3
+
+# Tokens que podem seguir um comando / uma expressão (FOLLOW da gramática)
+STMT_FOLLOW = frozenset({'SEMICOLON', 'END', 'UNTIL', 'ELSE'})
+EXPR_FOLLOW = STMT_FOLLOW | frozenset(BINARY) | frozenset(
+    {'RPAREN', 'RBRACKET', 'COMMA', 'THEN', 'DO', 'TO', 'DOWNTO', 'OF'})
+HEAD_FOLLOW = frozenset({'VAR', 'BEGIN'})
+SUBPROGRAM_FOLLOW = HEAD_FOLLOW | frozenset({'FUNCTION', 'PROCEDURE'})
+VAR_FOLLOW = SUBPROGRAM_FOLLOW | frozenset({'ID'})
+
+BASIC_TYPES = frozenset({'INTEGER', 'BOOLEAN', 'STRING'})
+EOF = '$end'
+
+class RDParser:
+    def __init__(self, st):
+        self.st = st
+        self.types = self.values = self.stream = None
+        self.pos = 0
+
+    def parse(self, text, stream=None):
+        self.stream = stream or scan(text)
+        self.types = self.stream.types + [EOF]
+        self.values = self.stream.values + [None]
+        self.pos = 0
+        try:
+            return self.program()
+        finally:
+            self.report_lex_errors()
+
+    def report_lex_errors(self):
+        """ Mensagens do lexer para os tokens já lidos (o PLY imprime-as ao ler). """
+        for index, message in self.stream.errors:
+            if index > self.pos: break
+            print(message)
+
+    # --------------------------------------------------------------------------
+    # Tokens
+    # --------------------------------------------------------------------------
+    def error(self):
+        if self.types[self.pos] == EOF: raise CompileError("Erro: Fim inesperado")
+        raise CompileError(f"Erro Sintaxe: '{self.values[self.pos]}' linha {self.stream.lines[self.pos]}")
+
+    def expect(self, kind):
+        """ Consome um token do tipo kind e devolve o seu valor. """
+        pos = self.pos
+        if self.types[pos] != kind: self.error()
+        self.pos = pos + 1
+        return self.values[pos]
+
+    def follows(self, allowed):
+        """ Erro de sintaxe se o token atual não puder seguir a regra acabada de ler. """
+        if self.types[self.pos] not in allowed: self.error()
+
+    # --------------------------------------------------------------------------
+    # Programa e declarações
+    # --------------------------------------------------------------------------
+    def program(self):
+        self.expect('PROGRAM')
+        self.expect('ID')
+        self.expect('SEMICOLON')
+        decls = self.declarations()
+        subprograms = []
+        while self.types[self.pos] in ('FUNCTION', 'PROCEDURE'):
+            subprograms.append(self.subprogram())
+        self.declarations()
+        self.expect('BEGIN')
+        body = self.statements()
+        self.expect('END')
+        self.expect('DOT')
+        self.follows((EOF,))
+        return Program(decls, subprograms, Block(body))
+
+    def declarations(self):
+        if self.types[self.pos] != 'VAR': return None
+        self.pos += 1
+        while True:
+            names = self.id_list()
+            self.expect('COLON')
+            kind = self.type_def()
+            self.expect('SEMICOLON')
+            self.follows(VAR_FOLLOW)
+            for name in names: self.st.add_var(name, kind)
+            if self.types[self.pos] != 'ID': return None
+
+    def id_list(self):
+        names = [self.expect('ID')]
+        while self.types[self.pos] == 'COMMA':
+            self.pos += 1
+            names.append(self.expect('ID'))
+        return names
+
+    def type_def(self):
+        t = self.types[self.pos]
+        if t in BASIC_TYPES:
+            self.pos += 1
+            return self.values[self.pos - 1]
+        self.expect('ARRAY')
+        self.expect('LBRACKET')
+        lower = self.expect('NUM')
+        self.expect('RANGE')
+        upper = self.expect('NUM')
+        self.expect('RBRACKET')
+        self.expect('OF')
+        base = self.type_def()
+        return {'kind': 'array', 'lower': int(lower), 'size': int(upper) - int(lower) + 1, 'base': base}
+
+    def subprogram(self):
+        st = self.st
+        is_func = self.types[self.pos] == 'FUNCTION'
+        self.pos += 1
+        name = self.expect('ID')
+        args = self.args_decl()
+        ret = None
+        if is_func:
+            self.expect('COLON')
+            ret = self.type_def()
+        self.expect('SEMICOLON')
+        self.follows(HEAD_FOLLOW)
+        st.add_func(name, ret, args)
+        info = st.find_func(name)
+        st.enter_func(name, len(args))
+        for i, (n, t) in enumerate(args):
+            st.add_arg(n, t, i - len(args))
+
+        self.declarations()
+        self.expect('BEGIN')
+        body = Block(self.statements())
+        self.expect('END')
+        self.expect('SEMICOLON')
+        self.follows(SUBPROGRAM_FOLLOW)
+        locals_data = [v for v in st.locals.values() if v.offset >= 0]
+        node = SubProgramDecl(name, args, ret, locals_data, body, is_func)
+        node.scope = info
+        st.exit_func()
+        return node
+
+    def args_decl(self):
+        if self.types[self.pos] != 'LPAREN': return []
+        self.pos += 1
+        args = self.arg_item()
+        while self.types[self.pos] == 'SEMICOLON':
+            self.pos += 1
+            args.append(self.arg_item())     # (como no LALR: o grupo entra como um só elemento)
+        self.expect('RPAREN')
+        return args
+
+    def arg_item(self):
+        names = self.id_list()
+        self.expect('COLON')
+        kind = self.type_def()
+        return [(n, kind) for n in names]
+
+    # --------------------------------------------------------------------------
+    # Comandos
+    # --------------------------------------------------------------------------
+    def statements(self):
+        stmts = [self.statement()]
+        while self.types[self.pos] == 'SEMICOLON':
+            self.pos += 1
+            stmts.append(self.statement())
+        return stmts
+
+    def statement(self):
+        t = self.types[self.pos]
+        if t == 'ID': return self.id_statement()
+        if t == 'WRITELN' or t == 'WRITE':
+            newline = self.values[self.pos].upper() == 'WRITELN'
+            self.pos += 1
+            self.expect('LPAREN')
+            exprs = self.expr_list()
+            self.expect('RPAREN')
+            return Write(exprs, newline)
+        if t == 'IF':
+            self.pos += 1
+            cond = self.expression()
+            self.expect('THEN')
+            then_b = self.statement()
+            if self.types[self.pos] == 'ELSE':
+                self.pos += 1
+                return If(cond, then_b, self.statement())
+            return If(cond, then_b)
+        if t == 'WHILE':
+            self.pos += 1
+            cond = self.expression()
+            self.expect('DO')
+            return While(cond, self.statement())
+        if t == 'FOR':
+            self.pos += 1
+            var = self.expect('ID')
+            self.expect('ASSIGN')
+            start = self.expression()
+            if self.types[self.pos] == 'TO': direction = self.expect('TO')
+            else: direction = self.expect('DOWNTO')
+            end = self.expression()
+            self.expect('DO')
+            body = self.statement()
+            self.follows(STMT_FOLLOW)
+            node = For(var, start, end, body, direction.lower())
+            node.scope = self.st.get(var)
+            return node
+        if t == 'BEGIN':
+            self.pos += 1
+            stmts = self.statements()
+            self.expect('END')
+            return Block(stmts)
+        if t == 'REPEAT':
+            self.pos += 1
+            stmts = self.statements()
+            self.expect('UNTIL')
+            return Repeat(stmts, self.expression())
+        if t == 'CASE':
+            return self.case()
+        if t == 'READLN':
+            self.pos += 1
+            self.expect('LPAREN')
+            name = self.expect('ID')
+            index = None
+            if self.types[self.pos] == 'LBRACKET':
+                self.pos += 1
+                index = self.expression()
+                self.expect('RBRACKET')
+            self.expect('RPAREN')
+            self.follows(STMT_FOLLOW)
+            node = Read(name, index_expr=index)
+            node.scope = self.st.get(name)
+            return node
+        self.follows(STMT_FOLLOW)       # comando vazio
+        return Block([])
+
+    def case(self):
+        self.pos += 1
+        selector = self.expression()
+        self.expect('OF')
+        labels, arms = [], []
+        while True:
+            if self.types[self.pos] not in ('ELSE', 'END', 'SEMICOLON'):     # ramo vazio: ';' a mais
+                item = [self.case_label()]
+                while self.types[self.pos] == 'COMMA':
+                    self.pos += 1
+                    item.append(self.case_label())
+                self.expect('COLON')
+                labels.append(item)
+                arms.append(self.statement())
+            if self.types[self.pos] != 'SEMICOLON': break
+            self.pos += 1
+        else_b = None
+        if self.types[self.pos] == 'ELSE':
+            self.pos += 1
+            else_b = Block(self.statements())
+        self.expect('END')
+        return Case(selector, labels, arms, else_b)
+
+    def case_label(self):
+        low = self.case_const()
+        if self.types[self.pos] != 'RANGE': return (low, low)
+        self.pos += 1
+        return (low, self.case_const())
+
+    def case_const(self):
+        t = self.types[self.pos]
+        if t == 'MINUS':
+            self.pos += 1
+            return Literal(-self.expect('NUM'), 'INTEGER')
+        if t == 'NUM':
+            return Literal(self.expect('NUM'), 'INTEGER')
+        value = self.expect('STRING_LITERAL')
+        if len(value) == 1: return Literal(ord(value), 'INTEGER')
+        return Literal(value, 'STRING')
+
+    def id_statement(self):
+        name = self.values[self.pos]
+        self.pos += 1
+        t = self.types[self.pos]
+        if t == 'LPAREN':
+            self.pos += 1
+            args = self.expr_list()
+            self.expect('RPAREN')
+            node = FunctionCall(name, args)
+            node.scope = self.st.find_func(name)
+            return node
+        index = None
+        if t == 'LBRACKET':
+            self.pos += 1
+            index = self.expression()
+            self.expect('RBRACKET')
+        self.expect('ASSIGN')
+        expr = self.expression()
+        self.follows(STMT_FOLLOW)
+        node = Assign(name, expr, index_expr=index)
+        node.scope = self.st.get(name)
+        return node
+
+    # --------------------------------------------------------------------------
+    # Expressões (Pratt)
+    # --------------------------------------------------------------------------
+    def expr_list(self):
+        exprs = [self.expression()]
+        while self.types[self.pos] == 'COMMA':
+            self.pos += 1
+            exprs.append(self.expression())
+        return exprs
+
+    def expression(self, min_level=0):
+        types, values = self.types, self.values
+        left = self.primary()
+        relational = False
+        while True:
+            t = types[self.pos]
+            level = BINARY.get(t)
+            if level is None or level <= min_level: return left
+            if level == RELATIONAL:
+                if relational: self.error()     # a < b < c
+                relational = True
+            else:
+                relational = False
+            op = values[self.pos]
+            self.pos += 1
+            left = BinOp(left, op, self.expression(level))
+
+    def primary(self):
+        t = self.types[self.pos]
+        value = self.values[self.pos]
+        self.pos += 1
+        if t == 'ID':
+            nt = self.types[self.pos]
+            if nt == 'LPAREN':
+                self.pos += 1
+                args = self.expr_list()
+                self.expect('RPAREN')
+                node = FunctionCall(value, args)
+                node.scope = self.st.find_func(value)
+                return node
+            if nt == 'LBRACKET':
+                self.pos += 1
+                index = self.expression()
+                self.expect('RBRACKET')
+            else:
+                index = None
+            self.follows(EXPR_FOLLOW)
+            node = VarAccess(value, index_expr=index)
+            node.scope = self.st.get(value)
+            return node
+        if t == 'NUM':
+            return Literal(value, 'INTEGER')
+        if t == 'STRING_LITERAL':
+            if len(value) == 1: return Literal(ord(value), 'INTEGER')
+            return Literal(value, 'STRING')
+        if t == 'TRUE':
+            return Literal(1, 'BOOLEAN')
+        if t == 'FALSE':
+            return Literal(0, 'BOOLEAN')
+        if t == 'LPAREN':
+            node = self.expression()
+            self.expect('RPAREN')
+            return node
+        self.pos -= 1
+        self.error()
+
+# ==============================================================================
+# VERIFICAÇÃO E MEDIÇÃO CONTRA O LALR
+# ==============================================================================
+def dump(node):
+    """ Forma comparável de uma AST (campos de todos os nós e dos registos da
+        tabela de símbolos para que apontam). """
+    if isinstance(node, (Node, Symbol, FuncSymbol)):
+        return (type(node).__name__,) + tuple(dump(getattr(node, f, None)) for f in node.__slots__)
+    if isinstance(node, (list, tuple)):
+        return tuple(dump(x) for x in node)
+    if isinstance(node, dict):
+        return tuple(sorted((k, dump(v)) for k, v in node.items()))
+    return node
+
+def run_parser(text, parser):
+    """ (AST, erro, texto impresso) de Compiler(parser=parser).parse(text). """
+    import contextlib
+    import io
+    from parser import Compiler
+    out = io.StringIO()
+    tree = error = None
+    with contextlib.redirect_stdout(out):
+        try:
+            tree = dump(Compiler(parser=parser).parse(text))
+        except CompileError as e:
+            error = str(e)
+    return tree, error, out.getvalue()
+
+def verify(text):
+    """ None se os dois parsers coincidirem (AST, erro e mensagens), senão (LALR, rd). """
+    a, b = run_parser(text, 'lalr'), run_parser(text, 'rd')
+    return None if a == b else (a, b)
+
+def mutate(text, rng, edits=2):
+    """ text com alguns tokens apagados, duplicados ou trocados (para --fuzz). """
+    from scanner import PATTERN
+    spans = [m.span(1) for m in PATTERN.finditer(text)]
+    extra = ['+', '<', ':=', ';', ')', '(', '[', ']', 'end', 'begin', 'var', 'x', '1', 'then', 'else', ',', '.', '@']
+    for _ in range(edits):
+        if not spans: break
+        i = rng.randrange(len(spans))
+        start, end = spans[i]
+        choice = rng.randrange(3)
+        if choice == 0: piece = ''
+        elif choice == 1: piece = text[start:end] + ' ' + text[start:end]
+        else: piece = rng.choice(extra)
+        text = text[:start] + ' ' + piece + ' ' + text[end:]
+        spans = [m.span(1) for m in PATTERN.finditer(text)]
+    return text
+
+if __name__ == '__main__':
+    import argparse
+    import glob
+    import os
+    import random
+    import sys
+
+    ap = argparse.ArgumentParser(prog='rdparser', description='Compara o parser descendente com o LALR do PLY.')
+    ap.add_argument('files', nargs='*', help='ficheiros .pas (por omissão testes/*.pas)')
+    ap.add_argument('--verify', action='store_true', help='compara ASTs, erros e mensagens')
+    ap.add_argument('--fuzz', type=int, default=0, metavar='N', help='compara também N variantes com erros de cada fonte')
+    ap.add_argument('--bench', action='store_true', help='mede tokens/s dos dois parsers')
+    ap.add_argument('--statements', default='1000,10000,100000',
+                    help='tamanhos dos programas sintéticos usados no --bench sem ficheiros')
+    ap.add_argument('-n', '--repeat', type=int, default=3, help='repetições (fica o melhor tempo)')
+    args = ap.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    files = args.files or sorted(glob.glob(os.path.join(here, '..', 'testes', '*.pas')))
+    if args.verify or args.fuzz or not args.bench:
+        sources = [(f, open(f).read()) for f in files]
+        if not args.files:
+            from bench import generate
+            sources += [(f"<sintético {seed}>", generate(seed=seed, statements=500)) for seed in range(1, 6)]
+        rng = random.Random(1)
+        sources += [(f"{name} <variante {i}>", mutate(text, rng))
+                    for name, text in list(sources) for i in range(args.fuzz)]
+        bad = 0
+        for name, text in sources:
+            diff = verify(text)
+            if diff:
+                bad += 1
+                (_, err_a, out_a), (_, err_b, out_b) = diff
+                print(f"DIFERENTE {name}: LALR {err_a!r} {out_a!r} / rd {err_b!r} {out_b!r}")
+        print(f"{len(sources) - bad}/{len(sources)} fontes com resultados idênticos")
+        if bad: sys.exit(1)
+    if args.bench:
+        from bench import best_of, generate
+        from parser import Compiler
+        if args.files:
+            texts = [('ficheiros', ''.join(open(f).read() + '\n' for f in files))]
+        else:
+            texts = [(f"{n} comandos", generate(statements=n)) for n in map(int, args.statements.split(','))]
+        cases = (('LALR + PLY', dict(parser='lalr', scanner='ply')),
+                 ('LALR + rápido', dict(parser='lalr', scanner='fast')),
+                 ('rd', dict(parser='rd')))
+        for label, text in texts:
+            n = len(scan(text))
+            print(f"{label}: {n} tokens, {len(text) / 1024:.0f} KB")
+            base = None
+            for name, kw in cases:
+                secs = best_of(lambda: Compiler(**kw).parse(text), args.repeat)
+                base = base or secs
+                print(f"  {name:14} {secs * 1000:9.2f} ms  {n / secs / 1e6:6.2f} M tokens/s  x{base / secs:.2f}")
@@ -0,0 +1,285 @@
+import re
+import sys
+from collections import namedtuple
+from functools import partial
+from itertools import count, islice, product, repeat
+from operator import call, itemgetter
+
+from lexicon import reserved
+
+# ==============================================================================
+# SCANNER RÁPIDO
+# Alternativa ao lexer PLY (lexer.py) que produz exatamente a mesma sequência
+# de tokens (tipo, valor, linha, posição), incluindo os casos limite do PLY:
+# as mudanças de linha dentro de comentários e strings não contam para a
+# linha e os caracteres ilegais são reportados e saltados.
+#
+# Em vez de um ciclo Python por token, o texto é partido de uma só vez por um
+# único padrão (findall) e os tipos e valores são calculados com map() sobre
+# listas paralelas:
+#   - palavras reservadas e operadores numa tabela com todas as combinações de
+#     maiúsculas/minúsculas (sem .lower() por identificador)
+#   - identificadores internados com sys.intern
+#   - só strings, comentários e erros passam por código Python token a token
+#   - linhas e posições só são calculadas quando alguém as pede (erros)
+#
+# Selecionado com Compiler(scanner='fast'), --scanner fast ou PLC_SCANNER=fast.
+# Verificação contra o PLY: python3 scanner.py --verify [ficheiros.pas]
+# ==============================================================================
+
+def _casings(word):
+    return (''.join(chars) for chars in product(*((c.lower(), c.upper()) for c in word)))
+
+KEYWORDS = {variant: kind for word, kind in reserved.items() for variant in _casings(word)}
+
+OPERATORS = {
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'SLASH',
+    '=': 'EQ', '<>': 'NEQ', '<': 'LT', '>': 'GT', '<=': 'LE', '>=': 'GE',
+    ':=': 'ASSIGN', '(': 'LPAREN', ')': 'RPAREN', '[': 'LBRACKET', ']': 'RBRACKET',
+    ':': 'COLON', ';': 'SEMICOLON', ',': 'COMMA', '.': 'DOT', '..': 'RANGE',
+}
+
+# Texto completo do token -> tipo (palavras reservadas e operadores)
+TYPES = {**KEYWORDS, **OPERATORS}
+
+# Primeiro carácter -> tipo, para o que não está em TYPES. Strings ('),
+# comentários ({) e caracteres fora desta tabela ficam a None e são tratados
+# à parte em _fix_special.
+FIRST = dict.fromkeys('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_', 'ID')
+FIRST.update(dict.fromkeys('0123456789', 'NUM'))
+
+CONVERT = {'ID': sys.intern, 'NUM': int}
+
+# Espaços e mudanças de linha antes de cada token, seguidos do token. Os
+# operadores de dois caracteres vêm primeiro (como no PLY, que ordena as
+# regras de string pelo comprimento da expressão).
+PATTERN = re.compile(r"[ \t\n]*(" + '|'.join([
+    r'[a-zA-Z_][a-zA-Z_0-9]*',
+    r':=|<>|<=|>=|\.\.|[-+*/=<>()\[\]:;,.]',
+    r'\d+',
+    r"'(?:[^']|'')*'",
+    r'\{[^}]*\}',
+    r'[^ \t\n]',
+]) + ")", re.DOTALL)
+
+STRING = re.compile(r"'(?:[^']|'')*'", re.DOTALL)
+DIGITS = re.compile(r'\d+')
+
+# ==============================================================================
+# TOKENS
+# ==============================================================================
+class TokenStream:
+    """ Resultado de scan(): tipos e valores em listas paralelas. As linhas e
+        posições (lexpos) são calculadas na primeira vez que são pedidas. """
+    __slots__ = ('text', 'start_line', 'types', 'values', 'errors', 'keep', '_lines', '_lexpos')
+
+    def __init__(self, text, start_line, types, values):
+        self.text = text
+        self.start_line = start_line
+        self.types = types
+        self.values = values
+        self.errors = []       # [(índice do token seguinte, mensagem)]
+        self.keep = None       # índices dos matches que são tokens (None: todos)
+        self._lines = self._lexpos = None
+
+    def __len__(self):
+        return len(self.types)
+
+    @property
+    def lines(self):
+        if self._lines is None: self._positions()
+        return self._lines
+
+    @property
+    def lexpos(self):
+        if self._lexpos is None: self._positions()
+        return self._lexpos
+
+    def _positions(self):
+        lines, pos = raw_positions(self.text, self.start_line)
+        if self.keep is not None:
+            lines = [lines[i] for i in self.keep]
+            pos = [pos[i] for i in self.keep]
+        self._lines, self._lexpos = lines, pos
+
+def raw_positions(text, lineno=1):
+    """ (linhas, posições) de todos os matches de PATTERN, contando só as
+        mudanças de linha entre tokens, tal como o t_newline do PLY. """
+    lines, pos = [], []
+    for m in PATTERN.finditer(text):
+        start = m.start(1)
+        lineno += text.count('\n', m.start(), start)
+        lines.append(lineno)
+        pos.append(start)
+    return lines, pos
+
+class Token(namedtuple('Token', 'type value index stream')):
+    """ Token compatível com o LexToken do PLY (type, value, lineno, lexpos). """
+    __slots__ = ()
+    lexer = None    # o PLY só o preenche quando ainda não existe
+
+    @property
+    def lineno(self): return self.stream.lines[self.index]
+
+    @property
+    def lexpos(self): return self.stream.lexpos[self.index]
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+# ==============================================================================
+# SCANNER
+# ==============================================================================
+def scan(text, lineno=1):
+    """ Parte text em tokens; devolve um TokenStream. """
+    raw = PATTERN.findall(text)
+    types = list(map(TYPES.get, raw, map(FIRST.get, map(itemgetter(0), raw))))
+    values = list(map(call, map(CONVERT.get, types, repeat(str)), raw))
+    stream = TokenStream(text, lineno, types, values)
+    if None in types: _fix_special(stream, raw)
+    return stream
+
+def _fix_special(stream, raw):
+    """ Strings, comentários, dígitos não ASCII e caracteres ilegais. """
+    types, values = stream.types, stream.values
+    drop, lines = [], None
+    i = types.index(None)
+    while True:
+        tok = raw[i]
+        if tok[0] == "'" and STRING.fullmatch(tok):
+            types[i], values[i] = 'STRING_LITERAL', tok[1:-1].replace("''", "'")
+        elif tok[0] == '{' and len(tok) > 1:
+            drop.append(i)
+        elif DIGITS.fullmatch(tok):
+            types[i], values[i] = 'NUM', int(tok)
+        else:
+            if lines is None: lines = raw_positions(stream.text, stream.start_line)[0]
+            stream.errors.append((i - len(drop), f"Caractere ilegal '{tok}' na linha {lines[i]}"))
+            drop.append(i)
+        try:
+            i = types.index(None, i + 1)
+        except ValueError:
+            break
+    if drop:
+        dropped = set(drop)
+        stream.keep = [i for i in range(len(raw)) if i not in dropped]
+        stream.types = [types[i] for i in stream.keep]
+        stream.values = [values[i] for i in stream.keep]
+
+def tokenize(text, lineno=1):
+    """ Gera os tokens de text, pela mesma ordem e com os mesmos campos do PLY.
+        Os caracteres ilegais são reportados quando o gerador lá chega. """
+    stream = scan(text, lineno)
+    make = partial(tuple.__new__, Token)
+    items = zip(stream.types, stream.values, count(), repeat(stream))
+    done = 0
+    for index, message in stream.errors:
+        yield from map(make, islice(items, index - done))
+        done = index
+        print(message)
+    yield from map(make, items)
+
+class Scanner:
+    """ Interface de lexer do PLY (input/token/lineno) sobre tokenize(). """
+    def __init__(self):
+        self.lineno = 1
+        self.token = lambda: None
+
+    def input(self, text):
+        self.token = partial(next, tokenize(text, self.lineno), None)
+
+# ==============================================================================
+# VERIFICAÇÃO E MEDIÇÃO CONTRA O PLY
+# ==============================================================================
+def ply_tokens(text):
+    from lexer import lexer
+    lx = lexer.clone()
+    lx.lineno = 1
+    lx.input(text)
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lx.token, None)]
+
+def fast_tokens(text):
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in tokenize(text)]
+
+def verify(text):
+    """ None se os dois lexers coincidirem (tokens e mensagens de erro),
+        senão (índice, PLY, rápido) do primeiro token diferente. """
+    import contextlib
+    import io
+    out_a, out_b = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out_a): a = ply_tokens(text)
+    with contextlib.redirect_stdout(out_b): b = fast_tokens(text)
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y: return i, x, y
+    if len(a) != len(b): return min(len(a), len(b)), a[len(b):len(b) + 1], b[len(a):len(a) + 1]
+    if out_a.getvalue() != out_b.getvalue(): return len(a), out_a.getvalue(), out_b.getvalue()
+    return None
+
+# Casos limite do lexer PLY que o scanner tem de reproduzir
+EDGE_CASES = [
+    "a:=b..c<>d<=e>=f<g>h:i;j,k.l",
+    "BeGiN End PROGRAM Writeln x_1 _y DIV Mod aNd",
+    "{ comentário\ncom linhas } x\n\n y { sem fim\n z",
+    "'it''s' '' 'a\nb' 'sem fim\n w",
+    "12abc 007 3..5 1.2 ٣٤ x٣",
+    "x # y @ z\r\n! é",
+    "\n\t  \t\n",
+    "x\n",
+    "",
+]
+
+if __name__ == '__main__':
+    import argparse
+    import glob
+    import os
+    import time
+
+    ap = argparse.ArgumentParser(prog='scanner', description='Compara o scanner rápido com o lexer PLY.')
+    ap.add_argument('files', nargs='*', help='ficheiros .pas (por omissão testes/*.pas)')
+    ap.add_argument('--verify', action='store_true', help='compara os tokens um a um')
+    ap.add_argument('--bench', action='store_true', help='mede tokens/s dos dois lexers')
+    ap.add_argument('--statements', type=int, default=100000,
+                    help='tamanho do programa sintético usado no --bench sem ficheiros')
+    args = ap.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    files = args.files or sorted(glob.glob(os.path.join(here, '..', 'testes', '*.pas')))
+    if args.verify or not args.bench:
+        sources = [(f, open(f).read()) for f in files]
+        sources += [(f"<caso {i}>", text) for i, text in enumerate(EDGE_CASES)]
+        if not args.files:
+            from bench import generate
+            sources += [(f"<sintético {seed}>", generate(seed=seed, statements=2000)) for seed in range(1, 6)]
+        bad = 0
+        for name, text in sources:
+            diff = verify(text)
+            if diff:
+                bad += 1
+                print(f"DIFERENTE {name}: token {diff[0]}: PLY {diff[1]!r} / rápido {diff[2]!r}")
+        print(f"{len(sources) - bad}/{len(sources)} fontes com tokens idênticos")
+        if bad: sys.exit(1)
+    if args.bench:
+        from lexer import lexer
+        if args.files:
+            text = ''.join(open(f).read() + '\n' for f in files)
+        else:
+            from bench import generate
+            text = generate(statements=args.statements)
+
+        def run_ply():
+            lx = lexer.clone()
+            lx.input(text)
+            return sum(1 for _ in iter(lx.token, None))
+
+        cases = (('PLY', run_ply),
+                 ('rápido (tokens)', lambda: sum(1 for _ in tokenize(text))),
+                 ('rápido (scan)', lambda: len(scan(text))))
+        print(f"{len(text) / 2**20:.1f} MB")
+        for name, fn in cases:
+            best = float('inf')
+            for _ in range(3):
+                t0 = time.perf_counter()
+                n = fn()
+                best = min(best, time.perf_counter() - t0)
+            print(f"{name:16} {n} tokens em {best * 1000:9.2f} ms  {n / best / 1e6:6.2f} M tokens/s"
+                  f"  ({len(text) / best / 2**20:.1f} MB/s)")
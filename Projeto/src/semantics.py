@@ -1,69 +1,336 @@
 import sys
 
+from ast_nodes import *
+
+# ==============================================================================
+# ERROS DE COMPILAÇÃO
+# Levantados em vez de sys.exit(1) para que o compilador possa ser usado
+# várias vezes no mesmo processo. O CLI imprime a mensagem e sai com 1.
+# ==============================================================================
+class CompileError(Exception):
+    pass
+
 # ==============================================================================
 # TABELA DE SÍMBOLOS
-# Gere variáveis globais, locais, argumentos e funções.
+# Cadeia de âmbitos: o global (nível 0) e um por subprograma, ligado ao âmbito
+# onde foi declarado. Os nomes são normalizados (minúsculas) uma única vez por
+# grafia e internados, e cada identificador é resolvido durante o parse para
+# um registo (Symbol / FuncSymbol) que fica no nó da AST: o gerador de código
+# lê daí diretamente as instruções de acesso ao slot da variável.
 # ==============================================================================
+class Symbol:
+    """ Variável global, local, argumento ou valor de retorno de uma função. """
+    __slots__ = ('name', 'type', 'offset', 'kind', 'level', 'push', 'store', 'live')
+
+    def __init__(self, name, type_info, offset, kind, level):
+        self.name = name
+        self.type = type_info
+        self.kind = kind            # 'global', 'local', 'arg' ou 'return'
+        self.level = level
+        self.live = True            # False: nunca lida, sem slot (FrameLayout, -O1)
+        self.relocate(offset)
+
+    def relocate(self, offset):
+        """ Muda o slot da variável (e as instruções que lhe acedem). """
+        self.offset = offset
+        if self.kind == 'global': self.push, self.store = ('pushg', offset), ('storeg', offset)
+        else: self.push, self.store = ('pushl', offset), ('storel', offset)
+
+    def discard(self):
+        """ Variável sem slot: as escritas passam a descartar o valor. """
+        self.live = False
+        self.offset = self.push = None
+        self.store = ('pop', 1)
+
+class FuncSymbol:
+    """ Função ou procedimento (ret é None nos procedimentos). """
+    __slots__ = ('name', 'ret', 'args', 'label', 'level')
+
+    def __init__(self, name, ret, args, label, level):
+        self.name = name
+        self.ret = ret
+        self.args = args
+        self.label = label
+        self.level = level
+
+LENGTH = FuncSymbol('length', 'INTEGER', [], 'strlen', 0)
+
+# Símbolo dado a variáveis não definidas no modo de diagnóstico
+UNDEFINED = Symbol('?', 'UNKNOWN', 0, 'global', 0)
+
+class Scope:
+    __slots__ = ('parent', 'level', 'owner', 'vars', 'funcs', 'next_offset')
+
+    def __init__(self, parent=None, owner=None):
+        self.parent = parent
+        self.level = parent.level + 1 if parent else 0
+        self.owner = owner
+        self.vars = {}
+        self.funcs = {}
+        self.next_offset = 0
+
 class SymbolTable:
     def __init__(self):
-        self.globals = {}
-        self.locals = {}
-        self.functions = {} 
-        self.scope = 'global'
-        self.glob_offset = 0
-        self.loc_offset = 0
-        self.curr_func_args = 0
+        self.glob = self.current = Scope()
+        self.names = {}     # grafia -> nome canónico internado
 
-    def normalize(self, n): return n.lower()
+    def normalize(self, name):
+        n = self.names.get(name)
+        if n is None: n = self.names[name] = sys.intern(name.lower())
+        return n
 
-    # Adiciona variável (Global ou Local dependendo do escopo atual)
+    @property
+    def globals(self): return self.glob.vars
+
+    @property
+    def locals(self): return self.current.vars
+
+    # Adiciona variável ao âmbito atual
     def add_var(self, name, type_info):
-        n = self.normalize(name)
-        if self.scope == 'global':
-            self.globals[n] = {'type': type_info, 'offset': self.glob_offset, 'scope': 'global'}
-            self.glob_offset += 1
-        else:
-            self.locals[n] = {'type': type_info, 'offset': self.loc_offset, 'scope': 'local'}
-            self.loc_offset += 1
+        scope = self.current
+        kind = 'global' if scope.level == 0 else 'local'
+        scope.vars[self.normalize(name)] = Symbol(name, type_info, scope.next_offset, kind, scope.level)
+        scope.next_offset += 1
 
     # Adiciona argumento de função
     def add_arg(self, name, type_info, offset):
-        n = self.normalize(name)
-        self.locals[n] = {'type': type_info, 'offset': offset, 'scope': 'arg'}
+        scope = self.current
+        scope.vars[self.normalize(name)] = Symbol(name, type_info, offset, 'arg', scope.level)
 
-    # Regista uma função nova
+    # Regista uma função nova no âmbito atual
     def add_func(self, name, ret_type, args):
         n = self.normalize(name)
-        self.functions[n] = {'ret': ret_type, 'args': args, 'label': f"f{n}"}
+        scope = self.current
+        label = f"{scope.owner.label}_{n}" if scope.owner else f"f{n}"
+        scope.funcs[n] = FuncSymbol(name, ret_type, args, label, scope.level + 1)
 
+    # Abre o âmbito da função acabada de registar. O nome da função é a sua
+    # variável de retorno, escondida por argumentos ou locais com o mesmo nome.
     def enter_func(self, name, n_args):
-        self.scope = self.normalize(name)
-        self.locals = {}
-        self.loc_offset = 0
-        self.curr_func_args = n_args
+        n = self.normalize(name)
+        scope = self.current = Scope(self.current, self.current.funcs[n])
+        scope.vars[n] = Symbol(name, 'any', -(n_args + 1), 'return', scope.level)
 
     def exit_func(self):
-        self.scope = 'global'
-        self.locals = {}
+        self.current = self.current.parent
 
-    # Procura uma variável
+    # Procura uma variável, do âmbito atual para fora
     def get(self, name):
-        n = self.normalize(name)
-        if self.scope != 'global':
-            if n in self.locals: return self.locals[n]
-            if n == self.scope: # Variável de retorno da função
-                ret_off = -(self.curr_func_args + 1)
-                return {'scope': 'return', 'offset': ret_off, 'type': 'any'}
-        
-        if n in self.globals: return self.globals[n]
-        print(f"Erro Semântico: Variável '{name}' não definida.")
-        sys.exit(1)
-
-    # Procura uma função
+        n = self.names.get(name) or self.normalize(name)
+        scope = self.current
+        while scope is not None:
+            sym = scope.vars.get(n)
+            if sym is not None:
+                if 0 < sym.level < self.current.level:
+                    raise CompileError(f"Erro Semântico: Variável '{name}' de um subprograma exterior (não suportado).")
+                return sym
+            scope = scope.parent
+        raise CompileError(f"Erro Semântico: Variável '{name}' não definida.")
+
+    # Procura uma função; None se não existir
+    def find_func(self, name):
+        n = self.names.get(name) or self.normalize(name)
+        if n == 'length': return LENGTH
+        scope = self.current
+        while scope is not None:
+            info = scope.funcs.get(n)
+            if info is not None: return info
+            scope = scope.parent
+        return None
+
     def get_func(self, name):
-        n = self.normalize(name)
-        if n == 'length': return {'label': 'strlen', 'ret': 'INTEGER'}
-        if n not in self.functions:
-            print(f"Erro Semântico: Função '{name}' não definida.")
-            sys.exit(1)
-        return self.functions[n]
\ No newline at end of file
+        info = self.find_func(name)
+        if info is None:
+            raise CompileError(f"Erro Semântico: Função '{name}' não definida.")
+        return info
+
+# ==============================================================================
+# VERIFICAÇÃO DE TIPOS
+# Uma única passagem pela AST, antes da geração de código. Cada expressão
+# recebe o seu tipo em node.type, calculado uma vez a partir dos tipos já
+# guardados nos filhos, e as regras de atribuição e dos operadores são
+# verificadas aqui (o custo é linear no tamanho da AST).
+# Os erros das expressões de um comando são adiados e numerados em pré-ordem,
+# para que seja reportado o mesmo erro que o gerador reportava (o do nó mais
+# exterior primeiro). No modo de diagnóstico esse erro é registado e a
+# verificação continua nos sub-comandos e no comando seguinte.
+# ==============================================================================
+RELATIONAL = ('=', '<>', '<', '>', '<=', '>=')
+
+def substatements(node):
+    """ Comandos dentro de If/While/For/Case (os que stmt() devolveria). """
+    if isinstance(node, If): return [node.then_b, node.else_b] if node.else_b else [node.then_b]
+    if isinstance(node, (While, For)): return [node.body]
+    if isinstance(node, Case): return node.arms + [node.else_b] if node.else_b else node.arms
+    return []
+
+class TypeChecker:
+    def __init__(self, st, diagnostics=None):
+        self.st = st
+        self.order = 0
+        self.errors = []
+        self.diagnostics = diagnostics
+
+    def defer(self, order, msg):
+        self.errors.append((order, msg))
+
+    def flush(self):
+        if self.errors:
+            raise CompileError(min(self.errors)[1])
+
+    # Comandos e expressões são percorridos com pilhas explícitas (sem recursão)
+    def check(self, program):
+        stack = [program.body] + [sub.body for sub in reversed(program.subprograms)]
+        while stack:
+            item = stack.pop()
+            try:
+                if type(item) is tuple:
+                    self.expr(item[1])
+                    self.flush()
+                else:
+                    stack.extend(reversed(self.stmt(item)))
+            except CompileError as e:
+                if self.diagnostics is None: raise
+                self.errors = []
+                if type(item) is tuple:
+                    self.diagnostics.error('semantico', str(e), item[2].pos)
+                else:
+                    self.diagnostics.error('semantico', str(e), item.pos)
+                    stack.extend(reversed(substatements(item)))
+        return program
+
+    # Verifica um comando; devolve os sub-comandos que ainda faltam, por ordem
+    def stmt(self, node):
+        if isinstance(node, Block):
+            return node.statements
+
+        elif isinstance(node, Assign):
+            info = node.scope
+            if node.index_expr: self.expr(node.index_expr)
+            expr_type = self.expr(node.expr)
+
+            var_type = str(info.type).upper()
+            if isinstance(info.type, dict):
+                 var_type = str(info.type['base']).upper() if node.index_expr else 'ARRAY'
+
+            if expr_type != 'UNKNOWN' and var_type != 'UNKNOWN' and var_type != 'ANY':
+                 if var_type == 'REAL' and expr_type == 'INTEGER': pass
+                 elif var_type != expr_type:
+                     raise CompileError(f"⚠️  ERRO SEMÂNTICO: Tentativa de atribuir {expr_type} a uma variável {var_type} ('{node.name}')")
+            self.flush()
+
+        elif isinstance(node, FunctionCall):
+            self.expr(node)
+            self.flush()
+
+        elif isinstance(node, Write):
+            for e in node.exprs: self.expr(e)
+            self.flush()
+
+        elif isinstance(node, Read):
+            if node.index_expr: self.expr(node.index_expr)
+            self.flush()
+
+        elif isinstance(node, If):
+            self.expr(node.cond)
+            self.flush()
+            return [node.then_b, node.else_b] if node.else_b else [node.then_b]
+
+        elif isinstance(node, While):
+            self.expr(node.cond)
+            self.flush()
+            return [node.body]
+
+        elif isinstance(node, Repeat):
+            return node.statements + [('cond', node.cond, node)]
+
+        elif isinstance(node, For):
+            self.expr(node.start)
+            self.expr(node.end)
+            self.flush()
+            return [node.body]
+
+        elif isinstance(node, Case):
+            kind = self.expr(node.selector)
+            self.flush()
+            sel = node.selector
+            if kind == 'STRING' and isinstance(sel, VarAccess) and sel.index_expr is not None:
+                kind = sel.type = 'INTEGER'     # s[i] é um carácter (charat dá o código)
+            if kind not in ('INTEGER', 'UNKNOWN'):
+                raise CompileError(f"⚠️  ERRO SEMÂNTICO: O seletor do case tem de ser inteiro ou carácter. Recebeu {kind}.")
+            ranges = []
+            for low, high in (pair for labels in node.labels for pair in labels):
+                for lit in (low, high):
+                    if lit.type_name != 'INTEGER':
+                        raise CompileError(f"⚠️  ERRO SEMÂNTICO: Rótulo '{lit.value}' do case não é um inteiro nem um carácter.")
+                    lit.type = lit.type_name
+                if low.value > high.value:
+                    raise CompileError(f"⚠️  ERRO SEMÂNTICO: Intervalo vazio {low.value}..{high.value} no case.")
+                ranges.append((low.value, high.value))
+            ranges.sort()
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                if start <= end: raise CompileError(f"⚠️  ERRO SEMÂNTICO: Rótulo {start} repetido no case.")
+            return node.arms + [node.else_b] if node.else_b else node.arms
+
+        return []
+
+    # Anota node.type em todas as expressões da subárvore (pós-ordem, com os
+    # nós numerados em pré-ordem) e devolve o tipo da raiz
+    def expr(self, root):
+        stack = [(root, None)]
+        while stack:
+            node, order = stack.pop()
+            if order is not None:
+                node.type = self.annotate(node, order)
+                continue
+            stack.append((node, self.order))
+            self.order += 1
+            if isinstance(node, BinOp):
+                stack.append((node.right, None))
+                stack.append((node.left, None))
+            elif isinstance(node, VarAccess):
+                if node.index_expr: stack.append((node.index_expr, None))
+            elif isinstance(node, FunctionCall):
+                stack.extend((a, None) for a in reversed(node.args))
+        return root.type
+
+    # Tipo de um nó a partir dos tipos (já calculados) dos filhos
+    def annotate(self, node, order):
+        if isinstance(node, Literal):
+            return node.type_name
+
+        elif isinstance(node, VarAccess):
+            if node.scope:
+                kind = node.scope.type
+                if node.index_expr and isinstance(kind, dict) and kind.get('kind') == 'array':
+                    return str(kind['base']).upper()
+                if isinstance(kind, dict): return 'ARRAY'
+                return str(kind).upper()
+
+        elif isinstance(node, BinOp):
+            t_left, t_right = node.left.type, node.right.type
+            op = node.op.upper()
+
+            if op in ['DIV', 'MOD']:
+                if (t_left != 'INTEGER' and t_left != 'UNKNOWN') or \
+                   (t_right != 'INTEGER' and t_right != 'UNKNOWN'):
+                    self.defer(order, f"⚠️  ERRO SEMÂNTICO: Operador '{op}' exige Inteiros. Recebeu {t_left} e {t_right}.")
+
+            if op in ['+', '-', '*']:
+                if t_left != t_right and 'UNKNOWN' not in (t_left, t_right):
+                     if not ({t_left, t_right} <= {'INTEGER', 'REAL'}):
+                         self.defer(order, f"⚠️  ERRO SEMÂNTICO: Operação '{op}' inválida entre {t_left} e {t_right}.")
+
+            if op in RELATIONAL: return 'BOOLEAN'
+            if op == '/': return 'REAL' # Divisão real devolve sempre REAL
+            return t_left
+
+        elif isinstance(node, FunctionCall):
+            if node.name.lower() == 'length': return 'INTEGER'
+            try:
+                info = node.scope or self.st.get_func(node.name)
+                if info.ret: return str(info.ret).upper()
+            except CompileError as e:
+                self.defer(order, str(e))
+
+        return 'UNKNOWN'
@@ -0,0 +1,369 @@
+import sys
+import time
+
+# ==============================================================================
+# MÁQUINA VIRTUAL LOCAL
+# Interpretador para o subconjunto de instruções da VM que o compilador emite.
+# O código é montado uma única vez: as labels são resolvidas para índices e
+# cada instrução é transformada numa closure (escolhida por uma tabela indexada
+# pelo opcode) que executa o seu efeito sobre uma pilha plana e devolve o
+# índice da instrução seguinte.
+#
+# Modelo de memória:
+#   - globais em stack[0..], locais em stack[fp+n], argumentos em stack[fp-n]
+#   - arrays (alloc) são listas Python; o "endereço" é a própria lista
+#   - call guarda (pc, fp) numa pilha de chamadas; return repõe sp = fp
+# ==============================================================================
+
+class VMError(Exception):
+    pass
+
+def parse_string(arg):
+    """ Converte o operando de pushs ("...") no valor da string. """
+    s = arg.strip()
+    if len(s) < 2 or s[0] != '"' or s[-1] != '"':
+        raise VMError(f"String mal formada: {arg}")
+    return s[1:-1].replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"')
+
+def assemble(text):
+    """ Devolve a lista [(opcode, operando)] com as labels já resolvidas. """
+    code, labels, pending = [], {}, []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('//'): continue
+        if line.endswith(':'):
+            labels[line[:-1]] = len(code)
+            continue
+        op, _, arg = line.partition(' ')
+        op = op.lower()
+        if op not in HANDLERS:
+            raise VMError(f"Instrução desconhecida na linha {lineno}: {line}")
+        arg = arg.strip()
+        if op in LABEL_OPS:
+            pending.append((len(code), arg, lineno))
+        elif op == 'pushs':
+            arg = parse_string(arg)
+        elif op == 'check':
+            arg = tuple(int(x) for x in arg.split(','))
+        elif arg:
+            arg = int(arg)
+        code.append((op, arg))
+    for idx, label, lineno in pending:
+        if label not in labels:
+            raise VMError(f"Label '{label}' não definida (linha {lineno})")
+        code[idx] = (code[idx][0], labels[label])
+    return code
+
+def _trunc_div(a, b):
+    if b == 0: raise VMError("Divisão por zero")
+    q = abs(a) // abs(b)
+    return -q if (a < 0) != (b < 0) else q
+
+# Instruções cujo operando é uma label
+LABEL_OPS = {'jump', 'jz', 'pusha'}
+
+class VM:
+    def __init__(self, code, stdin=None, stdout=None):
+        self.code = assemble(code) if isinstance(code, str) else code
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.steps = 0
+
+    def run(self):
+        """ Executa o programa; devolve o número de instruções executadas. """
+        stack = []
+        push, pop = stack.append, stack.pop
+        calls = []
+        fp = 0
+        write = self.stdout.write
+        readline = self.stdin.readline
+
+        # Cada fábrica recebe (operando, índice seguinte) e devolve a closure
+        # da instrução; a closure devolve o próximo pc (-1 termina).
+        def f_start(a, nxt):
+            def f():
+                nonlocal fp
+                fp = len(stack)
+                return nxt
+            return f
+
+        def f_stop(a, nxt):
+            return lambda: -1
+
+        def f_pushi(a, nxt):
+            def f():
+                push(a)
+                return nxt
+            return f
+
+        f_pushs = f_pushi
+
+        def f_pushg(a, nxt):
+            def f():
+                push(stack[a])
+                return nxt
+            return f
+
+        def f_pushl(a, nxt):
+            def f():
+                push(stack[fp + a])
+                return nxt
+            return f
+
+        def f_storeg(a, nxt):
+            def f():
+                stack[a] = pop()
+                return nxt
+            return f
+
+        def f_storel(a, nxt):
+            def f():
+                stack[fp + a] = pop()
+                return nxt
+            return f
+
+        def f_pop(a, nxt):
+            def f():
+                del stack[len(stack) - a:]
+                return nxt
+            return f
+
+        def f_dup(a, nxt):
+            def f():
+                stack.extend(stack[len(stack) - a:])
+                return nxt
+            return f
+
+        def f_pushn(a, nxt):
+            zeros = [0] * a
+            def f():
+                stack.extend(zeros)
+                return nxt
+            return f
+
+        def f_alloc(a, nxt):
+            def f():
+                push([0] * a)
+                return nxt
+            return f
+
+        def f_loadn(a, nxt):
+            def f():
+                n = pop()
+                if n < 0: raise VMError(f"Acesso fora dos limites: índice {n}")
+                stack[-1] = stack[-1][n]
+                return nxt
+            return f
+
+        def f_storen(a, nxt):
+            def f():
+                v = pop()
+                n = pop()
+                if n < 0: raise VMError(f"Acesso fora dos limites: índice {n}")
+                pop()[n] = v
+                return nxt
+            return f
+
+        def f_load(a, nxt):
+            def f():
+                stack[-1] = stack[-1][a]
+                return nxt
+            return f
+
+        def f_store(a, nxt):
+            def f():
+                v = pop()
+                pop()[a] = v
+                return nxt
+            return f
+
+        def f_check(a, nxt):
+            lo, hi = a
+            def f():
+                if not lo <= stack[-1] <= hi:
+                    raise VMError(f"Índice {stack[-1]} fora dos limites [{lo}..{hi}]")
+                return nxt
+            return f
+
+        def f_charat(a, nxt):
+            def f():
+                n = pop()
+                if n < 0: raise VMError(f"Acesso fora dos limites: índice {n}")
+                stack[-1] = ord(stack[-1][n])
+                return nxt
+            return f
+
+        def f_strlen(a, nxt):
+            def f():
+                stack[-1] = len(stack[-1])
+                return nxt
+            return f
+
+        def binary(fn):
+            def factory(a, nxt):
+                def f():
+                    b = pop()
+                    stack[-1] = fn(stack[-1], b)
+                    return nxt
+                return f
+            return factory
+
+        def f_add(a, nxt):
+            def f():
+                b = pop()
+                stack[-1] += b
+                return nxt
+            return f
+
+        def f_sub(a, nxt):
+            def f():
+                b = pop()
+                stack[-1] -= b
+                return nxt
+            return f
+
+        def f_mul(a, nxt):
+            def f():
+                b = pop()
+                stack[-1] *= b
+                return nxt
+            return f
+
+        def f_not(a, nxt):
+            def f():
+                stack[-1] = 0 if stack[-1] else 1
+                return nxt
+            return f
+
+        def f_jump(a, nxt):
+            return lambda: a
+
+        def f_jz(a, nxt):
+            def f():
+                return a if pop() == 0 else nxt
+            return f
+
+        f_pusha = f_pushi
+
+        def f_call(a, nxt):
+            def f():
+                nonlocal fp
+                target = pop()
+                calls.append((nxt, fp))
+                fp = len(stack)
+                return target
+            return f
+
+        def f_return(a, nxt):
+            def f():
+                nonlocal fp
+                del stack[fp:]
+                ret, fp = calls.pop()
+                return ret
+            return f
+
+        def f_writei(a, nxt):
+            def f():
+                write(str(pop()))
+                return nxt
+            return f
+
+        f_writes = f_writei
+
+        def f_read(a, nxt):
+            def f():
+                push(readline().rstrip('\r\n'))
+                return nxt
+            return f
+
+        def f_atoi(a, nxt):
+            def f():
+                s = stack[-1]
+                try:
+                    stack[-1] = int(s)
+                except ValueError:
+                    raise VMError(f"atoi: '{s}' não é um inteiro")
+                return nxt
+            return f
+
+        table = {
+            'start': f_start, 'stop': f_stop,
+            'pushi': f_pushi, 'pushn': f_pushn, 'pushs': f_pushs, 'pusha': f_pusha,
+            'pushg': f_pushg, 'pushl': f_pushl, 'storeg': f_storeg, 'storel': f_storel,
+            'pop': f_pop, 'dup': f_dup, 'alloc': f_alloc, 'loadn': f_loadn, 'storen': f_storen,
+            'load': f_load, 'store': f_store, 'check': f_check,
+            'charat': f_charat, 'strlen': f_strlen,
+            'add': f_add, 'sub': f_sub, 'mul': f_mul,
+            'div': binary(_trunc_div), 'mod': binary(lambda x, y: x - y * _trunc_div(x, y)),
+            'equal': binary(lambda x, y: 1 if x == y else 0), 'not': f_not,
+            'inf': binary(lambda x, y: 1 if x < y else 0), 'sup': binary(lambda x, y: 1 if x > y else 0),
+            'infeq': binary(lambda x, y: 1 if x <= y else 0), 'supeq': binary(lambda x, y: 1 if x >= y else 0),
+            'jump': f_jump, 'jz': f_jz, 'call': f_call, 'return': f_return,
+            'writei': f_writei, 'writes': f_writes, 'read': f_read, 'atoi': f_atoi,
+        }
+        prog = [table[op](arg, i + 1) for i, (op, arg) in enumerate(self.code)]
+
+        pc = steps = 0
+        try:
+            while pc >= 0:
+                pc = prog[pc]()
+                steps += 1
+        except VMError as e:
+            raise VMError(f"{e} (instrução {pc}: {self._fmt(pc)})") from None
+        except (IndexError, TypeError, AttributeError) as e:
+            raise VMError(f"Erro de execução na instrução {pc} ({self._fmt(pc)}): {e}") from None
+        finally:
+            self.steps = steps
+        return steps
+
+    def _fmt(self, pc):
+        op, arg = self.code[pc]
+        return f"{op} {arg!r}" if isinstance(arg, str) else f"{op} {arg}".strip()
+
+# Opcodes reconhecidos pelo montador (tem de coincidir com a tabela do run)
+HANDLERS = {
+    'start', 'stop', 'pushi', 'pushn', 'pushs', 'pusha', 'pushg', 'pushl', 'storeg', 'storel',
+    'pop', 'dup', 'alloc', 'loadn', 'storen', 'load', 'store', 'check', 'charat', 'strlen', 'add', 'sub', 'mul', 'div',
+    'mod', 'equal', 'not', 'inf', 'sup', 'infeq', 'supeq', 'jump', 'jz', 'call',
+    'return', 'writei', 'writes', 'read', 'atoi',
+}
+
+def run_source(text, stdin=None, stdout=None):
+    """ Monta e executa código da VM; devolve o número de passos. """
+    return VM(text, stdin, stdout).run()
+
+if __name__ == '__main__':
+    import argparse
+    import io
+
+    ap = argparse.ArgumentParser(prog='vm', description='Executa código .vm gerado pelo compilador.')
+    ap.add_argument('file')
+    ap.add_argument('--stats', action='store_true', help='mostra passos e tempo em stderr')
+    ap.add_argument('--bench', type=int, metavar='N', help='executa N vezes sem output e mede')
+    ap.add_argument('--input', help='ficheiro usado como stdin (por omissão stdin)')
+    args = ap.parse_args()
+
+    with open(args.file) as f:
+        code = assemble(f.read())
+    data = open(args.input).read() if args.input else None
+
+    try:
+        if args.bench:
+            total = steps = 0
+            for _ in range(args.bench):
+                vm = VM(code, io.StringIO(data or ''), io.StringIO())
+                t0 = time.perf_counter()
+                steps = vm.run()
+                total += time.perf_counter() - t0
+            print(f"{args.bench} execuções: {total / args.bench * 1000:.3f} ms/execução, "
+                  f"{steps} passos, {steps * args.bench / total / 1e6:.2f} M passos/s")
+        else:
+            vm = VM(code, io.StringIO(data) if data is not None else None)
+            t0 = time.perf_counter()
+            vm.run()
+            if args.stats:
+                print(f"\n[vm] {vm.steps} passos em {(time.perf_counter() - t0) * 1000:.3f} ms", file=sys.stderr)
+    except VMError as e:
+        sys.stdout.flush()      # o erro aparece depois do output já escrito
+        print(f"Erro na VM: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,37 @@
+program Cauda;
+var
+n: integer;
+function fat(n, acc: integer): integer;
+begin
+{ Chamada final no ramo else: guarda os argumentos e salta para o início }
+if n <= 1 then
+fat := acc
+else
+fat := fat(n - 1, acc * n);
+end;
+function mdc(a, b: integer): integer;
+var
+r: integer;
+begin
+r := a mod b;
+if r = 0 then
+mdc := b
+else
+mdc := mdc(b, r);
+end;
+procedure contagem(k: integer);
+begin
+if k > 0 then
+begin
+write(k, ', ');
+contagem(k - 1);
+end;
+end;
+begin
+writeln('Introduza um número inteiro positivo:');
+readln(n);
+writeln('Fatorial: ', fat(n, 1));
+writeln('MDC com 36: ', mdc(n, 36));
+contagem(n);
+writeln('fim');
+end.
@@ -0,0 +1,26 @@
+program Ciclos;
+var
+n, i, j, soma, base: integer;
+begin
+writeln('Introduza um número inteiro:');
+readln(n);
+base := 3;
+soma := 0;
+{ O limite n * 2 é calculado uma só vez, antes da primeira comparação }
+for i := 1 to n * 2 do
+soma := soma + i;
+{ base * base não muda dentro do ciclo: é calculado antes dele }
+i := 0;
+while i < n do
+begin
+soma := soma + base * base + n;
+i := i + 1;
+end;
+{ Também no repeat: base + 1 sai do ciclo }
+j := n;
+repeat
+soma := soma + (base + 1) * j;
+j := j - 1;
+until j <= 0;
+writeln('Soma: ', soma);
+end.
@@ -0,0 +1,29 @@
+program Curto;
+var
+v: array[1..6] of integer;
+i, alvo, x, y: integer;
+ok, positivo: boolean;
+begin
+for i := 1 to 5 do
+v[i] := i * i;
+writeln('Introduza o valor a procurar:');
+readln(alvo);
+{ Condição em curto-circuito: v[i] só é lido enquanto i <= 5 }
+i := 1;
+while (i <= 5) and (v[i] <> alvo) do
+i := i + 1;
+if (i > 5) or (alvo = 0) then
+writeln('Não encontrado')
+else
+writeln('Posição: ', i);
+{ Atribuição com operandos simples: or passa a add; pushi 0; sup }
+x := alvo - 4;
+y := 4 - alvo;
+positivo := (x > 0) or (y > 0);
+{ Com um acesso indexado à direita, também em curto-circuito }
+ok := (alvo > 0) and (v[2] = 4);
+if positivo and ok then
+writeln('Diferente de 4')
+else
+writeln('Igual a 4 ou inválido');
+end.
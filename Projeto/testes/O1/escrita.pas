@@ -0,0 +1,22 @@
+program Escrita;
+var
+i, total: integer;
+nome: string;
+begin
+{ Argumentos constantes seguidos e a mudança de linha: um só pushs/writes }
+writeln('Tabuada do ', 7, ' até ', 3);
+writeln('Introduza o seu nome:');
+readln(nome);
+total := 0;
+for i := 1 to 3 do
+begin
+writeln(7, ' x ', i, ' = ', 7 * i);
+total := total + 7 * i;
+end;
+writeln('Total: ', total, ' = ', 7, ' x ', 6);
+{ 'Olá, ' aparece duas vezes: fica num slot global, lido com pushg }
+if nome = 'Ana' then
+writeln('Olá, ', nome, ', bem-vinda')
+else
+writeln('Olá, ', nome, ', até breve');
+end.
@@ -0,0 +1,26 @@
+program Peephole;
+var
+x, y, z: integer;
+begin
+writeln('Introduza um número inteiro:');
+readln(x);
+{ Identidades (x + 0, y * 1) e constantes (2 - 1) resolvidas no código final }
+y := x + 0;
+y := y * 1;
+z := 2 - 1 + x;
+{ Atribuição seguida de leitura: dup 1; storeg em vez de storeg; pushg }
+y := z;
+writeln('Valor: ', y);
+{ <> com uma constante: pushi 9; sub; jz em vez de pushi 9; equal; not; jz }
+if y <> 9 then
+writeln('Diferentes')
+else
+writeln('Iguais');
+while x > 0 do
+begin
+if x mod 2 = 0 then
+z := z + x;
+x := x - 1;
+end;
+writeln('Soma dos pares: ', z - 1 - y + 1);
+end.
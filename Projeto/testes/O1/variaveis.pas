@@ -0,0 +1,29 @@
+program Variaveis;
+var
+nome: string;
+total, lixo: integer;
+titulo: string;
+ignorado, contador: integer;
+function dobro(x: integer): integer;
+var
+rascunho, resultado: integer;
+begin
+rascunho := x + 1;
+writeln('A calcular o dobro de ', x);
+resultado := 2 * x;
+dobro := resultado;
+end;
+begin
+{ lixo, ignorado e rascunho nunca são lidos: deixam de ter slot }
+titulo := 'Contagem';
+nome := 'Ana';
+lixo := 42;
+writeln('Introduza um número inteiro:');
+readln(ignorado);
+{ A chamada escreve no ecrã: é feita e o valor é descartado com pop 1 }
+lixo := dobro(5);
+total := 0;
+for contador := 1 to 3 do
+total := total + dobro(contador);
+writeln(nome, ': ', total);
+end.
@@ -0,0 +1,24 @@
+program Constantes;
+var
+largura, altura, area, perimetro, n, i, soma: integer;
+grande: boolean;
+begin
+{ Valores constantes propagados ao longo do código linear e dobrados }
+largura := 12;
+altura := largura div 3 + 2;
+area := largura * altura;
+perimetro := 2 * (largura + altura);
+grande := (area > 50) and (perimetro < 100);
+writeln('Área: ', area, ' Perímetro: ', perimetro);
+if grande then
+writeln('Retângulo grande')
+else
+writeln('Retângulo pequeno');
+{ Depois do readln, n deixa de ser constante; no ciclo, soma também }
+writeln('Introduza um número inteiro:');
+readln(n);
+soma := 0;
+for i := 1 to n do
+soma := soma + i * (10 - 7);
+writeln('Soma: ', soma, ' Área: ', area + n * 0);
+end.
@@ -0,0 +1,22 @@
+program Inline;
+var
+a, b, r: integer;
+function maior(x1, y: integer): integer;
+begin
+if x1 > y then maior := x1 else maior := y
+end;
+function menor(x, y: integer): integer;
+begin
+if x < y then menor := x else menor := y
+end;
+begin
+writeln('Introduza dois números inteiros:');
+readln(a);
+readln(b);
+{ Catorze chamadas expandidas no sítio: os temporários de x1 e de x não podem colidir }
+r := maior(a, b) + menor(a, b) + maior(a + 1, b) + menor(a + 1, b) + maior(a + 2, b) + menor(a + 2, b);
+r := r + maior(a + 3, b) + menor(a + 3, b) + maior(a + 4, b) + menor(a + 4, b) + maior(a + 5, b) + menor(a + 5, b);
+r := r + maior(a + 6, b) + menor(a + 6, b);
+writeln('Soma: ', r);
+writeln('Maior: ', maior(b, a), ' Menor: ', menor(b, a));
+end.
@@ -0,0 +1,31 @@
+program Calendario;
+var
+ano, mes, total: integer;
+function dias(m, a: integer): integer;
+var
+bissexto: boolean;
+begin
+bissexto := (a mod 4 = 0) and ((a mod 100 <> 0) or (a mod 400 = 0));
+{ Doze meses seguidos: tabela de saltos dentro da função }
+case m of
+1, 3, 5, 7, 8, 10, 12: dias := 31;
+4, 6, 9, 11: dias := 30;
+2: if bissexto and (a > 1582) then
+dias := 29
+else
+dias := 28;
+else
+dias := 0;
+end;
+end;
+begin
+writeln('Introduza um ano:');
+readln(ano);
+total := 0;
+for mes := 1 to 12 do
+begin
+writeln('Mês ', mes, ': ', dias(mes, ano), ' dias');
+total := total + dias(mes, ano);
+end;
+writeln('Total: ', total, ' dias');
+end.
@@ -0,0 +1,16 @@
+program Limites;
+var
+anos: array[10..12] of integer;
+i, k: integer;
+begin
+{ Contador de for com limites conhecidos: o acesso dispensa a verificação }
+for i := 10 to 12 do
+anos[i] := 2000 + i;
+{ Índice lido do input: check 10, 12 antes do acesso }
+for k := 1 to 2 do
+begin
+writeln('Introduza um índice (10 a 12):');
+readln(i);
+writeln('Ano: ', anos[i]);
+end;
+end.
@@ -0,0 +1,19 @@
+program Codigos;
+var
+codigo: integer;
+begin
+writeln('Introduza um código de estado HTTP:');
+readln(codigo);
+{ Rótulos dispersos: pesquisa binária pelos intervalos }
+case codigo of
+200: writeln('OK');
+201: writeln('Criado');
+204: writeln('Sem conteúdo');
+301, 302: writeln('Redirecionado');
+400: writeln('Pedido inválido');
+404: writeln('Não encontrado');
+500..599: writeln('Erro do servidor');
+else
+writeln('Desconhecido');
+end;
+end.
@@ -0,0 +1,20 @@
+program ErroVarios;
+var
+  total, i: integer
+  nome: string;
+  ok: boolean;
+begin
+  { Vários erros: só são todos reportados com --all-errors }
+  total := 0;
+  nome := 'Turma';
+  for i := 1 to 5 do
+    total := total + i;
+  ok := total > 10;
+  total := ok + 1;
+  contador := total;
+  writeln(nome, ' ', contagem);
+  total := total @ 2;
+  if ok then
+    total := 'vinte';
+  contador := 0
+end.
@@ -0,0 +1,21 @@
+program Intervalos;
+var
+quadrados: array[0..4] of integer;
+anos: array[10..12] of integer;
+i, soma: integer;
+begin
+{ Limites inferiores 0 e 10: o endereço é base + (i - limite inferior) }
+for i := 0 to 4 do
+quadrados[i] := i * i;
+{ Índices constantes: deslocamento calculado na compilação (load k / store k) }
+anos[10] := 2024;
+anos[11] := anos[10] + 1;
+anos[12] := anos[11] + quadrados[4];
+soma := 0;
+for i := 10 to 12 do
+soma := soma + anos[i];
+writeln('Quadrado de 3: ', quadrados[3]);
+writeln('Primeiro: ', quadrados[0], ' Último: ', quadrados[4]);
+writeln('Anos: ', anos[10], ', ', anos[11], ', ', anos[12]);
+writeln('Soma: ', soma);
+end.
@@ -0,0 +1,25 @@
+program Letras;
+var
+texto: string;
+i, vogais, consoantes, digitos, outros: integer;
+begin
+writeln('Introduza um texto:');
+readln(texto);
+vogais := 0;
+consoantes := 0;
+digitos := 0;
+outros := 0;
+for i := 1 to length(texto) do
+case texto[i] of
+'a', 'e', 'i', 'o', 'u', 'A', 'E', 'I', 'O', 'U': vogais := vogais + 1;
+'b'..'d', 'f'..'h', 'j'..'n', 'p'..'t', 'v'..'z',
+'B'..'D', 'F'..'H', 'J'..'N', 'P'..'T', 'V'..'Z': consoantes := consoantes + 1;
+'0'..'9': digitos := digitos + 1;
+else
+outros := outros + 1;
+end;
+writeln('Vogais: ', vogais);
+writeln('Consoantes: ', consoantes);
+writeln('Digitos: ', digitos);
+writeln('Outros: ', outros);
+end.
@@ -0,0 +1,15 @@
+program Notas;
+var
+nota: integer;
+begin
+writeln('Introduza uma nota (0 a 20):');
+readln(nota);
+{ Três intervalos: comparações em sequência }
+case nota of
+0..9: writeln('Reprovado');
+10..16: writeln('Aprovado');
+17..20: writeln('Aprovado com distinção');
+else
+writeln('Nota inválida');
+end;
+end.